@@ -1,11 +1,21 @@
 from fastapi import APIRouter
+from app.api.v1 import dasha
 from app.api.v1 import health
 from app.api.v1 import kundli
 from app.api.v1 import location
+from app.api.v1 import match
+from app.api.v1 import metrics
+from app.api.v1 import panchang
 from app.api.v1 import planetary
+from app.api.v1 import transits
 
 router = APIRouter(prefix="/api/v1")
+router.include_router(dasha.router)
 router.include_router(health.router)
 router.include_router(kundli.router)
 router.include_router(location.router)
+router.include_router(match.router)
+router.include_router(metrics.router)
+router.include_router(panchang.router)
 router.include_router(planetary.router)
+router.include_router(transits.router)
@@ -0,0 +1,171 @@
+import logging
+from datetime import date as date_type, datetime, time as time_type
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.core.admission import admit_engine_request
+from app.core.deadline import WorkCancelled
+from app.engine.dasha_engine import DASHA_LEVELS, DashaComputationError
+from app.engine.kundli_engine import KundliGenerationError
+from app.schemas.dasha import DashaAtResponse, DashaPeriodsResponse
+from app.services.kundli_service import get_dasha_at, get_dasha_periods
+
+logger = logging.getLogger("kundli-service.dasha")
+
+# Upper bound on dates per GET /dasha/at request
+MAX_LOOKUP_DATES = 366
+
+router = APIRouter(
+    prefix="/dasha",
+    tags=["Dasha"],
+    dependencies=[Depends(admit_engine_request)],
+)
+
+
+@router.get(
+    "/periods",
+    response_model=DashaPeriodsResponse,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_200_OK
+)
+async def get_dasha_periods_api(
+    birth_date: str = Query(..., description="Birth date in YYYY-MM-DD"),
+    birth_time: str = Query(..., description="Birth time in HH:MM:SS"),
+    timezone: float = Query(..., description="Timezone offset from UTC (e.g. 5.5)"),
+    mahadasha: Optional[str] = Query(
+        None,
+        description="Expand this mahadasha (lord name)",
+    ),
+    antardasha: Optional[str] = Query(
+        None,
+        description="Expand this antardasha of `mahadasha`",
+    ),
+    pratyantardasha: Optional[str] = Query(
+        None,
+        description="Expand this pratyantardasha of `antardasha`",
+    ),
+    depth: int = Query(
+        1,
+        ge=1,
+        le=2,
+        description="Levels returned below the selected period",
+    ),
+    full_precision: bool = Query(
+        False,
+        description="Evaluate Swiss Ephemeris directly instead of the "
+                    "interpolated ephemeris table",
+    ),
+):
+    """
+    Vimshottari periods one subtree at a time: mahadashas by default,
+    or the antardashas / pratyantardashas / sookshmas of the selected
+    period. Deeper levels are computed only when requested.
+    """
+
+    selected = [mahadasha, antardasha, pratyantardasha]
+    path = []
+    for lord in selected:
+        if lord is None:
+            break
+        path.append(lord)
+
+    if any(lord is not None for lord in selected[len(path):]):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Select dasha levels from mahadasha down without gaps",
+        )
+
+    try:
+        return await get_dasha_periods(
+            date_str=birth_date,
+            time_str=birth_time,
+            timezone=timezone,
+            path=path,
+            depth=depth,
+            full_precision=full_precision,
+        )
+
+    except (KundliGenerationError, DashaComputationError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+
+    except WorkCancelled:
+        raise
+
+    except Exception:
+        logger.exception("Unhandled dasha service error")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal dasha service error",
+        )
+
+
+@router.get(
+    "/at",
+    response_model=DashaAtResponse,
+    status_code=status.HTTP_200_OK
+)
+async def get_dasha_at_api(
+    birth_date: str = Query(..., description="Birth date in YYYY-MM-DD"),
+    birth_time: str = Query(..., description="Birth time in HH:MM:SS"),
+    timezone: float = Query(..., description="Timezone offset from UTC (e.g. 5.5)"),
+    date: List[date_type] = Query(
+        ...,
+        description="Date(s) to look up (repeat the parameter for several)",
+    ),
+    time: time_type = Query(
+        time_type(12, 0),
+        description="Local time of day for every date (birth timezone)",
+    ),
+    depth: int = Query(
+        3,
+        ge=1,
+        le=len(DASHA_LEVELS),
+        description="Levels returned (1 = mahadasha ... 4 = sookshma)",
+    ),
+    full_precision: bool = Query(
+        False,
+        description="Evaluate Swiss Ephemeris directly instead of the "
+                    "interpolated ephemeris table",
+    ),
+):
+    """
+    Running mahadasha / antardasha / pratyantardasha / sookshma on each
+    date, looked up in the chart's period index (no period lists are
+    built per request).
+    """
+
+    if len(date) > MAX_LOOKUP_DATES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_LOOKUP_DATES} dates per request",
+        )
+
+    try:
+        return await get_dasha_at(
+            date_str=birth_date,
+            time_str=birth_time,
+            timezone=timezone,
+            moments=[datetime.combine(day, time) for day in date],
+            depth=depth,
+            full_precision=full_precision,
+        )
+
+    except KundliGenerationError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+
+    except WorkCancelled:
+        raise
+
+    except Exception:
+        logger.exception("Unhandled dasha service error")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal dasha service error",
+        )
@@ -1,5 +1,7 @@
 from fastapi import APIRouter
 
+from app.core.circuit_breaker import circuit_states
+
 router = APIRouter(tags=["Health"])
 
 
@@ -8,8 +10,10 @@ def health_check():
     """
     Lightweight health check endpoint.
     Must be fast, dependency-free, and always available.
+    Upstream circuits are reported but never fail the check.
     """
     return {
         "status": "ok",
-        "service": "kundli-service"
+        "service": "kundli-service",
+        "circuits": circuit_states(),
     }
@@ -1,16 +1,25 @@
 import logging
-from fastapi import APIRouter, HTTPException, status, Request
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, Dict, Any
+from datetime import date as date_type
+from fastapi import APIRouter, Depends, HTTPException, status, Request
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from typing import Optional, Dict, Any, List
 
+from app.core.admission import admit_engine_request
+from app.core.config import settings
+from app.core.deadline import WorkCancelled, checkpoint
 from app.core.rate_limit import limiter
-from app.engine.kundli_engine import generate_kundli, KundliGenerationError
+from app.core.responses import FastJSONResponse
+from app.engine.divisional_charts import DivisionalChartError, normalize_chart_names
+from app.engine.kundli_engine import KundliGenerationError
+from app.services.kundli_service import get_kundli, get_kundli_batch
+from app.utils.time_utils import TimeComputationError, get_zone
 
 logger = logging.getLogger("kundli-service.kundli")
 
 router = APIRouter(
     prefix="/kundli",
-    tags=["Kundli"]
+    tags=["Kundli"],
+    dependencies=[Depends(admit_engine_request)],
 )
 
 # ---------------------------------------------------------
@@ -21,11 +30,61 @@ class KundliGenerateRequest(BaseModel):
 
     date: str = Field(..., description="Birth date in YYYY-MM-DD")
     time: str = Field(..., description="Birth time in HH:MM:SS")
-    timezone: float = Field(..., description="Timezone offset from UTC (e.g. 5.5)")
+    timezone: Optional[float] = Field(
+        default=None,
+        description="Timezone offset from UTC (e.g. 5.5); ignored when "
+                    "tz_name is given",
+    )
+    tz_name: Optional[str] = Field(
+        default=None,
+        description="IANA timezone (e.g. \"Asia/Kolkata\"); the offset is the "
+                    "one in force at the birth time. Without timezone or "
+                    "tz_name the zone is resolved from the coordinates, "
+                    "and the request fails (400) if that is not possible "
+                    "offline",
+    )
 
     latitude: float = Field(..., ge=-90.0, le=90.0)
     longitude: float = Field(..., ge=-180.0, le=180.0)
 
+    as_of: Optional[date_type] = Field(
+        default=None,
+        description="Date (YYYY-MM-DD) for the running dasha; default today",
+    )
+
+    full_precision: bool = Field(
+        default=False,
+        description="Evaluate Swiss Ephemeris directly instead of the "
+                    "interpolated ephemeris table",
+    )
+
+    charts: Optional[List[str]] = Field(
+        default=None,
+        description="Divisional charts to include (e.g. [\"D9\", \"D10\"]); "
+                    "default D1 and D9, D1 is always included",
+    )
+
+    @field_validator("charts")
+    @classmethod
+    def validate_charts(cls, v: Optional[List[str]]) -> Optional[List[str]]:
+        if v is None:
+            return v
+        try:
+            return normalize_chart_names(v)
+        except DivisionalChartError as exc:
+            raise ValueError(str(exc))
+
+    @field_validator("tz_name")
+    @classmethod
+    def validate_tz_name(cls, v: Optional[str]) -> Optional[str]:
+        if v is None:
+            return v
+        try:
+            get_zone(v)
+        except TimeComputationError as exc:
+            raise ValueError(str(exc))
+        return v
+
     @field_validator("date")
     @classmethod
     def validate_date(cls, v: str) -> str:
@@ -44,6 +103,9 @@ class KundliGenerateRequest(BaseModel):
 # ---------------------------------------------------------
 # RESPONSE SCHEMA (INTENTIONALLY FLEXIBLE)
 # ---------------------------------------------------------
+# Documents the routes only: the service checks each chart against
+# app.schemas.kundli once when it is computed, and the routes return
+# it as a FastJSONResponse without per-request revalidation.
 class KundliGenerateResponse(BaseModel):
     meta: Dict[str, Any]
     time: Dict[str, Any]
@@ -55,6 +117,26 @@ class KundliGenerateResponse(BaseModel):
     vimshottari: Optional[Any] = None
 
 
+# ---------------------------------------------------------
+# BATCH SCHEMAS
+# ---------------------------------------------------------
+class KundliBatchRequest(BaseModel):
+    # Records are validated one by one so a bad record is reported
+    # in its own result item instead of rejecting the whole batch.
+    records: List[Dict[str, Any]] = Field(..., min_length=1)
+
+
+class KundliBatchItem(BaseModel):
+    index: int
+    status: str                     # "ok" | "error"
+    kundli: Optional[KundliGenerateResponse] = None
+    error: Optional[str] = None
+
+
+class KundliBatchResponse(BaseModel):
+    results: List[KundliBatchItem]
+
+
 # ---------------------------------------------------------
 # API ENDPOINT
 # ---------------------------------------------------------
@@ -69,44 +151,29 @@ async def generate_kundli_api(
     payload: KundliGenerateRequest,
 ):
     """
-    Generates D1 (Rāśi) and D9 (Navāṁśa) Kundli.
+    Generates D1 (Rāśi) and D9 (Navāṁśa) Kundli, plus any other
+    requested divisional charts (D2–D60).
     AstroSage-parity compliant.
     """
 
     try:
-        kundli = generate_kundli(
+        kundli = await get_kundli(
             name=payload.name,
             date_str=payload.date,
             time_str=payload.time,
             timezone=payload.timezone,
             latitude=payload.latitude,
             longitude=payload.longitude,
+            tz_name=payload.tz_name,
+            as_of=payload.as_of,
+            full_precision=payload.full_precision,
+            charts=payload.charts,
         )
+        checkpoint("response")
 
         logger.info("Kundli generated successfully")
 
-        # -------------------------------------------------
-        # DISPLAY NORMALIZATION (SAFE, NON-DESTRUCTIVE)
-        # -------------------------------------------------
-        DISPLAY_NORMALIZATION = {
-            "Mrat": "Mrita",
-            "Vradha": "Vriddha",
-            "Swatha": "Swastha",
-            "Shant": "Shanta",
-            "Mrita": "Mrita",
-            "Vriddha": "Vriddha",
-            "Swastha": "Swastha",
-            "Shanta": "Shanta",
-        }
-
-        avasthas = kundli.get("avastha")
-        if isinstance(avasthas, list):
-            for a in avasthas:
-                for key in ("baladi", "deeptadi", "avastha"):
-                    if key in a and a[key] in DISPLAY_NORMALIZATION:
-                        a[key] = DISPLAY_NORMALIZATION[a[key]]
-
-        return kundli
+        return FastJSONResponse(kundli, status_code=status.HTTP_201_CREATED)
 
     except KundliGenerationError as exc:
         logger.exception("Kundli generation error")
@@ -115,9 +182,100 @@ async def generate_kundli_api(
             detail=str(exc),
         )
 
+    except WorkCancelled:
+        raise
+
     except Exception as exc:
         logger.exception("Unhandled Kundli service error")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Kundli service error",
         )
+
+
+@router.post(
+    "/batch",
+    response_model=KundliBatchResponse,
+    status_code=status.HTTP_200_OK,
+)
+@limiter.limit("5/minute")
+async def generate_kundli_batch_api(
+    request: Request,
+    payload: KundliBatchRequest,
+):
+    """
+    Generates Kundlis for many birth records in one call.
+
+    - Results are returned in input order
+    - Records sharing a Julian day share one ephemeris pass
+    - A failing record is reported in its own item
+    """
+
+    if len(payload.records) > settings.kundli_batch_max_records:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Batch too large: {len(payload.records)} records "
+                f"(max {settings.kundli_batch_max_records})"
+            ),
+        )
+
+    records = []
+    invalid: Dict[int, str] = {}
+
+    for index, raw in enumerate(payload.records):
+        try:
+            record = KundliGenerateRequest.model_validate(raw)
+        except ValidationError as exc:
+            invalid[index] = "; ".join(
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+                for err in exc.errors()
+            )
+            continue
+
+        records.append((index, {
+            "name": record.name,
+            "date_str": record.date,
+            "time_str": record.time,
+            "timezone": record.timezone,
+            "latitude": record.latitude,
+            "longitude": record.longitude,
+            "tz_name": record.tz_name,
+            "as_of": record.as_of,
+            "full_precision": record.full_precision,
+            "charts": record.charts,
+        }))
+
+    try:
+        generated = await get_kundli_batch([r for _, r in records])
+        checkpoint("response")
+    except WorkCancelled:
+        raise
+    except Exception:
+        logger.exception("Unhandled Kundli batch error")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Kundli service error",
+        )
+
+    results: List[Dict[str, Any]] = [None] * len(payload.records)
+
+    for index, message in invalid.items():
+        results[index] = {
+            "index": index,
+            "status": "error",
+            "kundli": None,
+            "error": message,
+        }
+
+    for (index, _), item in zip(records, generated):
+        results[index] = {**item, "index": index}
+
+    failed = sum(1 for r in results if r["status"] != "ok")
+    logger.info(
+        "Kundli batch generated | records=%d | failed=%d",
+        len(results),
+        failed,
+    )
+
+    return FastJSONResponse({"results": results})
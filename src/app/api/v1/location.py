@@ -1,11 +1,13 @@
 import logging
+import math
 from typing import List
 
 from fastapi import APIRouter, HTTPException, Request, Query, status
 
 from app.core.rate_limit import limiter
-from app.schemas.location import LocationResponse
+from app.schemas.location import LocationResponse, ReverseLocationResponse
 from app.services.location_service import (
+    reverse_location as reverse_location_service,
     search_location as search_location_service,
     LocationServiceError,
 )
@@ -27,22 +29,34 @@ async def search_location(
         ...,
         min_length=2,
         max_length=100,
-        description="City or place name (e.g., Delhi, Mumbai, New York)",
+        description="City or place name (e.g., Delhi, Mumbai, New York), "
+                    "optionally qualified by country or state (e.g., Paris, France)",
+    ),
+    autocomplete: bool = Query(
+        False,
+        description="Match offline names by prefix, for typeahead input",
     ),
 ):
     """
     Search location by name and return latitude, longitude, and timezone.
 
-    - Uses OpenCage Geocoding API
+    - Offline gazetteer first, then the OpenCage Geocoding API
+    - 503 with Retry-After while the provider circuit is open
     - Rate-limited to protect external quota
-    - Designed for autocomplete usage
+    - Exact names by default; `autocomplete=true` for typeahead (prefix) input
     """
 
     try:
-        return await search_location_service(q)
+        return await search_location_service(q, autocomplete=autocomplete)
 
     except LocationServiceError as exc:
         logger.warning("Location service error: %s", exc)
+        if exc.retry_after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(exc),
+                headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(exc),
@@ -54,3 +68,40 @@ async def search_location(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal location service error",
         )
+
+
+@router.get(
+    "/reverse",
+    response_model=List[ReverseLocationResponse],
+    status_code=status.HTTP_200_OK,
+)
+@limiter.limit("60/minute")
+async def reverse_location(
+    request: Request,
+    lat: float = Query(..., ge=-90.0, le=90.0, description="Latitude"),
+    lon: float = Query(..., ge=-180.0, le=180.0, description="Longitude"),
+    limit: int = Query(5, ge=1, le=20, description="Places to return"),
+):
+    """
+    Nearest named places to a coordinate, with their timezone.
+
+    - Answered from the offline gazetteer (k-d tree), no provider call
+    - Closest first, with the great-circle distance
+    """
+
+    try:
+        return reverse_location_service(lat, lon, limit)
+
+    except LocationServiceError as exc:
+        logger.warning("Location service error: %s", exc)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+        )
+
+    except Exception as exc:
+        logger.exception("Unexpected location API error")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal location service error",
+        )
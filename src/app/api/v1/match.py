@@ -0,0 +1,107 @@
+from typing import List, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel, Field
+
+from app.core.admission import admit_engine_request
+from app.core.config import settings
+from app.engine.matching import (
+    MAX_SCORE,
+    MatchingError,
+    describe_pada,
+    koota_breakdown,
+    pada_index,
+    rank_matches,
+)
+from app.schemas.match import MatchRankResponse
+
+router = APIRouter(
+    prefix="/match",
+    tags=["Match"],
+    dependencies=[Depends(admit_engine_request)],
+)
+
+
+# ---------------------------------------------------------
+# REQUEST SCHEMA
+# ---------------------------------------------------------
+class MoonPosition(BaseModel):
+    # As returned for the Moon by planets._get_nakshatra
+    nakshatra_index: int = Field(..., ge=1, le=27)
+    pada: int = Field(..., ge=1, le=4)
+
+
+class MatchProfile(MoonPosition):
+    gender: Literal["male", "female"]
+
+
+class MatchCandidate(MoonPosition):
+    id: str = Field(..., max_length=100)
+
+
+class MatchRankRequest(BaseModel):
+    profile: MatchProfile
+    candidates: List[MatchCandidate] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.match_max_candidates,
+    )
+    top_k: int = Field(default=10, ge=1, le=1000)
+    min_score: float = Field(default=0.0, ge=0.0, le=MAX_SCORE)
+
+
+# ---------------------------------------------------------
+# ENDPOINT
+# ---------------------------------------------------------
+@router.post(
+    "/rank",
+    response_model=MatchRankResponse,
+    status_code=status.HTTP_200_OK
+)
+async def rank_matches_api(payload: MatchRankRequest):
+    """
+    Ashtakoota (36-guna) scores of the profile against every candidate
+    (of the other gender) from precomputed pada tables; returns the
+    best `top_k`, ties in input order.
+    """
+
+    try:
+        profile_pada = pada_index(payload.profile.nakshatra_index, payload.profile.pada)
+        candidate_padas = [
+            pada_index(c.nakshatra_index, c.pada) for c in payload.candidates
+        ]
+
+        ranked = rank_matches(
+            profile_pada=profile_pada,
+            profile_gender=payload.profile.gender,
+            candidate_padas=candidate_padas,
+            top_k=payload.top_k,
+            min_score=payload.min_score,
+        )
+
+    except MatchingError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+
+    male = payload.profile.gender == "male"
+    matches = []
+
+    for rank, (position, total) in enumerate(ranked, start=1):
+        candidate_pada = candidate_padas[position]
+        boy, girl = (profile_pada, candidate_pada) if male else (candidate_pada, profile_pada)
+        matches.append({
+            "rank": rank,
+            "id": payload.candidates[position].id,
+            "total": total,
+            "kootas": koota_breakdown(boy, girl),
+            "moon": describe_pada(candidate_pada),
+        })
+
+    return {
+        "profile": describe_pada(profile_pada),
+        "max_score": MAX_SCORE,
+        "total_candidates": len(candidate_padas),
+        "matches": matches,
+    }
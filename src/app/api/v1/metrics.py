@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+
+from app.core.metrics import collect_metrics
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics")
+def metrics():
+    """
+    Process-local counters (caches, pools, queues).
+    Each uvicorn worker reports its own values.
+    """
+    return collect_metrics()
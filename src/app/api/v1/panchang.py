@@ -0,0 +1,68 @@
+import logging
+from datetime import date as date_type
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.admission import AdmissionRejected, AdmissionSlot, admit_engine_request
+from app.core.config import settings
+from app.core.deadline import WorkCancelled
+from app.services.panchang_service import stream_panchang
+
+logger = logging.getLogger("kundli-service.panchang")
+
+router = APIRouter(
+    prefix="/panchang",
+    tags=["Panchang"],
+    dependencies=[Depends(admit_engine_request)],
+)
+
+
+@router.get("")
+async def get_panchang_api(
+    start: date_type = Query(..., description="First local date (YYYY-MM-DD)"),
+    days: int = Query(
+        365,
+        ge=1,
+        le=settings.panchang_max_days,
+        description="Number of days",
+    ),
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    timezone: float = Query(..., description="Timezone offset from UTC (e.g. 5.5)"),
+    admission: AdmissionSlot = Depends(admit_engine_request),
+):
+    """
+    Daily panchang as NDJSON (one JSON object per line and date): vara,
+    sunrise/sunset, and tithi, nakshatra, yoga and karana at sunrise,
+    each listed with the end time of every value running that day.
+    """
+
+    # The stream is paced by the client: each chunk holds the admission
+    # slot and gets the request timeout only while it is computed, so a
+    # slow reader keeps neither. A disconnect still ends the stream (and
+    # abandons the chunk being computed).
+    async def lines() -> AsyncIterator[bytes]:
+        # Headers are already sent: errors can only end the stream
+        try:
+            async for line in stream_panchang(
+                start=start,
+                days=days,
+                latitude=latitude,
+                longitude=longitude,
+                timezone=timezone,
+                admission=admission,
+            ):
+                yield line
+        except AdmissionRejected as exc:
+            logger.warning("Panchang stream shed: %s", exc.reason)
+            raise
+        except WorkCancelled as exc:
+            logger.info("Panchang stream cancelled: %s", exc)
+            raise
+        except Exception:
+            logger.exception("Panchang stream aborted")
+            raise
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -0,0 +1,78 @@
+import logging
+from datetime import date as date_type
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.core.admission import admit_engine_request
+from app.core.deadline import WorkCancelled
+from app.engine.planets import PLANETS
+from app.engine.transits import EVENT_TYPES, TransitComputationError
+from app.schemas.transits import TransitEventsResponse
+from app.services.transit_service import get_transit_events
+
+logger = logging.getLogger("kundli-service.transits")
+
+router = APIRouter(
+    prefix="/transits",
+    tags=["Transits"],
+    dependencies=[Depends(admit_engine_request)],
+)
+
+
+@router.get(
+    "",
+    response_model=TransitEventsResponse,
+    response_model_by_alias=True,
+    status_code=status.HTTP_200_OK
+)
+async def get_transits_api(
+    start: date_type = Query(..., description="First local date (YYYY-MM-DD)"),
+    end: date_type = Query(..., description="Last local date, inclusive"),
+    bodies: List[str] = Query(
+        list(PLANETS),
+        description="Grahas to search (repeat the parameter for several)",
+    ),
+    events: List[str] = Query(
+        list(EVENT_TYPES),
+        description="Event kinds: sign, nakshatra, station",
+    ),
+    timezone: float = Query(0.0, description="Timezone offset from UTC (e.g. 5.5)"),
+    tolerance_seconds: float = Query(
+        1.0,
+        gt=0,
+        le=3600,
+        description="Timing tolerance of each event",
+    ),
+):
+    """
+    Sign ingresses, nakshatra ingresses and stations in the date range,
+    sorted by time. Candidates are bracketed from each body's maximum
+    daily motion and refined by root finding on Swiss Ephemeris.
+    """
+
+    try:
+        return await get_transit_events(
+            start=start,
+            end=end,
+            bodies=bodies,
+            event_types=events,
+            timezone=timezone,
+            tolerance_seconds=tolerance_seconds,
+        )
+
+    except TransitComputationError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+
+    except WorkCancelled:
+        raise
+
+    except Exception:
+        logger.exception("Unhandled transit service error")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal transit service error",
+        )
@@ -0,0 +1,397 @@
+# app/core/admission.py
+"""
+Admission control and lane scheduling for engine work.
+
+Work runs in one of two lanes: "interactive" (single charts, the
+default) and "bulk" (batch imports, reports). Each lane has its own
+FIFO queue; a freed slot goes to the waiting lane that has been
+served least relative to its weight (weighted fair dispatch), and the
+bulk lane may never hold more than its share of the slots, so a large
+import cannot starve interactive requests.
+
+The same scheduler guards:
+
+- engine-backed routes (`admit_engine_request`): at most
+  `max_concurrent` requests per worker process, `max_queue` waiting
+  per lane. A request is shed with 503 + Retry-After when its lane's
+  queue is full, its expected wait exceeds `max_wait`, or it has
+  waited `max_wait` seconds without a slot. The slot is held for the
+  whole request unless the route holds it per unit of work instead
+  (AdmissionSlot.hold, used by streamed responses)
+- the engine process pool (app.core.executor), without shedding
+
+The lane comes from the API key (ENGINE_BULK_API_KEYS) or the route
+(ENGINE_BULK_ROUTES) and follows the request via a context variable,
+as does its deadline (app.core.deadline).
+Queue depth, running requests and rejections per lane are exported
+as the "admission" metrics, for autoscaling on saturation.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+from app.core.deadline import checkpoint, set_request_deadline, watch_disconnect
+from app.core.metrics import register_metrics
+
+logger = logging.getLogger("kundli-service.admission")
+
+INTERACTIVE, BULK = "interactive", "bulk"
+LANES = (INTERACTIVE, BULK)
+
+# Weight of the latest request in the average service time
+SERVICE_TIME_ALPHA = 0.2
+
+_lane: ContextVar[str] = ContextVar("engine_lane", default=INTERACTIVE)
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"Server busy ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def current_lane() -> str:
+    return _lane.get()
+
+
+def lane_weights() -> Dict[str, int]:
+    return {
+        INTERACTIVE: settings.engine_interactive_weight,
+        BULK: settings.engine_bulk_weight,
+    }
+
+
+def bulk_slots(slots: int) -> int:
+    """
+    Slots of `slots` the bulk lane may hold at once: its share, at
+    least one, but never all of them when there are two or more (one
+    is kept for interactive work).
+    """
+    share = max(1, int(slots * settings.engine_bulk_share))
+    return min(share, slots - 1) if slots > 1 else 1
+
+
+class _Lane:
+    def __init__(self, weight: int, limit: int):
+        self.weight = max(1, weight)
+        self.limit = limit
+
+        self.waiters: Deque["asyncio.Future[None]"] = deque()
+        self.running = 0
+        self.service_time: Optional[float] = None
+        # Virtual time of the lane's next dispatch (advances 1/weight)
+        self.next_pass = 0.0
+
+        self.admitted = 0
+        self.queued = 0
+        self.wait_total = 0.0
+        self.rejected = {"queue_full": 0, "expected_wait": 0, "wait_timeout": 0}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "weight": self.weight,
+            "limit": self.limit,
+            "running": self.running,
+            "queue_depth": len(self.waiters),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": dict(self.rejected),
+            "wait_avg_ms": round(1000 * self.wait_total / self.queued, 3) if self.queued else 0.0,
+            "service_time_ms": round(1000 * self.service_time, 3) if self.service_time else 0.0,
+        }
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        *,
+        max_concurrent: int,
+        max_queue: Optional[int] = None,
+        max_wait: Optional[float] = None,
+        weights: Optional[Dict[str, int]] = None,
+        limits: Optional[Dict[str, int]] = None
+    ):
+        """
+        max_queue: waiters per lane (None = unbounded)
+        max_wait: seconds a request may wait (None = no shedding)
+        weights / limits: per lane (default 1 / max_concurrent)
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+
+        weights = weights or {}
+        limits = limits or {}
+        self.lanes = {
+            name: _Lane(weights.get(name, 1), limits.get(name, self.max_concurrent))
+            for name in LANES
+        }
+
+        self.running = 0
+        self._vtime = 0.0
+
+    # -----------------------------------------------------
+    # ESTIMATES
+    # -----------------------------------------------------
+    def expected_wait(self, lane: str) -> float:
+        """
+        Seconds until a new request in `lane` gets a slot: requests
+        ahead in the lane × its average service time, over the slots
+        its weight earns against the other busy lanes (0 until a
+        service time has been measured).
+        """
+        state = self.lanes[lane]
+        if state.service_time is None:
+            return 0.0
+
+        busy = sum(
+            other.weight for other in self.lanes.values()
+            if other is state or other.waiters
+        )
+        slots = min(state.limit, self.max_concurrent * state.weight / busy)
+        return (len(state.waiters) + 1) * state.service_time / slots
+
+    def _reject(self, state: _Lane, lane: str, reason: str) -> AdmissionRejected:
+        state.rejected[reason] += 1
+        retry_after = self.expected_wait(lane) or self.max_wait or 1.0
+        return AdmissionRejected(reason, retry_after)
+
+    # -----------------------------------------------------
+    # SLOTS
+    # -----------------------------------------------------
+    async def acquire(self, lane: Optional[str] = None) -> None:
+        lane = lane or current_lane()
+        state = self.lanes[lane]
+
+        if (
+            self.running < self.max_concurrent
+            and state.running < state.limit
+            and not state.waiters
+        ):
+            self._start(state)
+            state.admitted += 1
+            return
+
+        if self.max_queue is not None and len(state.waiters) >= self.max_queue:
+            raise self._reject(state, lane, "queue_full")
+        if self.max_wait is not None and self.expected_wait(lane) > self.max_wait:
+            raise self._reject(state, lane, "expected_wait")
+
+        loop = asyncio.get_running_loop()
+        waiter: "asyncio.Future[None]" = loop.create_future()
+        if not state.waiters:
+            # An idle lane does not bank credit while it had no work
+            state.next_pass = max(state.next_pass, self._vtime)
+        state.waiters.append(waiter)
+        state.queued += 1
+        started = time.monotonic()
+        timer = (
+            loop.call_later(self.max_wait, self._expire, state, lane, waiter)
+            if self.max_wait is not None
+            else None
+        )
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Client gone; a slot handed over meanwhile goes to the next
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                self.release(lane)
+            elif waiter in state.waiters:
+                state.waiters.remove(waiter)
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+            state.wait_total += time.monotonic() - started
+
+        state.admitted += 1
+
+    def _expire(self, state: _Lane, lane: str, waiter: "asyncio.Future[None]") -> None:
+        if not waiter.done():
+            state.waiters.remove(waiter)
+            waiter.set_exception(self._reject(state, lane, "wait_timeout"))
+
+    def _start(self, state: _Lane) -> None:
+        self.running += 1
+        state.running += 1
+
+    def release(self, lane: Optional[str] = None, service_time: Optional[float] = None) -> None:
+        state = self.lanes[lane or current_lane()]
+
+        if service_time is not None:
+            if state.service_time is None:
+                state.service_time = service_time
+            else:
+                state.service_time += SERVICE_TIME_ALPHA * (service_time - state.service_time)
+
+        self.running -= 1
+        state.running -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        # Weighted fair dispatch: the ready lane with the lowest virtual
+        # time goes next (stride scheduling)
+        while self.running < self.max_concurrent:
+            ready = [s for s in self.lanes.values() if s.waiters and s.running < s.limit]
+            if not ready:
+                return
+
+            state = min(ready, key=lambda s: s.next_pass)
+            waiter = state.waiters.popleft()
+            if waiter.done():
+                continue
+
+            self._vtime = state.next_pass
+            state.next_pass += 1.0 / state.weight
+            self._start(state)
+            waiter.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "max_wait_seconds": self.max_wait,
+            "running": self.running,
+            "queue_depth": sum(len(s.waiters) for s in self.lanes.values()),
+            "lanes": {
+                name: {
+                    **state.stats(),
+                    "expected_wait_ms": round(1000 * self.expected_wait(name), 3),
+                }
+                for name, state in self.lanes.items()
+            },
+        }
+
+
+engine_admission = AdmissionController(
+    max_concurrent=settings.admission_max_concurrent,
+    max_queue=settings.admission_queue_size,
+    max_wait=settings.admission_max_wait_seconds,
+    weights=lane_weights(),
+    limits={BULK: bulk_slots(settings.admission_max_concurrent)},
+)
+
+register_metrics("admission", engine_admission.stats)
+
+
+# ---------------------------------------------------------
+# ROUTE DEPENDENCY
+# ---------------------------------------------------------
+def request_lane(request: Request) -> str:
+    """
+    Bulk for API keys in ENGINE_BULK_API_KEYS and request paths in
+    ENGINE_BULK_ROUTES, interactive otherwise.
+    """
+    api_key = request.headers.get("x-api-key")
+    if api_key and api_key in settings.engine_bulk_api_keys:
+        return BULK
+
+    if request.url.path in settings.engine_bulk_routes:
+        return BULK
+
+    return INTERACTIVE
+
+
+def request_timeout(request: Request, lane: str) -> float:
+    """
+    Seconds the request may take: the lane's default, lowered by a
+    positive X-Request-Timeout header (the client's own timeout).
+    """
+    timeout = (
+        settings.bulk_request_timeout_seconds
+        if lane == BULK
+        else settings.request_timeout_seconds
+    )
+
+    try:
+        requested = float(request.headers.get("x-request-timeout", ""))
+    except ValueError:
+        return timeout
+
+    return min(timeout, requested) if requested > 0 else timeout
+
+
+class AdmissionSlot:
+    """
+    A request's slot in engine_admission, in its lane.
+    """
+
+    def __init__(self, lane: str, timeout: float):
+        self.lane = lane
+        self.timeout = timeout
+        self.held = False
+        self._started = 0.0
+
+    async def acquire(self) -> None:
+        await engine_admission.acquire(self.lane)
+        self.held = True
+        self._started = time.monotonic()
+
+    def release(self) -> None:
+        if self.held:
+            self.held = False
+            engine_admission.release(self.lane, time.monotonic() - self._started)
+
+    @asynccontextmanager
+    async def hold(self) -> AsyncIterator[None]:
+        """
+        Hold the slot, under a fresh request deadline, for one unit of
+        work (a chunk of a streamed body) and release it afterwards, so
+        a client reading slowly does not keep it. Re-acquiring may be
+        shed (AdmissionRejected).
+        """
+        if not self.held:
+            await self.acquire()
+        set_request_deadline(self.timeout)
+
+        try:
+            yield
+        finally:
+            self.release()
+
+
+async def admit_engine_request(request: Request) -> AsyncIterator[AdmissionSlot]:
+    """
+    Assigns the request's lane and deadline and holds an admission slot
+    in its lane until the request ends (streamed routes may release it
+    earlier, see AdmissionSlot.hold); 503 with Retry-After when shed.
+    """
+    lane = request_lane(request)
+    _lane.set(lane)
+    timeout = request_timeout(request, lane)
+    set_request_deadline(timeout)
+    slot = AdmissionSlot(lane, timeout)
+
+    async with watch_disconnect(request.receive):
+        try:
+            await slot.acquire()
+        except AdmissionRejected as exc:
+            logger.warning(
+                "Request shed | lane=%s | reason=%s | retry_after=%.1fs",
+                lane,
+                exc.reason,
+                exc.retry_after,
+            )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(exc),
+                headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+            )
+
+        try:
+            # The client may have given up while the request was queued
+            checkpoint("admission")
+            yield slot
+        finally:
+            slot.release()
@@ -0,0 +1,83 @@
+# app/core/cache.py
+"""
+Bounded in-process LRU cache with TTL expiry and hit/miss counters.
+Thread-safe, so it can be shared by the event loop and thread pool.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class LRUCache:
+    def __init__(self, *, maxsize: int, ttl: Optional[float] = None):
+        """
+        maxsize: entries kept before the least recently used is evicted
+        ttl: seconds an entry stays valid (None = no expiry)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+
+        expires_at = (
+            time.monotonic() + self.ttl if self.ttl is not None else None
+        )
+
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,137 @@
+# app/core/circuit_breaker.py
+"""
+Circuit breaker for calls to an external dependency.
+
+- closed: calls go through; `failure_threshold` consecutive failures
+  open the circuit
+- open: calls fail at once with CircuitOpenError for `reset_timeout`
+  seconds
+- half_open: one trial call goes through; success closes the circuit,
+  failure opens it again
+
+Breakers register by name so health and metrics can report them.
+"""
+
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from app.core.metrics import register_metrics
+
+logger = logging.getLogger("kundli-service.circuit")
+
+T = TypeVar("T")
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+_breakers: Dict[str, "CircuitBreaker"] = {}
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, *, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self.opened = 0
+
+        _breakers[name] = self
+        register_metrics(f"circuit_{name}", self.stats)
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+        return self._state
+
+    def retry_after(self) -> float:
+        """
+        Seconds until an open circuit lets a trial call through.
+        """
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def allows_call(self) -> bool:
+        state = self.state
+        return state == CLOSED or (state == HALF_OPEN and not self._trial_running)
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await fn() if the circuit allows it; any exception counts as a
+        failure and is re-raised.
+        """
+        if not self.allows_call():
+            self.rejected += 1
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+
+        trial = self._state == HALF_OPEN
+        if trial:
+            self._trial_running = True
+
+        self.calls += 1
+        try:
+            result = await fn()
+        except BaseException as exc:
+            if trial:
+                self._trial_running = False
+            if isinstance(exc, Exception):
+                self._record_failure()
+            raise
+
+        if trial:
+            self._trial_running = False
+        self._record_success()
+        return result
+
+    def _record_success(self) -> None:
+        if self._state != CLOSED:
+            logger.info("Circuit closed | name=%s", self.name)
+        self._state = CLOSED
+        self._failures = 0
+
+    def _record_failure(self) -> None:
+        self.failures += 1
+        self._failures += 1
+
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != OPEN:
+                self.opened += 1
+                logger.warning(
+                    "Circuit opened | name=%s | consecutive_failures=%d | retry_in=%.0fs",
+                    self.name,
+                    self._failures,
+                    self.reset_timeout,
+                )
+            self._state = OPEN
+            self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "retry_after_seconds": round(self.retry_after(), 1),
+            "calls": self.calls,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "opened": self.opened,
+        }
+
+
+def circuit_states() -> Dict[str, str]:
+    """
+    name → state of every registered breaker (for the health check).
+    """
+    return {name: breaker.state for name, breaker in _breakers.items()}
@@ -1,4 +1,5 @@
 import os
+from typing import List
 from pydantic import BaseModel
 from dotenv import load_dotenv
 load_dotenv()
@@ -9,16 +10,157 @@ class Settings(BaseModel):
     """
     service_name: str = "kundli-service"
     environment: str = os.getenv("ENVIRONMENT", "development")
-    opencage_api_key: str
+    # Required by the location service only (see location_service)
+    opencage_api_key: str = os.getenv("OPENCAGE_API_KEY", "")
 
+    # Upper bound on records accepted by POST /kundli/batch
+    kundli_batch_max_records: int = int(
+        os.getenv("KUNDLI_BATCH_MAX_RECORDS", "500")
+    )
+    # Records per engine call within a batch (bounds how long one bulk
+    # call holds an engine worker)
+    kundli_batch_chunk_size: int = int(
+        os.getenv("KUNDLI_BATCH_CHUNK_SIZE", "50")
+    )
 
-def get_settings() -> Settings:
-    api_key = os.getenv("OPENCAGE_API_KEY")
+    # Longest date range accepted by GET /transits
+    transit_max_days: int = int(os.getenv("TRANSIT_MAX_DAYS", "1830"))
+
+    # Longest range accepted by GET /panchang
+    panchang_max_days: int = int(os.getenv("PANCHANG_MAX_DAYS", "1096"))
+
+    # Location provider (override to point at a local stand-in)
+    opencage_api_url: str = os.getenv(
+        "OPENCAGE_API_URL", "https://api.opencagedata.com/geocode/v1/json"
+    )
+
+    # Shared outbound HTTP client (keep-alive pool, optional HTTP/2)
+    http_max_connections: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+    http_max_keepalive_connections: int = int(
+        os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10")
+    )
+    http_keepalive_expiry_seconds: float = float(
+        os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "60")
+    )
+    http2_enabled: bool = os.getenv("HTTP2_ENABLED", "false").lower() in ("1", "true")
+
+    # Offline gazetteer (GeoNames cities format) searched before the
+    # location provider (empty = provider only)
+    gazetteer_path: str = os.getenv(
+        "GAZETTEER_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "cities.tsv"),
+    )
+    # GeoNames admin1CodesASCII.txt, for admin-1 names as search
+    # qualifiers ("Salem, Oregon"; empty = codes only)
+    gazetteer_admin1_path: str = os.getenv("GAZETTEER_ADMIN1_PATH", "")
+
+    # Timezone polygons (timezone-boundary-builder GeoJSON) used to
+    # resolve coordinates to an IANA zone (empty = nearest gazetteer
+    # place, within timezone_nearest_place_max_km)
+    timezone_boundaries_path: str = os.getenv("TIMEZONE_BOUNDARIES_PATH", "")
+    # Without polygons: furthest gazetteer place whose zone is used
+    timezone_nearest_place_max_km: float = float(
+        os.getenv("TIMEZONE_NEAREST_PLACE_MAX_KM", "150")
+    )
+
+    # Location search cache: in-process LRU in front of a SQLite file
+    # (empty path = LRU only)
+    geocode_cache_size: int = int(os.getenv("GEOCODE_CACHE_SIZE", "2048"))
+    geocode_cache_ttl_seconds: float = float(
+        os.getenv("GEOCODE_CACHE_TTL_SECONDS", str(30 * 24 * 3600))
+    )
+    geocode_cache_path: str = os.getenv(
+        "GEOCODE_CACHE_PATH", "cache/geocode.sqlite3"
+    )
+    # Age after which a cached result is served while being refreshed
+    geocode_fresh_seconds: float = float(
+        os.getenv("GEOCODE_FRESH_SECONDS", str(7 * 24 * 3600))
+    )
+
+    # Circuit breaker around the location provider
+    location_breaker_failures: int = int(
+        os.getenv("LOCATION_BREAKER_FAILURES", "5")
+    )
+    location_breaker_reset_seconds: float = float(
+        os.getenv("LOCATION_BREAKER_RESET_SECONDS", "30")
+    )
+
+    # Precomputed sidereal ephemeris table, the fast path for planet
+    # positions (built by `python -m app.core.ephemeris_table build`)
+    ephemeris_table_enabled: bool = (
+        os.getenv("EPHEMERIS_TABLE_ENABLED", "true").lower() in ("1", "true")
+    )
+    ephemeris_table_path: str = os.getenv(
+        "EPHEMERIS_TABLE_PATH",
+        os.path.join(
+            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+            "ephemeris",
+            "sidereal_table.bin",
+        ),
+    )
 
-    if not api_key:
-        raise RuntimeError("OPENCAGE_API_KEY is missing. Backend cannot start.")
+    # Location-independent planet positions kept per engine process
+    position_cache_size: int = int(os.getenv("POSITION_CACHE_SIZE", "4096"))
 
-    return Settings(opencage_api_key=api_key)
+    # Upper bound on candidates per POST /match/rank
+    match_max_candidates: int = int(
+        os.getenv("MATCH_MAX_CANDIDATES", "50000")
+    )
+
+    # Engine process pool (0 = run engine calls in the thread pool)
+    engine_workers: int = int(
+        os.getenv("ENGINE_WORKERS", str(os.cpu_count() or 1))
+    )
+
+    # Admission control for engine-backed routes (per worker process):
+    # concurrent requests, waiting requests, longest wait before 503
+    admission_max_concurrent: int = int(
+        os.getenv("ADMISSION_MAX_CONCURRENT", "32")
+    )
+    admission_queue_size: int = int(os.getenv("ADMISSION_QUEUE_SIZE", "64"))
+    admission_max_wait_seconds: float = float(
+        os.getenv("ADMISSION_MAX_WAIT_SECONDS", "10")
+    )
+
+    # Engine lanes: weighted fair share between interactive and bulk
+    # work, the fraction of slots bulk work may hold, and what runs as
+    # bulk (full route paths, X-API-Key values; comma-separated)
+    engine_interactive_weight: int = int(
+        os.getenv("ENGINE_INTERACTIVE_WEIGHT", "8")
+    )
+    engine_bulk_weight: int = int(os.getenv("ENGINE_BULK_WEIGHT", "1"))
+    engine_bulk_share: float = float(os.getenv("ENGINE_BULK_SHARE", "0.5"))
+    engine_bulk_routes: List[str] = [
+        r.strip()
+        for r in os.getenv("ENGINE_BULK_ROUTES", "/api/v1/kundli/batch").split(",")
+        if r.strip()
+    ]
+    engine_bulk_api_keys: List[str] = [
+        k.strip() for k in os.getenv("ENGINE_BULK_API_KEYS", "").split(",") if k.strip()
+    ]
+
+    # Deadline of engine-backed requests per lane (a shorter
+    # X-Request-Timeout header wins)
+    request_timeout_seconds: float = float(
+        os.getenv("REQUEST_TIMEOUT_SECONDS", "30")
+    )
+    bulk_request_timeout_seconds: float = float(
+        os.getenv("BULK_REQUEST_TIMEOUT_SECONDS", "300")
+    )
+
+    # Kundli result cache
+    kundli_cache_size: int = int(os.getenv("KUNDLI_CACHE_SIZE", "1024"))
+    kundli_cache_ttl_seconds: float = float(
+        os.getenv("KUNDLI_CACHE_TTL_SECONDS", "3600")
+    )
+    # Decimal places kept from latitude/longitude in the cache key
+    kundli_cache_coord_precision: int = int(
+        os.getenv("KUNDLI_CACHE_COORD_PRECISION", "4")
+    )
+
+
+def get_settings() -> Settings:
+    return Settings()
 
 
 settings = get_settings()
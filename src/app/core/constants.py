@@ -26,12 +26,40 @@ HOUSE_SYSTEM_WHOLE_SIGN = "Whole Sign"
 # ---------------------------------------------------------
 # CHART TYPES
 # ---------------------------------------------------------
-CHART_D1 = "D1"   # Rāśi
-CHART_D9 = "D9"   # Navāṁśa
+CHART_D1 = "D1"     # Rāśi
+CHART_D2 = "D2"     # Horā
+CHART_D3 = "D3"     # Drekkāṇa
+CHART_D4 = "D4"     # Chaturthāṁśa
+CHART_D7 = "D7"     # Saptāṁśa
+CHART_D9 = "D9"     # Navāṁśa
+CHART_D10 = "D10"   # Daśāṁśa
+CHART_D12 = "D12"   # Dvādaśāṁśa
+CHART_D16 = "D16"   # Ṣoḍaśāṁśa
+CHART_D20 = "D20"   # Viṁśāṁśa
+CHART_D24 = "D24"   # Chaturviṁśāṁśa
+CHART_D27 = "D27"   # Bhāṁśa
+CHART_D30 = "D30"   # Triṁśāṁśa
+CHART_D40 = "D40"   # Khavedāṁśa
+CHART_D45 = "D45"   # Akṣavedāṁśa
+CHART_D60 = "D60"   # Ṣaṣṭyāṁśa
 
 SUPPORTED_CHARTS = {
     CHART_D1,
-    CHART_D9
+    CHART_D2,
+    CHART_D3,
+    CHART_D4,
+    CHART_D7,
+    CHART_D9,
+    CHART_D10,
+    CHART_D12,
+    CHART_D16,
+    CHART_D20,
+    CHART_D24,
+    CHART_D27,
+    CHART_D30,
+    CHART_D40,
+    CHART_D45,
+    CHART_D60
 }
 
 
@@ -0,0 +1,234 @@
+# app/core/deadline.py
+"""
+Per-request deadlines and client-disconnect checks.
+
+A request gets a deadline (wall-clock time, so engine processes can
+check it too) from its X-Request-Timeout header or the route default,
+and a watcher that notices when its client disconnects. Both follow
+the request through context variables.
+
+- `checkpoint(stage)` abandons the work with WorkCancelled when the
+  deadline has passed or the client is gone
+- `until_cancelled(work, stage)` waits for work (e.g. a pooled engine
+  call) but stops waiting as soon as either happens
+- engine code runs in other processes and gets a CancelToken instead:
+  the deadline plus a slot in a shared-memory flag array
+  (CancelFlags) that the caller sets to abandon the work;
+  `check_cancelled(token, stage)` checks both between stages
+
+Abandoned work is counted per reason and stage, with the engine time
+it had already used, as the "cancellations" metrics.
+"""
+
+import asyncio
+import multiprocessing
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, NamedTuple, Optional, TypeVar
+
+from app.core.metrics import register_metrics
+
+T = TypeVar("T")
+
+DEADLINE, DISCONNECT = "deadline", "disconnect"
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+_disconnected: ContextVar[Optional[asyncio.Event]] = ContextVar(
+    "request_disconnected", default=None
+)
+
+
+class WorkCancelled(Exception):
+    def __init__(self, reason: str, stage: str):
+        # Both in args so the exception survives pickling from a worker
+        super().__init__(reason, stage)
+        self.reason = reason
+        self.stage = stage
+
+    def __str__(self) -> str:
+        if self.reason == DEADLINE:
+            return f"Request deadline exceeded ({self.stage})"
+        return f"Client disconnected ({self.stage})"
+
+
+class CancelToken(NamedTuple):
+    """
+    Passed to engine functions (picklable): the request deadline
+    (epoch seconds) and the caller's slot in the cancel flags.
+    """
+    deadline: Optional[float]
+    flag: Optional[int] = None
+
+
+# ---------------------------------------------------------
+# METRICS
+# ---------------------------------------------------------
+_cancelled: Dict[str, int] = {DEADLINE: 0, DISCONNECT: 0}
+_by_stage: Dict[str, int] = {}
+_wasted_engine_seconds = 0.0
+
+
+def record_cancelled(exc: WorkCancelled, engine_seconds: float = 0.0) -> None:
+    """
+    Count abandoned work; `engine_seconds` of engine time it had used.
+    """
+    global _wasted_engine_seconds
+
+    _cancelled[exc.reason] += 1
+    stage = f"{exc.reason}:{exc.stage}"
+    _by_stage[stage] = _by_stage.get(stage, 0) + 1
+    _wasted_engine_seconds += engine_seconds
+
+
+def _stats() -> Dict[str, Any]:
+    return {
+        **_cancelled,
+        "by_stage": dict(_by_stage),
+        "wasted_engine_seconds": round(_wasted_engine_seconds, 3),
+    }
+
+
+register_metrics("cancellations", _stats)
+
+
+# ---------------------------------------------------------
+# REQUEST CONTEXT
+# ---------------------------------------------------------
+def set_request_deadline(timeout: Optional[float]) -> None:
+    """
+    Start the current request's deadline: `timeout` seconds from now
+    (None = none).
+    """
+    _deadline.set(time.time() + timeout if timeout is not None else None)
+
+
+@asynccontextmanager
+async def watch_disconnect(receive: Callable[[], Awaitable[Dict[str, Any]]]) -> AsyncIterator[None]:
+    """
+    Watch the request's ASGI `receive` (its body already read) for the
+    client disconnecting, for as long as the context is open.
+    """
+    # Request.is_disconnected() only polls, and cannot see the message
+    # through the request-logging middleware; a waiting task does
+    gone = asyncio.Event()
+
+    async def watch() -> None:
+        while (await receive())["type"] != "http.disconnect":
+            pass
+        gone.set()
+
+    _disconnected.set(gone)
+    watcher = asyncio.create_task(watch())
+    try:
+        yield
+    finally:
+        watcher.cancel()
+
+
+def current_deadline() -> Optional[float]:
+    return _deadline.get()
+
+
+def check_deadline(deadline: Optional[float], stage: str) -> None:
+    if deadline is not None and time.time() >= deadline:
+        raise WorkCancelled(DEADLINE, stage)
+
+
+# ---------------------------------------------------------
+# CANCEL FLAGS (SHARED WITH ENGINE PROCESSES)
+# ---------------------------------------------------------
+class CancelFlags:
+    def __init__(self, size: int):
+        """
+        One flag per engine slot, in shared memory; `array` is passed
+        to each engine process at start (attach_cancel_flags).
+        """
+        self.array = multiprocessing.get_context("spawn").RawArray("b", max(1, size))
+        self._free: List[int] = list(range(len(self.array)))
+
+    def acquire(self) -> int:
+        flag = self._free.pop()
+        self.array[flag] = 0
+        return flag
+
+    def cancel(self, flag: int) -> None:
+        self.array[flag] = 1
+
+    def release(self, flag: int) -> None:
+        self._free.append(flag)
+
+
+_cancel_flags: Optional[Any] = None
+
+
+def attach_cancel_flags(array: Any) -> None:
+    """
+    Make a CancelFlags array visible to check_cancelled in this process.
+    """
+    global _cancel_flags
+    _cancel_flags = array
+
+
+def check_cancelled(token: Optional[CancelToken], stage: str) -> None:
+    """
+    Engine-side check: raise WorkCancelled once the deadline has passed
+    or the caller has abandoned the work.
+    """
+    if token is None:
+        return
+
+    check_deadline(token.deadline, stage)
+
+    flags = _cancel_flags
+    if token.flag is not None and flags is not None and flags[token.flag]:
+        raise WorkCancelled(DISCONNECT, stage)
+
+
+def checkpoint(stage: str) -> None:
+    """
+    Raise (and count) WorkCancelled if the current request's deadline
+    has passed or its client has disconnected.
+    """
+    try:
+        check_deadline(_deadline.get(), stage)
+
+        gone = _disconnected.get()
+        if gone is not None and gone.is_set():
+            raise WorkCancelled(DISCONNECT, stage)
+
+    except WorkCancelled as exc:
+        record_cancelled(exc)
+        raise
+
+
+async def until_cancelled(work: "asyncio.Future[T]", stage: str) -> T:
+    """
+    Wait for `work`; raise WorkCancelled (not counted, the caller knows
+    what was spent) once the current request's deadline passes or its
+    client disconnects. `work` is left running: stopping it is up to
+    the caller.
+    """
+    deadline = _deadline.get()
+    gone = _disconnected.get()
+    if deadline is None and gone is None:
+        return await asyncio.shield(work)
+
+    waiters = {work}
+    if gone is not None:
+        waiters.add(asyncio.ensure_future(gone.wait()))
+
+    try:
+        await asyncio.wait(
+            waiters,
+            timeout=max(0.0, deadline - time.time()) if deadline is not None else None,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+    finally:
+        for waiter in waiters:
+            if waiter is not work:
+                waiter.cancel()
+
+    if not work.done():
+        raise WorkCancelled(DISCONNECT if gone is not None and gone.is_set() else DEADLINE, stage)
+    return work.result()
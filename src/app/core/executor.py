@@ -0,0 +1,205 @@
+# app/core/executor.py
+"""
+Process pool for CPU-bound engine calls.
+
+Swiss Ephemeris work is synchronous; running it on the event loop
+blocks every other request on the worker. Engine functions are sent
+to a pool of processes, each pre-initialised with init_swisseph().
+At most `engine_workers` calls are handed to the pool at once (its
+own queue is FIFO); further callers wait on the event loop in their
+lane (interactive / bulk, see app.core.admission), so the lane
+scheduler decides what runs next. Bulk calls may hold at most
+ENGINE_BULK_SHARE of the workers and never the last one, so with two
+or more workers an interactive call always finds a free process. With
+a single worker it waits for at most one bulk call (one
+KUNDLI_BATCH_CHUNK_SIZE chunk).
+
+Every engine function takes a `cancel` CancelToken (app.core.deadline)
+and checks it between its stages. When a request's deadline passes or
+its client disconnects, run_engine answers at once, sets the call's
+cancel flag and keeps the slot until the process has actually stopped,
+so a pool slot is never handed out while a worker is still busy.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.admission import BULK, AdmissionController, bulk_slots, current_lane, lane_weights
+from app.core.config import settings
+from app.core.deadline import (
+    CancelFlags,
+    CancelToken,
+    WorkCancelled,
+    attach_cancel_flags,
+    checkpoint,
+    current_deadline,
+    record_cancelled,
+    until_cancelled,
+)
+from app.core.metrics import engine_metrics, record_engine_metrics, register_metrics, reset_engine_metrics
+from app.core.swisseph_init import init_swisseph
+
+logger = logging.getLogger("kundli-service.executor")
+
+_executor: Optional[ProcessPoolExecutor] = None
+_slots: Optional[AdmissionController] = None
+_cancel_flags: Optional[CancelFlags] = None
+
+
+def _init_worker(cancel_flags: Any) -> None:
+    init_swisseph()
+    attach_cancel_flags(cancel_flags)
+
+
+def _run_in_worker(fn: Callable[..., Any], kwargs: Dict[str, Any]) -> Tuple[Any, int, Dict[str, Any]]:
+    # The result, plus this process's engine metrics (app.core.metrics)
+    return fn(**kwargs), os.getpid(), engine_metrics()
+
+
+def _create_executor() -> ProcessPoolExecutor:
+    # "spawn" keeps workers independent of the parent's threads/event loop
+    return ProcessPoolExecutor(
+        max_workers=settings.engine_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(_cancel_flags.array,),
+    )
+
+
+def start_engine_pool() -> None:
+    """
+    Create the engine pool. Must be called from the running event loop.
+    """
+    global _executor, _slots, _cancel_flags
+
+    workers = max(settings.engine_workers, 1)
+
+    # One flag per slot; also read in this process by thread pool calls
+    _cancel_flags = CancelFlags(workers)
+    attach_cancel_flags(_cancel_flags.array)
+
+    if settings.engine_workers > 0:
+        _executor = _create_executor()
+
+    _slots = AdmissionController(
+        max_concurrent=workers,
+        weights=lane_weights(),
+        limits={BULK: bulk_slots(workers)},
+    )
+    register_metrics("engine_scheduler", _slots.stats)
+
+    logger.info(
+        "Engine pool started | workers=%d | bulk_limit=%d",
+        settings.engine_workers,
+        bulk_slots(workers),
+    )
+
+
+def shutdown_engine_pool() -> None:
+    global _executor, _slots, _cancel_flags
+
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+
+    _executor = None
+    _slots = None
+    _cancel_flags = None
+    attach_cancel_flags(None)
+    reset_engine_metrics()
+
+
+async def _call(fn: Callable[..., Any], kwargs: Dict[str, Any]) -> Any:
+    global _executor
+
+    if _executor is None:
+        return await run_in_threadpool(fn, **kwargs)
+
+    executor = _executor
+    loop = asyncio.get_running_loop()
+    try:
+        result, pid, metrics = await loop.run_in_executor(
+            executor, partial(_run_in_worker, fn, kwargs)
+        )
+    except BrokenProcessPool:
+        # A worker died (OOM, segfault in C code): replace the pool
+        # once so later requests are not failed as well.
+        if _executor is executor:
+            logger.exception("Engine pool broken, restarting")
+            executor.shutdown(wait=False, cancel_futures=True)
+            _executor = _create_executor()
+            reset_engine_metrics()
+        raise
+
+    record_engine_metrics(pid, metrics)
+    return result
+
+
+async def run_engine(fn: Callable[..., Any], /, **kwargs: Any) -> Any:
+    """
+    Run a module-level engine function off the event loop.
+
+    Falls back to the thread pool when the process pool is disabled
+    or has not been started (scripts, tests). Work for a request whose
+    deadline has passed or whose client has gone is not started; if
+    that happens while it is running, WorkCancelled is raised at once
+    and the engine stops at its next stage (see the module docstring).
+    """
+    slots = _slots
+    flags = _cancel_flags
+    if slots is None or flags is None:
+        return await run_in_threadpool(fn, **kwargs)
+
+    lane = current_lane()
+    await slots.acquire(lane)
+    started = time.monotonic()
+    flag = flags.acquire()
+
+    def release() -> None:
+        flags.release(flag)
+        slots.release(lane, time.monotonic() - started)
+
+    try:
+        checkpoint("engine_queue")
+    except BaseException:
+        release()
+        raise
+
+    computing = time.monotonic()
+    work = asyncio.ensure_future(
+        _call(fn, {**kwargs, "cancel": CancelToken(current_deadline(), flag)})
+    )
+    try:
+        result = await until_cancelled(work, "engine")
+    except BaseException as exc:
+        if work.done():
+            # The engine itself stopped at one of its checks
+            if isinstance(exc, WorkCancelled):
+                record_cancelled(exc, time.monotonic() - computing)
+            release()
+            raise
+
+        flags.cancel(flag)
+        reason = exc
+
+        def finished(work: "asyncio.Future[Any]") -> None:
+            # The process is free again; whatever it returned is unused
+            if not work.cancelled():
+                work.exception()
+            if isinstance(reason, WorkCancelled):
+                record_cancelled(reason, time.monotonic() - computing)
+            release()
+
+        work.add_done_callback(finished)
+        raise
+
+    release()
+    return result
@@ -0,0 +1,147 @@
+# app/core/http_client.py
+"""
+Shared outbound HTTP client (httpx), one per process.
+
+Created at startup and closed at shutdown, so keep-alive connections
+to providers are reused across requests instead of paying DNS, TCP and
+TLS setup every time. Connection reuse and pool wait are measured with
+httpcore trace events and exposed as the "http_client" metrics.
+"""
+
+import importlib.util
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import register_metrics
+
+logger = logging.getLogger("kundli-service.http")
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+# ---------------------------------------------------------
+# METRICS
+# ---------------------------------------------------------
+class _ClientStats:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.pool_wait_total = 0.0
+        self.pool_wait_max = 0.0
+
+    def tracer(self):
+        """
+        httpcore "trace" extension for one request: the connection was
+        new if TCP connect ran; the pool wait is the time until connect
+        or, on a reused connection, until the request headers go out.
+        """
+        started = time.perf_counter()
+        done = False
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            nonlocal done
+            if done or not event_name.endswith(".started"):
+                return
+
+            if event_name.startswith("connection.connect_tcp"):
+                self.new_connections += 1
+            elif "send_request_headers" in event_name:
+                self.reused_connections += 1
+            else:
+                return
+
+            done = True
+            wait = time.perf_counter() - started
+            self.pool_wait_total += wait
+            self.pool_wait_max = max(self.pool_wait_max, wait)
+
+        return trace
+
+    def snapshot(self) -> Dict[str, Any]:
+        connections = self.new_connections + self.reused_connections
+        return {
+            "started": _client is not None,
+            "http2": settings.http2_enabled and _http2_available(),
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "reuse_ratio": round(self.reused_connections / connections, 4) if connections else 0.0,
+            "pool_wait_avg_ms": round(1000 * self.pool_wait_total / connections, 3) if connections else 0.0,
+            "pool_wait_max_ms": round(1000 * self.pool_wait_max, 3),
+        }
+
+
+_stats = _ClientStats()
+
+register_metrics("http_client", _stats.snapshot)
+
+
+# ---------------------------------------------------------
+# LIFECYCLE
+# ---------------------------------------------------------
+def _http2_available() -> bool:
+    # HTTP/2 needs the optional "h2" package (pip install httpx[http2])
+    return importlib.util.find_spec("h2") is not None
+
+
+def _create_client() -> httpx.AsyncClient:
+    http2 = settings.http2_enabled
+    if http2 and not _http2_available():
+        logger.warning("HTTP2_ENABLED is set but h2 is not installed; using HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(connect=3.0, read=5.0, write=5.0, pool=5.0),
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        ),
+        http2=http2,
+        trust_env=False,
+    )
+
+
+def start_http_client() -> None:
+    global _client
+
+    if _client is None:
+        _client = _create_client()
+        logger.info(
+            "HTTP client started | max_connections=%d | keepalive=%d | http2=%s",
+            settings.http_max_connections,
+            settings.http_max_keepalive_connections,
+            settings.http2_enabled and _http2_available(),
+        )
+
+
+async def close_http_client() -> None:
+    global _client
+
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
+
+
+# ---------------------------------------------------------
+# REQUESTS
+# ---------------------------------------------------------
+async def http_get(url: str, *, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+    """
+    GET through the shared client (started on first use outside the
+    application lifespan: scripts, tests).
+    """
+    if _client is None:
+        start_http_client()
+
+    _stats.requests += 1
+    return await _client.get(
+        url,
+        params=params,
+        extensions={"trace": _stats.tracer()},
+    )
@@ -0,0 +1,82 @@
+# app/core/metrics.py
+"""
+Process-local metrics registry.
+Components register a callable returning a flat dict; the metrics
+endpoint collects a snapshot of all of them.
+
+State that lives in the engine processes (app.core.executor) is
+registered with register_engine_metrics instead: each pooled call
+returns a snapshot of it (engine_metrics), the API process keeps the
+latest one per process (record_engine_metrics) and reports their sum.
+"""
+
+import logging
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger("kundli-service.metrics")
+
+_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+_engine_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+# Latest engine_metrics() per engine process id
+_engine_snapshots: Dict[int, Dict[str, Dict[str, Any]]] = {}
+
+
+def register_metrics(name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+    _providers[name] = provider
+
+
+def register_engine_metrics(name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+    _engine_providers[name] = provider
+
+
+def engine_metrics() -> Dict[str, Dict[str, Any]]:
+    """
+    This process's engine metrics (called in the engine process).
+    """
+    return {name: provider() for name, provider in _engine_providers.items()}
+
+
+def record_engine_metrics(pid: int, snapshot: Dict[str, Dict[str, Any]]) -> None:
+    _engine_snapshots[pid] = snapshot
+
+
+def reset_engine_metrics() -> None:
+    # The engine processes were replaced
+    _engine_snapshots.clear()
+
+
+def _sum_engine_metrics(name: str) -> Dict[str, Any]:
+    # Engine work also runs in this process without a pool
+    snapshots = [engine_metrics()[name]] if not _engine_snapshots else []
+    snapshots += [s[name] for s in _engine_snapshots.values() if name in s]
+
+    total: Dict[str, Any] = {"processes": len(snapshots)}
+    for snapshot in snapshots:
+        for key, value in snapshot.items():
+            if isinstance(value, int) and not isinstance(value, bool):
+                total[key] = total.get(key, 0) + value
+
+    lookups = total.get("hits", 0) + total.get("misses", 0)
+    if lookups:
+        total["hit_ratio"] = round(total["hits"] / lookups, 4)
+    return total
+
+
+def collect_metrics() -> Dict[str, Dict[str, Any]]:
+    snapshot = {}
+    for name, provider in _providers.items():
+        try:
+            snapshot[name] = provider()
+        except Exception:
+            # Never fail the metrics endpoint because of one component
+            logger.exception("Metrics provider failed: %s", name)
+            snapshot[name] = {"error": "unavailable"}
+
+    for name in _engine_providers:
+        try:
+            snapshot[name] = _sum_engine_metrics(name)
+        except Exception:
+            logger.exception("Metrics provider failed: %s", name)
+            snapshot[name] = {"error": "unavailable"}
+    return snapshot
@@ -0,0 +1,23 @@
+# app/core/responses.py
+"""
+JSON responses encoded with orjson, straight to bytes.
+
+For bodies already checked against their schema when they were
+computed (see app.services.kundli_service): a route that returns one
+of these skips FastAPI's per-request validation against the response
+model and its re-serialisation. The response model still documents
+the route.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import Response
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        # Sign-grouped charts are keyed by sign number
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
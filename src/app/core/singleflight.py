@@ -0,0 +1,57 @@
+# app/core/singleflight.py
+"""
+Request coalescing: concurrent calls for the same key share one
+in-flight coroutine instead of each doing the work.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await fn() for `key`, or the call already in flight for it.
+
+        The shared call is shielded: a caller that is cancelled (client
+        gone) does not cancel it for the others. Its result or exception
+        is delivered to every caller; nothing is kept after it finishes.
+        """
+        flight = self._flights.get(key)
+
+        if flight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(flight)
+
+        self.calls += 1
+        flight = asyncio.ensure_future(fn())
+        self._flights[key] = flight
+        flight.add_done_callback(lambda f: self._finish(key, f))
+
+        return await asyncio.shield(flight)
+
+    def _finish(self, key: Hashable, flight: "asyncio.Future[Any]") -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+        # Mark the exception retrieved when every caller has gone
+        if not flight.cancelled():
+            flight.exception()
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._flights),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+        }
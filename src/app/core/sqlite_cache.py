@@ -0,0 +1,131 @@
+# app/core/sqlite_cache.py
+"""
+Persistent key → JSON value store in a local SQLite file, with TTL
+expiry and hit/miss counters. Survives restarts and is shared by all
+worker processes on the host; the second level behind an LRUCache.
+
+Thread-safe (one connection behind a lock). Calls block on disk I/O,
+so async callers run them in the thread pool.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("kundli-service.cache")
+
+
+class SQLiteCache:
+    def __init__(self, *, path: str, ttl: Optional[float] = None):
+        """
+        path: database file (created with its directory on first use)
+        ttl: seconds an entry stays valid (None = no expiry)
+        """
+        self.path = path
+        self.ttl = ttl
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.expirations = 0
+        self.errors = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            conn = sqlite3.connect(
+                self.path,
+                check_same_thread=False,
+                isolation_level=None,       # autocommit
+            )
+            # Readers do not block the writer; losing the last writes on
+            # power loss is acceptable for a cache
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL)"
+            )
+            # Drop what expired while the service was down
+            conn.execute(
+                "DELETE FROM cache WHERE expires_at <= ?", (time.time(),)
+            )
+            self._conn = conn
+
+        return self._conn
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                row = self._connection().execute(
+                    "SELECT value, expires_at FROM cache WHERE key = ?",
+                    (key,),
+                ).fetchone()
+
+                if row is None:
+                    self.misses += 1
+                    return default
+
+                value, expires_at = row
+                if expires_at is not None and expires_at <= time.time():
+                    self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    self.expirations += 1
+                    self.misses += 1
+                    return default
+
+                self.hits += 1
+                return json.loads(value)
+
+            except (sqlite3.Error, OSError, ValueError):
+                # A broken store degrades to a miss, never to an error
+                logger.exception("SQLite cache read failed: %s", self.path)
+                self.errors += 1
+                self.misses += 1
+                return default
+
+    def set(self, key: str, value: Any) -> None:
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+
+        with self._lock:
+            try:
+                self._connection().execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at)"
+                    " VALUES (?, ?, ?)",
+                    (key, json.dumps(value), expires_at),
+                )
+                self.writes += 1
+
+            except (sqlite3.Error, OSError, TypeError):
+                logger.exception("SQLite cache write failed: %s", self.path)
+                self.errors += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "writes": self.writes,
+            "expirations": self.expirations,
+            "errors": self.errors,
+        }
@@ -1,7 +1,13 @@
 # app/core/swisseph_init.py
 import os
+import threading
 import swisseph as swe
 
+# Swiss Ephemeris keeps its settings (ephemeris path, sidereal mode)
+# per thread, so every thread that calls it must be initialised.
+_thread_state = threading.local()
+
+
 def init_swisseph():
     swe.set_ephe_path(
         os.path.abspath(
@@ -11,3 +17,13 @@ def init_swisseph():
 
     # LOCK SIDEREAL MODE GLOBALLY
     swe.set_sid_mode(swe.SIDM_LAHIRI, 0, 0)
+
+    _thread_state.initialised = True
+
+
+def ensure_swisseph():
+    """
+    init_swisseph() once per thread (cheap check on every later call).
+    """
+    if not getattr(_thread_state, "initialised", False):
+        init_swisseph()
@@ -1,12 +1,10 @@
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional
 
-from app.engine.houses import compute_ascendant
-from app.engine.planets import (
-    compute_planetary_positions,
-    _get_nakshatra,
-    longitude_to_dms,
+from app.engine.chart_context import ChartContext
+from app.engine.divisional_charts import (
+    compute_divisional_charts,
+    normalize_chart_names,
 )
-from app.engine.divisional_charts import compute_d9_lagna, compute_d9_chart
 from app.utils.math_utils import house_from_sign
 
 
@@ -51,9 +49,9 @@ def _build_houses(*, planets: List[Dict[str, object]], lagna_sign: int):
 
     return houses
 
-def _build_d9_signs(*, planets: List[Dict[str, object]]):
+def _build_varga_signs(*, planets: List[Dict[str, object]]):
     """
-    ASTROSAGE-CORRECT NAVAMSHA (D9) SIGN-BASED BUILDER
+    ASTROSAGE-CORRECT SIGN-BASED BUILDER (D9 AND OTHER VARGAS)
     No houses, only signs (1–12 fixed).
     """
     signs = {i: [] for i in range(1, 13)}
@@ -80,78 +78,49 @@ def _build_d9_signs(*, planets: List[Dict[str, object]]):
 # PUBLIC API
 # ---------------------------------------------------------
 def build_kundli(
-    julian_day: float,
-    latitude: float,
-    longitude: float
+    context: ChartContext,
+    charts: Optional[Iterable[str]] = None
 ) -> Dict[str, object]:
+    """
+    Build the requested charts (default D1 and D9; D1 always) for one
+    birth from its chart context
+    (see app.engine.chart_context.build_chart_context).
+    """
 
-    # -------------------------------------------------
-    # 1. ASCENDANT (SINGLE SOURCE OF TRUTH)
-    # -------------------------------------------------
-    asc = compute_ascendant(julian_day, latitude, longitude)
-    lagna_sign = asc["lagna_sign"]
-    lagna_degree = asc["lagna_degree"]
-
-    # Absolute sidereal longitude (CRITICAL FIX)
-    asc_longitude = (lagna_sign - 1) * 30 + lagna_degree
-    asc_nk = _get_nakshatra(asc_longitude)
+    lagna_sign = context.lagna_sign
+    vargas = [c for c in normalize_chart_names(charts) if c != "D1"]
 
     # -------------------------------------------------
-    # 2. D1 PLANETS (WITH HOUSE PARITY)
+    # 1. D1 PLANETS INCL. ASCENDANT (FROM CONTEXT)
     # -------------------------------------------------
-    d1_planets = compute_planetary_positions(julian_day, lagna_sign)
+    d1_planets = context.planet_rows()
 
     # -------------------------------------------------
-    # 3. INJECT ASCENDANT (ASTROSAGE STYLE – FIXED)
-    # -------------------------------------------------
-    d1_planets.insert(0, {
-        "name": "Asc",
-        "longitude": asc_longitude,          # ✅ absolute longitude
-        "sign": lagna_sign,
-        "degree_in_sign": lagna_degree,       # ✅ 0–30 only
-        "house": 1,
-        "retrograde": False,
-        "combust": False,
-        "relationship": "",
-        "nakshatra": asc_nk["nakshatra"],
-        "nakshatra_index": asc_nk["nakshatra_index"],
-        "pada": asc_nk["pada"],
-        "longitude_dms": longitude_to_dms(lagna_degree),
-        "ayanamsa": "Lahiri"
-    })
-
-    # -------------------------------------------------
-    # 4. BUILD D1 HOUSES
+    # 2. BUILD D1 HOUSES
     # -------------------------------------------------
     d1_houses = _build_houses(
         planets=d1_planets,
         lagna_sign=lagna_sign
     )
 
-    # -------------------------------------------------
-    # 5. D9 (NAVAMSHA)
-    # -------------------------------------------------
-    d9_lagna_sign = compute_d9_lagna(lagna_sign, lagna_degree)
-    d9_planets = compute_d9_chart(d1_planets, d9_lagna_sign)
-
-    d9_signs = _build_d9_signs(planets=d9_planets)
-
+    result = {
+        "D1": {
+            "chart": "D1",
+            "lagna_sign": lagna_sign,
+            "houses": d1_houses,
+            "planets_raw": d1_planets,
+        }
+    }
 
     # -------------------------------------------------
-    # 6. FINAL RESPONSE
+    # 3. VARGAS (ONE VECTORISED PASS, SIGN-BASED)
     # -------------------------------------------------
-    return {
-    "D1": {
-        "chart": "D1",
-        "lagna_sign": lagna_sign,
-        "houses": d1_houses,
-        "planets_raw": d1_planets,
-    },
-    "D9": {
-        "chart": "D9",
-        "lagna_sign": d9_lagna_sign,
-        "signs": d9_signs,          
-        "planets_raw": d9_planets,
-    },
-}
-
+    for name, varga in compute_divisional_charts(d1_planets, vargas).items():
+        result[name] = {
+            "chart": name,
+            "lagna_sign": varga["lagna_sign"],
+            "signs": _build_varga_signs(planets=varga["planets"]),
+            "planets_raw": varga["planets"],
+        }
+
+    return result
@@ -0,0 +1,128 @@
+# app/engine/chart_context.py
+"""
+Immutable per-chart context.
+
+Everything that depends only on the birth inputs is computed here
+exactly once per chart (time, ascendant, D1 planet rows with houses)
+and then read by the chart builder, karaka/avastha, dasha and the
+response shapers.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.engine.houses import compute_ascendant
+from app.engine.planets import (
+    AYANAMSA_NAME,
+    _get_nakshatra,
+    compute_planetary_positions,
+    longitude_to_dms,
+)
+
+
+@dataclass(frozen=True)
+class ChartContext:
+    # Time (see app.utils.time_utils.compute_time_context)
+    julian_day: float
+    local_datetime: datetime
+    utc_datetime: datetime
+    timezone: float
+
+    # Place
+    latitude: float
+    longitude: float
+
+    full_precision: bool
+
+    # Ascendant
+    lagna_sign: int
+    lagna_degree: float
+    asc_longitude: float
+
+    # D1 rows with houses, "Asc" first. Shared: treat as read-only
+    # (use planet_rows() for copies).
+    planets: Tuple[Dict[str, Any], ...]
+
+    def planet(self, name: str) -> Dict[str, Any]:
+        return next(p for p in self.planets if p["name"] == name)
+
+    def planet_rows(self) -> List[Dict[str, Any]]:
+        return [dict(p) for p in self.planets]
+
+
+def _ascendant_row(
+    asc_longitude: float,
+    lagna_sign: int,
+    lagna_degree: float
+) -> Dict[str, Any]:
+    # ASTROSAGE STYLE: Asc listed as a planet in house 1
+    asc_nk = _get_nakshatra(asc_longitude)
+
+    return {
+        "name": "Asc",
+        "longitude": asc_longitude,          # ✅ absolute longitude
+        "sign": lagna_sign,
+        "degree_in_sign": lagna_degree,       # ✅ 0–30 only
+        "house": 1,
+        "retrograde": False,
+        "combust": False,
+        "relationship": "",
+        "nakshatra": asc_nk["nakshatra"],
+        "nakshatra_index": asc_nk["nakshatra_index"],
+        "pada": asc_nk["pada"],
+        "longitude_dms": longitude_to_dms(lagna_degree),
+        "ayanamsa": AYANAMSA_NAME
+    }
+
+
+def build_chart_context(
+    *,
+    time_ctx: Dict[str, Any],
+    latitude: float,
+    longitude: float,
+    positions: Optional[List[Dict[str, Any]]] = None,
+    full_precision: bool = False
+) -> ChartContext:
+    """
+    Single pass over the location-dependent work for one chart.
+
+    `positions` may carry precomputed location-independent planet
+    positions for the same Julian day (shared across a batch).
+    """
+    julian_day = time_ctx["julian_day"]
+
+    # -------------------------------------------------
+    # 1. ASCENDANT (SINGLE SOURCE OF TRUTH)
+    # -------------------------------------------------
+    asc = compute_ascendant(julian_day, latitude, longitude)
+    lagna_sign = asc["lagna_sign"]
+    lagna_degree = asc["lagna_degree"]
+
+    # Absolute sidereal longitude (CRITICAL FIX)
+    asc_longitude = (lagna_sign - 1) * 30 + lagna_degree
+
+    # -------------------------------------------------
+    # 2. D1 PLANETS (WITH HOUSE PARITY)
+    # -------------------------------------------------
+    planets = compute_planetary_positions(
+        julian_day,
+        lagna_sign,
+        positions=positions,
+        full_precision=full_precision
+    )
+    planets.insert(0, _ascendant_row(asc_longitude, lagna_sign, lagna_degree))
+
+    return ChartContext(
+        julian_day=julian_day,
+        local_datetime=time_ctx["local_datetime"],
+        utc_datetime=time_ctx["utc_datetime"],
+        timezone=time_ctx["timezone"],
+        latitude=latitude,
+        longitude=longitude,
+        full_precision=bool(full_precision),
+        lagna_sign=lagna_sign,
+        lagna_degree=lagna_degree,
+        asc_longitude=asc_longitude,
+        planets=tuple(planets),
+    )
@@ -1,5 +1,8 @@
-from datetime import datetime, timedelta
-from typing import Dict, Any
+from bisect import bisect_right
+from datetime import date, datetime
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from app.utils.time_utils import jd_to_local
 
 # ---------------------------------------------------------
 # CONSTANTS
@@ -25,81 +28,367 @@ DASHA_YEARS = {
     "Mercury": 17,
 }
 
+# Nesting levels, outermost first
+DASHA_LEVELS = ["mahadasha", "antardasha", "pratyantardasha", "sookshma"]
+
+# (lord, start_jd, end_jd)
+Period = Tuple[str, float, float]
+
+
+class DashaComputationError(Exception):
+    pass
+
+
+def _sequence_fractions(lord_idx: int) -> Tuple[float, ...]:
+    # Cumulative share of each sub-period in a period ruled by lord_idx
+    fractions = [0.0]
+    for k in range(9):
+        lord = DASHA_LORDS[(lord_idx + k) % 9]
+        fractions.append(fractions[-1] + DASHA_YEARS[lord] / TOTAL_CYCLE_YEARS)
+    fractions[-1] = 1.0
+    return tuple(fractions)
+
+
+# Shared by every chart: sub-period bounds are the same fractions of
+# the parent span whatever the chart
+SEQUENCE_FRACTIONS = [_sequence_fractions(i) for i in range(9)]
+
 
 # ---------------------------------------------------------
-# PUBLIC API (FINAL – VERSION 1)
+# PERIOD ARITHMETIC (JULIAN DAYS, UT)
+# ---------------------------------------------------------
+def mahadasha_periods(
+    *,
+    moon_longitude: float,
+    birth_jd: float
+) -> List[Period]:
+    """
+    The nine mahadashas of the 120-year cycle running at birth.
+
+    The first period starts before birth: its elapsed part is the
+    fraction of the Moon's nakshatra already traversed at birth_jd.
+    Sub-periods are proportional, so they are derived from this full
+    span (see sub_periods).
+    """
+    nak_idx = int(moon_longitude // NAKSHATRA_WIDTH)
+    lord_idx = nak_idx % 9
+
+    elapsed_ratio = (moon_longitude % NAKSHATRA_WIDTH) / NAKSHATRA_WIDTH
+    first_years = DASHA_YEARS[DASHA_LORDS[lord_idx]]
+
+    start = birth_jd - elapsed_ratio * first_years * DAYS_PER_YEAR
+    periods = []
+
+    for k in range(9):
+        lord = DASHA_LORDS[(lord_idx + k) % 9]
+        end = start + DASHA_YEARS[lord] * DAYS_PER_YEAR
+        periods.append((lord, start, end))
+        start = end
+
+    return periods
+
+
+def _sub_start(start: float, end: float, fractions: Sequence[float], k: int) -> float:
+    # Bound k (0–9) of the sub-periods of start..end; shared by
+    # sub_periods and DashaIndex so both give bit-identical bounds
+    if k == 9:
+        return end
+    return start + (end - start) * fractions[k]
+
+
+def sub_periods(period: Period) -> List[Period]:
+    """
+    Next-level periods of `period`: all nine lords starting from its own
+    lord, each taking years/120 of the parent span.
+    """
+    lord, start, end = period
+    lord_idx = DASHA_LORDS.index(lord)
+    fractions = SEQUENCE_FRACTIONS[lord_idx]
+
+    return [
+        (
+            DASHA_LORDS[(lord_idx + k) % 9],
+            _sub_start(start, end, fractions, k),
+            _sub_start(start, end, fractions, k + 1),
+        )
+        for k in range(9)
+    ]
+
+
+def resolve_dasha_path(
+    *,
+    moon_longitude: float,
+    birth_jd: float,
+    path: Sequence[str] = ()
+) -> List[Period]:
+    """
+    Periods one level below `path` (lords from mahadasha down, e.g.
+    ["Jupiter", "Saturn"] → pratyantardashas of Jupiter/Saturn).
+    Only the branch on the path is expanded.
+    """
+    if len(path) >= len(DASHA_LEVELS):
+        raise DashaComputationError(
+            f"Path deeper than {DASHA_LEVELS[-1]}: {list(path)}"
+        )
+
+    periods = mahadasha_periods(
+        moon_longitude=moon_longitude,
+        birth_jd=birth_jd
+    )
+
+    for depth, lord in enumerate(path):
+        node = next((p for p in periods if p[0] == lord), None)
+        if node is None:
+            raise DashaComputationError(
+                f"Unknown {DASHA_LEVELS[depth]} lord: {lord}"
+            )
+        periods = sub_periods(node)
+
+    return periods
+
+
+def dasha_period_tree(
+    *,
+    moon_longitude: float,
+    birth_jd: float,
+    timezone: float,
+    path: Sequence[str] = (),
+    depth: int = 1
+) -> List[Dict[str, Any]]:
+    """
+    API rows for `depth` levels below `path`, nested under "children".
+    Start/end are local times (ISO). Periods that ended before birth
+    are kept and flagged, since they fix the sub-period bounds.
+    """
+    periods = resolve_dasha_path(
+        moon_longitude=moon_longitude,
+        birth_jd=birth_jd,
+        path=path
+    )
+
+    return _period_rows(
+        periods,
+        birth_jd=birth_jd,
+        timezone=timezone,
+        path=list(path),
+        depth=min(depth, len(DASHA_LEVELS) - len(path))
+    )
+
+
+def _period_rows(
+    periods: List[Period],
+    *,
+    birth_jd: float,
+    timezone: float,
+    path: List[str],
+    depth: int
+) -> List[Dict[str, Any]]:
+    level = DASHA_LEVELS[len(path)]
+    rows = []
+
+    for period in periods:
+        lord, start, end = period
+        row = {
+            "planet": lord,
+            "level": level,
+            "path": path + [lord],
+            "start": jd_to_local(start, timezone).isoformat(),
+            "end": jd_to_local(end, timezone).isoformat(),
+            "start_jd": start,
+            "end_jd": end,
+            "duration_days": end - start,
+            "before_birth": end <= birth_jd,
+        }
+
+        if depth > 1:
+            row["children"] = _period_rows(
+                sub_periods(period),
+                birth_jd=birth_jd,
+                timezone=timezone,
+                path=path + [lord],
+                depth=depth - 1
+            )
+
+        rows.append(row)
+
+    return rows
+
+
+# ---------------------------------------------------------
+# PERIOD INDEX (O(log n) LOOKUP BY DATE)
+# ---------------------------------------------------------
+class DashaIndex:
+    """
+    Compact per-chart index: the ten mahadasha boundaries (Julian days)
+    and their lords. Deeper levels are located with the shared
+    SEQUENCE_FRACTIONS, so a lookup at any level is one bisect per
+    level and no period list is ever built.
+    """
+
+    __slots__ = ("birth_jd", "lords", "boundaries")
+
+    def __init__(self, *, moon_longitude: float, birth_jd: float):
+        periods = mahadasha_periods(
+            moon_longitude=moon_longitude,
+            birth_jd=birth_jd
+        )
+        self.birth_jd = birth_jd
+        self.lords = tuple(p[0] for p in periods)
+        self.boundaries = tuple([p[1] for p in periods] + [periods[-1][2]])
+
+    def periods_at(
+        self,
+        julian_day: float,
+        depth: int = len(DASHA_LEVELS)
+    ) -> Optional[List[Period]]:
+        """
+        Running period at each of the first `depth` levels, outermost
+        first; None outside the 120-year cycle.
+        """
+        i = bisect_right(self.boundaries, julian_day) - 1
+        if not 0 <= i < len(self.lords):
+            return None
+
+        lord = self.lords[i]
+        start, end = self.boundaries[i], self.boundaries[i + 1]
+        running = [(lord, start, end)]
+
+        for _ in range(depth - 1):
+            parent_idx = DASHA_LORDS.index(lord)
+            fractions = SEQUENCE_FRACTIONS[parent_idx]
+            k = min(bisect_right(fractions, (julian_day - start) / (end - start)) - 1, 8)
+
+            # The ratio is rounded: settle dates on a boundary against
+            # the bounds themselves
+            if k < 8 and julian_day >= _sub_start(start, end, fractions, k + 1):
+                k += 1
+            elif k > 0 and julian_day < _sub_start(start, end, fractions, k):
+                k -= 1
+
+            lord = DASHA_LORDS[(parent_idx + k) % 9]
+            start, end = (
+                _sub_start(start, end, fractions, k),
+                _sub_start(start, end, fractions, k + 1),
+            )
+            running.append((lord, start, end))
+
+        return running
+
+    def rows_at(
+        self,
+        julian_day: float,
+        *,
+        timezone: float,
+        depth: int = len(DASHA_LEVELS)
+    ) -> List[Dict[str, Any]]:
+        """
+        API rows (see dasha_period_tree) for periods_at.
+        """
+        running = self.periods_at(julian_day, depth) or []
+        path: List[str] = []
+        rows = []
+
+        for period in running:
+            rows.extend(
+                _period_rows(
+                    [period],
+                    birth_jd=self.birth_jd,
+                    timezone=timezone,
+                    path=list(path),
+                    depth=1
+                )
+            )
+            path.append(period[0])
+
+        return rows
+
+
+# ---------------------------------------------------------
+# PUBLIC API (KUNDLI RESPONSE)
 # ---------------------------------------------------------
 def compute_vimshottari_dasha(
     *,
     moon_longitude: float,
-    birth_date: datetime
+    birth_jd: float,
+    timezone: float,
+    as_of: Optional[date] = None
 ) -> Dict[str, Any]:
     """
-    Vimshottari Dasha – AstroSage parity (Version-1)
+    Vimshottari Dasha – AstroSage parity
 
     - Keyword-only arguments (prevents wiring bugs)
     - Uses Moon longitude for Nakshatra
-    - Anchors balance to birth date (no birth time)
+    - Anchors balance to the exact birth moment (Julian day)
+    - "current" is resolved against as_of (default: today)
     """
 
-    # 1. Nakshatra index (0–26)
-    nak_idx = int(moon_longitude // NAKSHATRA_WIDTH)
-    lord_idx = nak_idx % 9
-
-    start_lord = DASHA_LORDS[lord_idx]
-    total_years = DASHA_YEARS[start_lord]
+    mahadashas = compute_dasha_periods(
+        moon_longitude=moon_longitude,
+        birth_jd=birth_jd,
+        timezone=timezone
+    )
 
-    elapsed = moon_longitude % NAKSHATRA_WIDTH
-    remaining_ratio = 1.0 - (elapsed / NAKSHATRA_WIDTH)
+    return {
+        "mahadasha": mahadashas,
+        "current": find_current_dasha(mahadashas, as_of=as_of)
+    }
 
-    balance_days = int(remaining_ratio * total_years * DAYS_PER_YEAR)
 
-    birth_date_only = birth_date.date()
-    first_end = birth_date_only + timedelta(days=balance_days)
+def compute_dasha_periods(
+    *,
+    moon_longitude: float,
+    birth_jd: float,
+    timezone: float
+) -> List[Dict[str, Any]]:
+    """
+    Mahadasha periods from birth (local dates). Depends solely on the
+    birth data, so the result can be cached; see find_current_dasha
+    for the running period and dasha_period_tree for deeper levels.
+    """
 
-    # Build Mahadasha sequence
-    sequence = DASHA_LORDS[lord_idx:] + DASHA_LORDS[:lord_idx]
+    periods = mahadasha_periods(
+        moon_longitude=moon_longitude,
+        birth_jd=birth_jd
+    )
 
     mahadashas = []
-    current_start = birth_date_only
-    current_end = first_end
-
-    # --- First (Balance) Mahadasha ---
-    mahadashas.append({
-        "planet": start_lord,
-        "start": current_start.strftime("%Y-%m-%d"),
-        "end": current_end.strftime("%Y-%m-%d"),
-        "duration": f"{balance_days} days (bal)",
-        "antardasha": []
-    })
-
-    # --- Remaining Mahadashas ---
-    for lord in sequence[1:]:
-        years = DASHA_YEARS[lord]
-        next_end = current_end.replace(year=current_end.year + years)
+
+    for k, (lord, start, end) in enumerate(periods):
+        if k == 0:
+            # --- First (Balance) Mahadasha ---
+            start = birth_jd
+            duration = f"{int(end - birth_jd)} days (bal)"
+        else:
+            duration = f"{DASHA_YEARS[lord]}y"
 
         mahadashas.append({
             "planet": lord,
-            "start": current_end.strftime("%Y-%m-%d"),
-            "end": next_end.strftime("%Y-%m-%d"),
-            "duration": f"{years}y",
+            "start": jd_to_local(start, timezone).strftime("%Y-%m-%d"),
+            "end": jd_to_local(end, timezone).strftime("%Y-%m-%d"),
+            "duration": duration,
+            # Deeper levels on demand: GET /api/v1/dasha/periods
             "antardasha": []
         })
 
-        current_end = next_end
+    return mahadashas
 
-    # --- Current Dasha Detection ---
-    today = datetime.now().date()
+
+def find_current_dasha(
+    mahadashas: List[Dict[str, Any]],
+    *,
+    as_of: Optional[date] = None
+) -> Dict[str, Optional[str]]:
+    """
+    Running period on as_of (default: today).
+    Period bounds are ISO dates, so plain string comparison is exact.
+    """
+
+    day = (as_of or datetime.now().date()).isoformat()
     current = {"mahadasha": None, "antardasha": None}
 
     for md in mahadashas:
-        s = datetime.strptime(md["start"], "%Y-%m-%d").date()
-        e = datetime.strptime(md["end"], "%Y-%m-%d").date()
-        if s <= today < e:
+        if md["start"] <= day < md["end"]:
             current["mahadasha"] = md["planet"]
             break
 
-    return {
-        "mahadasha": mahadashas,
-        "current": current
-    }
+    return current
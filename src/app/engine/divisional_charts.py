@@ -1,4 +1,18 @@
-from typing import Dict, List
+"""
+Shodashavarga (D1–D60) divisional charts, Parashari rules.
+
+Every varga is a precomputed table VARGA_TABLES[name][rasi, slot] →
+varga sign (0-based), where slot is the equal division of the sign the
+degree falls in (D30 uses 1° slots because its parts are unequal).
+All bodies and all requested vargas are evaluated with array lookups,
+no per-planet branching.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.constants import SUPPORTED_CHARTS
 
 
 class DivisionalChartError(Exception):
@@ -14,64 +28,158 @@ def sign_from_degree(deg: float) -> int:
 
 
 # ---------------------------------------------------------
-# NAVAMSA (D9) — ASTROSAGE PARITY
+# LOOKUP TABLES (0-based signs: Aries = 0 … Pisces = 11)
 # ---------------------------------------------------------
-def _compute_navamsa_sign(rasi_sign: int, degree_in_sign: float) -> int:
-    """
-    Compute Navamsa sign from rasi sign and degree-in-sign.
-    Matches AstroSage & JHora.
-    """
-    deg = degree_in_sign % 30.0
-    navamsa_index = min(8, int(deg // (30.0 / 9.0)))
+def _equal_parts(divisions: int, start_of) -> np.ndarray:
+    # Sign of part k = start sign for the rasi + k
+    return np.array([
+        [(start_of(rasi) + k) % 12 for k in range(divisions)]
+        for rasi in range(12)
+    ])
 
-    # Movable signs
-    if rasi_sign in (1, 4, 7, 10):
-        start = rasi_sign
-    # Fixed signs
-    elif rasi_sign in (2, 5, 8, 11):
-        start = ((rasi_sign + 8 - 1) % 12) + 1
-    # Dual signs
-    else:
-        start = ((rasi_sign + 4 - 1) % 12) + 1
 
-    return ((start + navamsa_index - 1) % 12) + 1
+def _odd(rasi: int) -> bool:
+    # Aries, Gemini, … (odd in 1-based counting)
+    return rasi % 2 == 0
 
 
-def compute_d9_lagna(lagna_sign: int, lagna_degree: float) -> int:
-    """
-    Compute Navamsa Lagna.
-    """
-    return _compute_navamsa_sign(lagna_sign, lagna_degree)
+def _by_quality(movable: int, fixed: int, dual: int):
+    return lambda rasi: (movable, fixed, dual)[rasi % 3]
 
 
-def compute_d9_chart(
-    planets: List[Dict[str, object]],
-    d9_lagna_sign: int
-) -> List[Dict[str, object]]:
-    """
-    Compute D9 (Navamsa) chart from D1 planets.
-    Backend-only, sign-accurate, AstroSage parity.
-    """
+# D2 (Hora): Sun's hora = Leo, Moon's hora = Cancer
+_HORA = np.array([
+    [4, 3] if _odd(rasi) else [3, 4]
+    for rasi in range(12)
+])
+
+# D30 (Trimsamsa): unequal parts, tabulated per degree
+_TRIMSAMSA_ODD = [(5, 0), (10, 10), (18, 8), (25, 2), (30, 6)]
+_TRIMSAMSA_EVEN = [(5, 1), (12, 5), (20, 11), (25, 9), (30, 7)]
+
 
-    if d9_lagna_sign is None:
-        raise DivisionalChartError("D9 lagna sign required")
+def _trimsamsa(rasi: int) -> List[int]:
+    parts = _TRIMSAMSA_ODD if _odd(rasi) else _TRIMSAMSA_EVEN
+    return [next(sign for end, sign in parts if degree < end) for degree in range(30)]
 
-    results = []
 
-    for p in planets:
-        if "degree_in_sign" in p:
-            degree = float(p["degree_in_sign"])
-        else:
-            degree = float(p.get("degree", 0.0))
+VARGA_TABLES: Dict[str, np.ndarray] = {
+    "D1": _equal_parts(1, lambda rasi: rasi),
+    "D2": _HORA,
+    "D3": np.array([
+        [(rasi + 4 * k) % 12 for k in range(3)] for rasi in range(12)
+    ]),
+    "D4": np.array([
+        [(rasi + 3 * k) % 12 for k in range(4)] for rasi in range(12)
+    ]),
+    "D7": _equal_parts(7, lambda rasi: rasi if _odd(rasi) else rasi + 6),
+    "D9": _equal_parts(9, lambda rasi: (rasi, rasi + 8, rasi + 4)[rasi % 3]),
+    "D10": _equal_parts(10, lambda rasi: rasi if _odd(rasi) else rasi + 8),
+    "D12": _equal_parts(12, lambda rasi: rasi),
+    "D16": _equal_parts(16, _by_quality(0, 4, 8)),
+    "D20": _equal_parts(20, _by_quality(0, 8, 4)),
+    "D24": _equal_parts(24, lambda rasi: 4 if _odd(rasi) else 3),
+    "D27": _equal_parts(27, lambda rasi: 3 * (rasi % 4)),
+    "D30": np.array([_trimsamsa(rasi) for rasi in range(12)]),
+    "D40": _equal_parts(40, lambda rasi: 0 if _odd(rasi) else 6),
+    "D45": _equal_parts(45, _by_quality(0, 4, 8)),
+    "D60": _equal_parts(60, lambda rasi: rasi),
+}
 
-        rasi_sign = int(p["sign"])
-        d9_sign = _compute_navamsa_sign(rasi_sign, degree)
+# Width of one table slot in degrees
+SLOT_WIDTH = {name: 30.0 / table.shape[1] for name, table in VARGA_TABLES.items()}
+
+assert set(VARGA_TABLES) == SUPPORTED_CHARTS
+
+
+# ---------------------------------------------------------
+# VECTORISED LOOKUP
+# ---------------------------------------------------------
+def compute_varga_signs(
+    sign_index: np.ndarray,
+    degree_in_sign: np.ndarray,
+    vargas: Iterable[str] = ("D9",)
+) -> Dict[str, np.ndarray]:
+    """
+    Varga sign indices (0–11) for arrays of rasi sign indices (0–11)
+    and degrees within sign (0–30), one array per requested varga.
+    """
+    sign_index = np.asarray(sign_index, dtype=int)
+    degree_in_sign = np.asarray(degree_in_sign, dtype=float) % 30.0
+
+    result = {}
+    for name in vargas:
+        table = VARGA_TABLES.get(name)
+        if table is None:
+            raise DivisionalChartError(f"Unsupported divisional chart: {name}")
+
+        # floor_divide, not floor(a / b): the rounded quotient puts
+        # e.g. 10.0 in the fourth navamsa instead of the third
+        slot = np.minimum(
+            np.floor_divide(degree_in_sign, SLOT_WIDTH[name]).astype(int),
+            table.shape[1] - 1
+        )
+        result[name] = table[sign_index, slot]
+
+    return result
+
+
+def compute_divisional_charts(
+    planets: Sequence[Dict[str, object]],
+    vargas: Iterable[str]
+) -> Dict[str, Dict[str, object]]:
+    """
+    Divisional placements of D1 rows (Asc first) for every requested
+    varga in one pass. Each chart carries its lagna sign (1–12) and
+    planet rows {"name", "sign", "degree", "retrograde"}, where degree
+    is the D1 degree within sign.
+    """
+    if not planets or planets[0]["name"] != "Asc":
+        raise DivisionalChartError("D1 rows must start with the ascendant")
+
+    degrees = [
+        float(p["degree_in_sign"]) if "degree_in_sign" in p
+        else float(p.get("degree", 0.0))
+        for p in planets
+    ]
+
+    signs = compute_varga_signs(
+        np.array([int(p["sign"]) - 1 for p in planets]),
+        np.array(degrees),
+        vargas
+    )
+
+    charts = {}
+    for name, varga_signs in signs.items():
+        charts[name] = {
+            "lagna_sign": int(varga_signs[0]) + 1,
+            "planets": [
+                {
+                    "name": p["name"],
+                    "sign": int(sign) + 1,
+                    "degree": degree,
+                    "retrograde": p.get("retrograde"),
+                }
+                for p, sign, degree in zip(planets, varga_signs, degrees)
+            ],
+        }
+
+    return charts
+
+
+def normalize_chart_names(charts: Optional[Iterable[str]]) -> List[str]:
+    """
+    Requested chart names → canonical, de-duplicated, D-number order,
+    D1 always included (D1 and D9 when None). Raises
+    DivisionalChartError for unknown names.
+    """
+    names = {"D9"} if charts is None else {c.strip().upper() for c in charts}
+    names.add("D1")
 
-        results.append({
-            "name": p["name"],
-            "sign": d9_sign,
-            "degree": degree,
-            "retrograde": p.get("retrograde"),
-        })
+    unknown = names - SUPPORTED_CHARTS
+    if unknown:
+        raise DivisionalChartError(
+            f"Unsupported divisional chart(s): {', '.join(sorted(unknown))}"
+        )
 
-    return results
+    return sorted(names, key=lambda name: int(name[1:]))
@@ -3,6 +3,8 @@
 from typing import Dict
 import swisseph as swe
 
+from app.core.swisseph_init import ensure_swisseph
+
 
 class AscendantComputationError(Exception):
     """Raised when ascendant (lagna) computation fails."""
@@ -22,16 +24,16 @@ def compute_ascendant(
     - Zodiac: Sidereal
     - Ayanamsa: Lahiri
     - Returns: lagna_sign (1-12), lagna_degree (0-30 within sign)
+
+    The Lahiri sidereal mode is set once per thread (ensure_swisseph),
+    not on every call.
     """
 
     try:
-        # ---------------------------------------------------------
-        # 1. Ensure Lahiri ayanamsa
-        # ---------------------------------------------------------
-        swe.set_sid_mode(swe.SIDM_LAHIRI, 0, 0)
+        ensure_swisseph()
 
         # ---------------------------------------------------------
-        # 2. Compute tropical ascendant (houses are ALWAYS tropical)
+        # 1. Compute tropical ascendant (houses are ALWAYS tropical)
         # ---------------------------------------------------------
         houses, ascmc = swe.houses_ex(
             julian_day,
@@ -44,13 +46,13 @@ def compute_ascendant(
         tropical_asc = ascmc[0]
 
         # ---------------------------------------------------------
-        # 3. Convert to sidereal
+        # 2. Convert to sidereal
         # ---------------------------------------------------------
         ayanamsa = swe.get_ayanamsa_ut(julian_day)
         sidereal_asc = (tropical_asc - ayanamsa) % 360.0
 
         # ---------------------------------------------------------
-        # 4. Zodiac sign
+        # 3. Zodiac sign
         # ---------------------------------------------------------
         lagna_sign = int(sidereal_asc // 30) + 1
 
@@ -1,13 +1,20 @@
-from typing import Dict, Any
-from datetime import datetime
+from datetime import date
+from typing import Dict, Any, List, Optional
 
 from app.core.constants import ZODIAC_SIGNS
+from app.core.deadline import CancelToken, WorkCancelled, check_cancelled
 from app.utils.time_utils import compute_time_context
 from app.engine.chart_builder import build_kundli
-from app.engine.planets import _get_nakshatra
-from app.engine.houses import compute_ascendant
+from app.engine.chart_context import ChartContext, build_chart_context
+from app.engine.planets import _get_nakshatra, compute_sidereal_positions
 from app.engine.planetary_engine import compute_karakas, compute_avasthas
-from app.engine.dasha_engine import compute_vimshottari_dasha
+from app.engine.dasha_engine import compute_dasha_periods, find_current_dasha
+
+
+# Part of every chart cache key: bump whenever a change alters generated
+# output, so no cache (including a future shared or persisted one)
+# serves charts from an older engine
+ENGINE_VERSION = "3"
 
 
 class KundliGenerationError(Exception):
@@ -21,106 +28,287 @@ def generate_kundli(
     timezone: float,
     latitude: float,
     longitude: float,
-    name: str | None = None
+    name: str | None = None,
+    as_of: Optional[date] = None,
+    full_precision: bool = False,
+    charts: Optional[List[str]] = None
 ) -> Dict[str, Any]:
+    """
+    Full Kundli: natal body plus the dasha running on as_of (default: today).
+    """
 
     try:
-        # -------------------------------------------------
-        # 1. TIME CONTEXT
-        # -------------------------------------------------
         time_ctx = compute_time_context(
             date_str=date_str,
             time_str=time_str,
             timezone=timezone
         )
-        julian_day = time_ctx["julian_day"]
+    except Exception as exc:
+        raise KundliGenerationError(str(exc)) from exc
+
+    natal = generate_natal_kundli(
+        time_ctx=time_ctx,
+        latitude=latitude,
+        longitude=longitude,
+        name=name,
+        full_precision=full_precision,
+        charts=charts
+    )
+
+    return apply_current_dasha(natal, as_of=as_of)
+
 
-        # -------------------------------------------------
-        # 2. BUILD CHARTS (SOURCE OF TRUTH)
-        # -------------------------------------------------
-        charts = build_kundli(
-            julian_day=julian_day,
+def generate_natal_kundli(
+    *,
+    time_ctx: Dict[str, Any],
+    latitude: float,
+    longitude: float,
+    name: str | None = None,
+    full_precision: bool = False,
+    charts: Optional[List[str]] = None,
+    cancel: Optional[CancelToken] = None
+) -> Dict[str, Any]:
+    """
+    Immutable natal part of a Kundli (charts, planets, karaka, avastha,
+    dasha periods). Deterministic for its inputs, so safe to cache;
+    vimshottari has no "current" entry (see apply_current_dasha).
+
+    time_ctx is the output of compute_time_context, parsed once by the
+    caller. full_precision=True evaluates Swiss Ephemeris directly
+    instead of the interpolated ephemeris table. charts selects the
+    divisional charts (default D1 and D9, see SUPPORTED_CHARTS).
+    cancel (see app.core.executor) abandons the work with WorkCancelled
+    between stages.
+    """
+
+    try:
+        context = build_chart_context(
+            time_ctx=time_ctx,
             latitude=latitude,
-            longitude=longitude
+            longitude=longitude,
+            full_precision=full_precision
         )
+        check_cancelled(cancel, "chart_context")
 
-        d1_planets = charts["D1"]["planets_raw"]
-
-        # -------------------------------------------------
-        # 3. ASCENDANT SUMMARY
-        # -------------------------------------------------
-        asc = compute_ascendant(julian_day, latitude, longitude)
-        lagna_sign = asc["lagna_sign"]
-        lagna_degree = asc["lagna_degree"]
-
-        asc_longitude = (lagna_sign - 1) * 30 + lagna_degree
-        lagna_nk = _get_nakshatra(asc_longitude)
-
-        # -------------------------------------------------
-        # 4. SUN / MOON
-        # -------------------------------------------------
-        sun = next(p for p in d1_planets if p["name"] == "Sun")
-        moon = next(p for p in d1_planets if p["name"] == "Moon")
-
-        # -------------------------------------------------
-        # 5. KARAKA / AVASTHA
-        # -------------------------------------------------
-        karak = compute_karakas(d1_planets)
-        avastha = compute_avasthas(d1_planets)
-
-        # -------------------------------------------------
-        # 6. VIMSHOTTARI DASHA
-        # -------------------------------------------------
-        birth_datetime = datetime.strptime(
-            f"{date_str} {time_str}",
-            "%Y-%m-%d %H:%M:%S"
+        return _kundli_from_context(
+            context, name=name, chart_names=charts, cancel=cancel
         )
 
-        vimshottari = compute_vimshottari_dasha(
-            moon_longitude=moon["longitude"],
-            birth_date=birth_datetime
+    except WorkCancelled:
+        raise
+
+    except Exception as exc:
+        raise KundliGenerationError(str(exc)) from exc
+
+
+def generate_kundli_batch(
+    records: List[Dict[str, Any]],
+    cancel: Optional[CancelToken] = None
+) -> List[Dict[str, Any]]:
+    """
+    Generate many natal Kundlis in one pass.
+
+    Each record carries the generate_natal_kundli keyword arguments.
+    Records sharing a Julian day (and precision) reuse one set of
+    planet positions.
+    Results keep input order; a failing record yields an "error"
+    item instead of failing the batch. Once `cancel` fires the whole
+    call is abandoned (WorkCancelled) before the next Julian day.
+    """
+
+    results: List[Dict[str, Any]] = [None] * len(records)
+    groups: Dict[tuple, List[int]] = {}
+
+    # -------------------------------------------------
+    # 1. GROUP BY JULIAN DAY
+    # -------------------------------------------------
+    for index, record in enumerate(records):
+        group = (
+            record["time_ctx"]["julian_day"],
+            bool(record.get("full_precision"))
         )
+        groups.setdefault(group, []).append(index)
 
-        reshaped_charts = {
-            "D1": charts["D1"],
-            "D9": charts["D9"]
-        }
+    # -------------------------------------------------
+    # 2. ONE EPHEMERIS PASS PER JULIAN DAY
+    # -------------------------------------------------
+    for (julian_day, full_precision), indices in groups.items():
+        check_cancelled(cancel, "batch")
+
+        try:
+            positions = compute_sidereal_positions(
+                julian_day,
+                full_precision=full_precision
+            )
+        except Exception as exc:
+            for index in indices:
+                results[index] = _batch_error(index, exc)
+            continue
+
+        for index in indices:
+            record = records[index]
+            try:
+                context = build_chart_context(
+                    time_ctx=record["time_ctx"],
+                    latitude=record["latitude"],
+                    longitude=record["longitude"],
+                    positions=positions,
+                    full_precision=full_precision
+                )
+                kundli = _kundli_from_context(
+                    context,
+                    name=record.get("name"),
+                    chart_names=record.get("charts")
+                )
+            except Exception as exc:
+                results[index] = _batch_error(index, exc)
+                continue
+
+            results[index] = {
+                "index": index,
+                "status": "ok",
+                "kundli": kundli,
+                "error": None
+            }
 
+    return results
+
+
+def compute_dasha_anchor(
+    *,
+    time_ctx: Dict[str, Any],
+    full_precision: bool = False,
+    cancel: Optional[CancelToken] = None
+) -> Dict[str, Any]:
+    """
+    Birth moment and Moon longitude: all the dasha engine needs
+    (location-independent, see dasha_period_tree).
+    """
+    check_cancelled(cancel, "dasha_anchor")
+
+    try:
+        positions = compute_sidereal_positions(
+            time_ctx["julian_day"],
+            full_precision=full_precision
+        )
+        moon = next(p for p in positions if p["name"] == "Moon")
 
-        # -------------------------------------------------
-        # 7. FINAL RESPONSE
-        # -------------------------------------------------
         return {
-            "meta": {
-                "name": name,
-                "ayanamsa": "Lahiri",
-                "zodiac": "Sidereal",
-                "house_system": "Whole Sign"
-            },
-            "time": {
-                "local_datetime": time_ctx["local_datetime"].isoformat(),
-                "utc_datetime": time_ctx["utc_datetime"].isoformat(),
-                "julian_day": julian_day,
-                "timezone": timezone
-            },
-            "summary": {
-                "ascendant": ZODIAC_SIGNS[lagna_sign],
-                "ascendant_nakshatra": lagna_nk["nakshatra"],
-                "ascendant_pada": lagna_nk["pada"],
-                "sun": ZODIAC_SIGNS[sun["sign"]],
-                "sun_nakshatra": sun["nakshatra"],
-                "sun_pada": sun["pada"],
-                "moon": ZODIAC_SIGNS[moon["sign"]],
-                "moon_nakshatra": moon["nakshatra"],
-                "moon_pada": moon["pada"]
-            },
-            "charts": reshaped_charts,
-            "planets": d1_planets,
-            "karak": karak,
-            "avastha": avastha,
-            "vimshottari": vimshottari
+            "birth_jd": time_ctx["julian_day"],
+            "timezone": time_ctx["timezone"],
+            "moon_longitude": moon["longitude"],
         }
 
     except Exception as exc:
         raise KundliGenerationError(str(exc)) from exc
 
+
+def apply_current_dasha(
+    kundli: Dict[str, Any],
+    *,
+    as_of: Optional[date] = None
+) -> Dict[str, Any]:
+    """
+    Per-request overlay: copy of a natal Kundli with vimshottari.current
+    resolved against as_of. The natal body is not modified.
+    """
+    vimshottari = kundli["vimshottari"]
+
+    return {
+        **kundli,
+        "vimshottari": {
+            **vimshottari,
+            "current": find_current_dasha(
+                vimshottari["mahadasha"],
+                as_of=as_of
+            )
+        }
+    }
+
+
+def _batch_error(index: int, exc: Exception) -> Dict[str, Any]:
+    return {
+        "index": index,
+        "status": "error",
+        "kundli": None,
+        "error": str(exc)
+    }
+
+
+def _kundli_from_context(
+    context: ChartContext,
+    *,
+    name: Optional[str] = None,
+    chart_names: Optional[List[str]] = None,
+    cancel: Optional[CancelToken] = None
+) -> Dict[str, Any]:
+    # -------------------------------------------------
+    # 2. BUILD CHARTS (SOURCE OF TRUTH)
+    # -------------------------------------------------
+    charts = build_kundli(context, chart_names)
+    check_cancelled(cancel, "charts")
+
+    d1_planets = charts["D1"]["planets_raw"]
+
+    # -------------------------------------------------
+    # 3. ASCENDANT SUMMARY
+    # -------------------------------------------------
+    lagna_sign = context.lagna_sign
+    lagna_nk = _get_nakshatra(context.asc_longitude)
+
+    # -------------------------------------------------
+    # 4. SUN / MOON
+    # -------------------------------------------------
+    sun = next(p for p in d1_planets if p["name"] == "Sun")
+    moon = next(p for p in d1_planets if p["name"] == "Moon")
+
+    # -------------------------------------------------
+    # 5. KARAKA / AVASTHA
+    # -------------------------------------------------
+    karak = compute_karakas(d1_planets)
+    avastha = compute_avasthas(d1_planets)
+
+    # -------------------------------------------------
+    # 6. VIMSHOTTARI DASHA
+    # -------------------------------------------------
+    vimshottari = {
+        "mahadasha": compute_dasha_periods(
+            moon_longitude=moon["longitude"],
+            birth_jd=context.julian_day,
+            timezone=context.timezone
+        )
+    }
+
+    # -------------------------------------------------
+    # 7. FINAL RESPONSE
+    # -------------------------------------------------
+    return {
+        "meta": {
+            "name": name,
+            "ayanamsa": "Lahiri",
+            "zodiac": "Sidereal",
+            "house_system": "Whole Sign"
+        },
+        "time": {
+            "local_datetime": context.local_datetime.isoformat(),
+            "utc_datetime": context.utc_datetime.isoformat(),
+            "julian_day": context.julian_day,
+            "timezone": context.timezone
+        },
+        "summary": {
+            "ascendant": ZODIAC_SIGNS[lagna_sign],
+            "ascendant_nakshatra": lagna_nk["nakshatra"],
+            "ascendant_pada": lagna_nk["pada"],
+            "sun": ZODIAC_SIGNS[sun["sign"]],
+            "sun_nakshatra": sun["nakshatra"],
+            "sun_pada": sun["pada"],
+            "moon": ZODIAC_SIGNS[moon["sign"]],
+            "moon_nakshatra": moon["nakshatra"],
+            "moon_pada": moon["pada"]
+        },
+        "charts": charts,
+        "planets": d1_planets,
+        "karak": karak,
+        "avastha": avastha,
+        "vimshottari": vimshottari
+    }
@@ -0,0 +1,248 @@
+# app/engine/matching.py
+"""
+Ashtakoota (36-guna) compatibility.
+
+All eight kootas are tabulated once at import as 108×108 arrays
+KOOTA_TABLES[koota][boy_pada, girl_pada] (Moon pada 0–107, see
+pada_index). Padas rather than the 27 nakshatras are needed because
+nine nakshatras straddle two signs and four kootas are sign-based.
+Ranking a candidate list is then one fancy-indexing lookup.
+Dosha exceptions (cancellations) are not applied.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from app.constants.zodiac import SIGN_NAMES
+from app.engine.planets import NAKSHATRAS, SIGN_LORDS
+
+
+class MatchingError(Exception):
+    pass
+
+
+# ---------------------------------------------------------
+# CLASSIFICATIONS
+# ---------------------------------------------------------
+PADAS = 108
+PADA_WIDTH = 10.0 / 3.0        # degrees
+
+GENDERS = ("male", "female")
+
+# Varna by sign (0-based); higher is superior
+# Shudra 0, Vaishya 1, Kshatriya 2, Brahmin 3
+_VARNA = [2, 1, 0, 3, 2, 1, 0, 3, 2, 1, 0, 3]
+
+# Vashya groups
+_CHATUSHPADA, _MANAVA, _JALACHARA, _VANACHARA, _KEETA = range(5)
+
+# Vashya by sign; Sagittarius and Capricorn change at 15°
+_VASHYA = {
+    0: _CHATUSHPADA, 1: _CHATUSHPADA, 2: _MANAVA, 3: _JALACHARA,
+    4: _VANACHARA, 5: _MANAVA, 6: _MANAVA, 7: _KEETA,
+    8: (_MANAVA, _CHATUSHPADA), 9: (_CHATUSHPADA, _JALACHARA),
+    10: _MANAVA, 11: _JALACHARA,
+}
+
+_VASHYA_SCORE = [
+    # Chatushpada, Manava, Jalachara, Vanachara, Keeta (girl)
+    [2.0, 1.0, 1.0, 0.5, 1.0],
+    [1.0, 2.0, 0.5, 0.0, 1.0],
+    [1.0, 0.5, 2.0, 1.0, 1.0],
+    [0.5, 0.0, 1.0, 2.0, 0.0],
+    [1.0, 1.0, 1.0, 0.0, 2.0],
+]
+
+# Yoni animal by nakshatra
+_YONI_ANIMALS = [
+    "Horse", "Elephant", "Sheep", "Serpent", "Dog", "Cat", "Rat",
+    "Cow", "Buffalo", "Tiger", "Deer", "Monkey", "Mongoose", "Lion",
+]
+_YONI = [
+    0, 1, 2, 3, 3, 4, 5, 2, 5, 6, 6, 7, 8, 9,
+    8, 9, 10, 10, 4, 11, 12, 11, 13, 0, 13, 7, 1,
+]
+_YONI_SCORE = [
+    [4, 2, 2, 3, 2, 2, 2, 1, 0, 1, 3, 3, 2, 1],
+    [2, 4, 3, 3, 2, 2, 2, 2, 3, 1, 2, 3, 2, 0],
+    [2, 3, 4, 2, 1, 2, 1, 3, 3, 1, 2, 0, 3, 1],
+    [3, 3, 2, 4, 2, 1, 1, 1, 1, 2, 2, 2, 0, 2],
+    [2, 2, 1, 2, 4, 2, 1, 2, 2, 1, 0, 2, 1, 1],
+    [2, 2, 2, 1, 2, 4, 0, 2, 2, 1, 3, 3, 2, 1],
+    [2, 2, 1, 1, 1, 0, 4, 2, 2, 2, 2, 2, 1, 2],
+    [1, 2, 3, 1, 2, 2, 2, 4, 3, 0, 3, 2, 2, 1],
+    [0, 3, 3, 1, 2, 2, 2, 3, 4, 1, 2, 2, 2, 1],
+    [1, 1, 1, 2, 1, 1, 2, 0, 1, 4, 1, 1, 2, 1],
+    [3, 2, 2, 2, 0, 3, 2, 3, 2, 1, 4, 2, 2, 1],
+    [3, 3, 0, 2, 2, 3, 2, 2, 2, 1, 2, 4, 3, 2],
+    [2, 2, 3, 0, 1, 2, 1, 2, 2, 2, 2, 3, 4, 2],
+    [1, 0, 1, 2, 1, 1, 2, 1, 1, 1, 1, 2, 2, 4],
+]
+
+# Graha maitri between the Moon sign lords
+_LORDS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn"]
+_MAITRI_SCORE = [
+    [5.0, 5.0, 5.0, 4.0, 5.0, 0.0, 0.0],
+    [5.0, 5.0, 4.0, 1.0, 4.0, 0.5, 0.5],
+    [5.0, 4.0, 5.0, 0.5, 5.0, 3.0, 0.5],
+    [4.0, 1.0, 0.5, 5.0, 0.5, 5.0, 4.0],
+    [5.0, 4.0, 5.0, 0.5, 5.0, 0.5, 3.0],
+    [0.0, 0.5, 3.0, 5.0, 0.5, 5.0, 5.0],
+    [0.0, 0.5, 0.5, 4.0, 3.0, 5.0, 5.0],
+]
+
+# Gana by nakshatra: Deva 0, Manushya 1, Rakshasa 2
+_GANA = [
+    0, 1, 2, 1, 0, 1, 0, 0, 2, 2, 1, 1, 0, 2,
+    0, 2, 0, 2, 2, 1, 1, 0, 2, 2, 1, 1, 0,
+]
+_GANA_SCORE = [
+    # Deva, Manushya, Rakshasa (girl)
+    [6, 6, 1],
+    [5, 6, 0],
+    [1, 0, 6],
+]
+
+# Nadi by nakshatra: Adi, Madhya, Antya in a zig-zag of six
+_NADI = [(0, 1, 2, 2, 1, 0)[n % 6] for n in range(27)]
+
+KOOTA_MAXIMA = {
+    "varna": 1.0,
+    "vashya": 2.0,
+    "tara": 3.0,
+    "yoni": 4.0,
+    "graha_maitri": 5.0,
+    "gana": 6.0,
+    "bhakoot": 7.0,
+    "nadi": 8.0,
+}
+
+MAX_SCORE = sum(KOOTA_MAXIMA.values())
+
+
+# ---------------------------------------------------------
+# TABLES (BUILT ONCE)
+# ---------------------------------------------------------
+def _pada_attributes(pada: int) -> Dict[str, int]:
+    nakshatra = pada // 4
+    sign = pada // 9
+    vashya = _VASHYA[sign]
+    if isinstance(vashya, tuple):
+        # Pada start within the sign decides the half
+        vashya = vashya[(pada % 9) * PADA_WIDTH >= 15.0]
+
+    return {
+        "nakshatra": nakshatra,
+        "sign": sign,
+        "varna": _VARNA[sign],
+        "vashya": vashya,
+        "yoni": _YONI[nakshatra],
+        "lord": _LORDS.index(SIGN_LORDS[sign + 1]),
+        "gana": _GANA[nakshatra],
+        "nadi": _NADI[nakshatra],
+    }
+
+
+def _tara(from_nak: int, to_nak: int) -> float:
+    # 1.5 unless the count lands on Vipat (3), Pratyak (5) or Naidhana (7)
+    return 0.0 if ((to_nak - from_nak) % 27 + 1) % 9 in (3, 5, 7) else 1.5
+
+
+def _bhakoot(boy_sign: int, girl_sign: int) -> float:
+    # 2/12, 5/9 and 6/8 sign relations carry no points
+    return 0.0 if (girl_sign - boy_sign) % 12 + 1 in (2, 12, 5, 9, 6, 8) else 7.0
+
+
+def _pair_scores(boy: Dict[str, int], girl: Dict[str, int]) -> Dict[str, float]:
+    return {
+        "varna": 1.0 if boy["varna"] >= girl["varna"] else 0.0,
+        "vashya": _VASHYA_SCORE[boy["vashya"]][girl["vashya"]],
+        "tara": _tara(girl["nakshatra"], boy["nakshatra"]) + _tara(boy["nakshatra"], girl["nakshatra"]),
+        "yoni": float(_YONI_SCORE[boy["yoni"]][girl["yoni"]]),
+        "graha_maitri": _MAITRI_SCORE[boy["lord"]][girl["lord"]],
+        "gana": float(_GANA_SCORE[boy["gana"]][girl["gana"]]),
+        "bhakoot": _bhakoot(boy["sign"], girl["sign"]),
+        "nadi": 0.0 if boy["nadi"] == girl["nadi"] else 8.0,
+    }
+
+
+def _build_tables() -> Dict[str, np.ndarray]:
+    attributes = [_pada_attributes(p) for p in range(PADAS)]
+    tables = {koota: np.zeros((PADAS, PADAS)) for koota in KOOTA_MAXIMA}
+
+    for b, boy in enumerate(attributes):
+        for g, girl in enumerate(attributes):
+            for koota, score in _pair_scores(boy, girl).items():
+                tables[koota][b, g] = score
+
+    for table in tables.values():
+        table.setflags(write=False)
+    return tables
+
+
+# KOOTA_TABLES[koota][boy_pada, girl_pada]
+KOOTA_TABLES = _build_tables()
+
+TOTAL_TABLE = sum(KOOTA_TABLES.values())
+TOTAL_TABLE.setflags(write=False)
+
+
+# ---------------------------------------------------------
+# PUBLIC API
+# ---------------------------------------------------------
+def pada_index(nakshatra_index: int, pada: int) -> int:
+    """
+    Moon nakshatra (1–27) and pada (1–4), as returned by
+    planets._get_nakshatra → pada index 0–107.
+    """
+    if not 1 <= nakshatra_index <= 27 or not 1 <= pada <= 4:
+        raise MatchingError(f"Invalid nakshatra/pada: {nakshatra_index}/{pada}")
+    return (nakshatra_index - 1) * 4 + pada - 1
+
+
+def describe_pada(index: int) -> Dict[str, object]:
+    return {
+        "nakshatra": NAKSHATRAS[index // 4],
+        "nakshatra_index": index // 4 + 1,
+        "pada": index % 4 + 1,
+        "moon_sign": SIGN_NAMES[index // 9],
+    }
+
+
+def koota_breakdown(boy_pada: int, girl_pada: int) -> Dict[str, float]:
+    return {
+        koota: float(table[boy_pada, girl_pada])
+        for koota, table in KOOTA_TABLES.items()
+    }
+
+
+def rank_matches(
+    *,
+    profile_pada: int,
+    profile_gender: str,
+    candidate_padas: Sequence[int],
+    top_k: int,
+    min_score: float = 0.0
+) -> List[Tuple[int, float]]:
+    """
+    (candidate position, total guna) of the best `top_k` candidates
+    scoring at least `min_score`, best first; ties keep input order.
+    Candidates are of the other gender than the profile.
+    """
+    if profile_gender not in GENDERS:
+        raise MatchingError(f"Unknown gender: {profile_gender}")
+
+    padas = np.asarray(candidate_padas, dtype=np.intp)
+    if padas.size and (padas.min() < 0 or padas.max() >= PADAS):
+        raise MatchingError("Candidate pada index out of range")
+
+    if profile_gender == "male":
+        totals = TOTAL_TABLE[profile_pada, padas]
+    else:
+        totals = TOTAL_TABLE[padas, profile_pada]
+
+    order = np.argsort(-totals, kind="stable")
+    order = order[totals[order] >= min_score][:top_k]
+
+    return [(int(i), float(totals[i])) for i in order]
@@ -0,0 +1,292 @@
+# app/engine/panchang.py
+"""
+Daily panchang: vara, tithi, nakshatra, yoga and karana at sunrise,
+with the end time of every element running during the day
+(sunrise to next sunrise).
+
+1. Sunrise/sunset per day from swe.rise_trans.
+2. Sun and Moon at all sunrises in one batch (compute_sidereal_longitudes,
+   evaluated with swe.calc_ut so values agree with the refinement).
+3. Each element is a linear combination of the Moon and Sun longitudes
+   that only ever increases, so every boundary between two sunrises is
+   crossed exactly once and refined with find_root (Newton on
+   longitude and speed), not by sampling.
+"""
+
+import math
+from bisect import bisect_right
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from app.core.deadline import CancelToken, check_cancelled
+from app.core.swisseph_init import ensure_swisseph
+from app.engine.planets import NAK_WIDTH, NAKSHATRAS, compute_sidereal_longitudes
+from app.utils.math_utils import find_root
+from app.utils.time_utils import jd_to_local
+
+
+class PanchangComputationError(Exception):
+    pass
+
+
+# ---------------------------------------------------------
+# CONSTANTS
+# ---------------------------------------------------------
+TITHI_NAMES = [
+    "Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami",
+    "Shashthi", "Saptami", "Ashtami", "Navami", "Dashami",
+    "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi",
+]
+
+YOGA_NAMES = [
+    "Vishkumbha", "Priti", "Ayushman", "Saubhagya", "Shobhana",
+    "Atiganda", "Sukarma", "Dhriti", "Shula", "Ganda",
+    "Vriddhi", "Dhruva", "Vyaghata", "Harshana", "Vajra",
+    "Siddhi", "Vyatipata", "Variyana", "Parigha", "Shiva",
+    "Siddha", "Sadhya", "Shubha", "Shukla", "Brahma",
+    "Indra", "Vaidhriti",
+]
+
+# 60 karanas per lunar month: Kimstughna, the seven movable karanas
+# eight times, then the three fixed ones
+_MOVABLE_KARANAS = [
+    "Bava", "Balava", "Kaulava", "Taitila", "Gara", "Vanija", "Vishti",
+]
+KARANA_NAMES = (
+    ["Kimstughna"]
+    + [_MOVABLE_KARANAS[k % 7] for k in range(56)]
+    + ["Shakuni", "Chatushpada", "Naga"]
+)
+
+VARA_NAMES = [
+    "Monday", "Tuesday", "Wednesday", "Thursday",
+    "Friday", "Saturday", "Sunday",
+]
+
+# element: (Moon coefficient, Sun coefficient, width in degrees)
+ELEMENTS = {
+    "tithi": (1, -1, 12.0),
+    "nakshatra": (1, 0, NAK_WIDTH),
+    "yoga": (1, 1, NAK_WIDTH),
+    "karana": (1, -1, 6.0),
+}
+
+# Longest any element can last (~27 h), with margin: crossings are
+# searched this far past the last sunrise so every span has an end
+LOOKAHEAD_DAYS = 2.0
+
+DEFAULT_TOLERANCE_DAYS = 1.0 / 86400     # one second
+
+CALC_FLAGS = swe.FLG_SIDEREAL | swe.FLG_SPEED
+
+
+def _element_name(element: str, index: int) -> Dict[str, Any]:
+    if element == "tithi":
+        paksha = "Shukla" if index < 15 else "Krishna"
+        if index % 15 == 14:
+            name = "Purnima" if index == 14 else "Amavasya"
+        else:
+            name = TITHI_NAMES[index % 15]
+        return {"number": index + 1, "name": name, "paksha": paksha}
+
+    names = {
+        "nakshatra": NAKSHATRAS,
+        "yoga": YOGA_NAMES,
+        "karana": KARANA_NAMES,
+    }[element]
+    return {"number": index + 1, "name": names[index]}
+
+
+# ---------------------------------------------------------
+# EPHEMERIS
+# ---------------------------------------------------------
+def _element_angle(element: str, julian_day: float) -> Tuple[float, float]:
+    # Element angle (0–360) and its daily rate, from swe.calc_ut
+    moon_coef, sun_coef, _ = ELEMENTS[element]
+    moon, _ = swe.calc_ut(julian_day, swe.MOON, CALC_FLAGS)
+    angle, rate = moon_coef * moon[0], moon_coef * moon[3]
+
+    if sun_coef:
+        sun, _ = swe.calc_ut(julian_day, swe.SUN, CALC_FLAGS)
+        angle += sun_coef * sun[0]
+        rate += sun_coef * sun[3]
+
+    return angle % 360.0, rate
+
+
+def _sun_event(julian_day: float, event: int, latitude: float, longitude: float) -> Optional[float]:
+    # Next rise/set after julian_day; None when the Sun does not
+    # rise/set (polar day or night)
+    res, tret = swe.rise_trans(julian_day, swe.SUN, event, (longitude, latitude, 0.0))
+    return tret[0] if res == 0 else None
+
+
+# ---------------------------------------------------------
+# TRANSITIONS
+# ---------------------------------------------------------
+def _crossings(
+    element: str,
+    times: np.ndarray,
+    angles: np.ndarray,
+    tolerance: float
+) -> List[Tuple[float, int]]:
+    """
+    (time, index entered) for every boundary crossed between
+    consecutive sample times, in order.
+    """
+    width = ELEMENTS[element][2]
+    count = round(360.0 / width)
+    crossings = []
+
+    for a, b, angle_a, angle_b in zip(times[:-1], times[1:], angles[:-1], angles[1:]):
+        unwrapped_b = angle_a + (angle_b - angle_a) % 360.0
+        first = math.floor(angle_a / width) + 1
+        last = math.floor(unwrapped_b / width)
+
+        for k in range(first, last + 1):
+            boundary = (k * width) % 360.0
+
+            def offset(t: float) -> Tuple[float, float]:
+                angle, rate = _element_angle(element, t)
+                return (angle - boundary + 180.0) % 360.0 - 180.0, rate
+
+            fa, fb = offset(a)[0], offset(b)[0]
+            t = find_root(offset, a, b, fa, fb, tolerance) if fa < 0 <= fb else a
+            crossings.append((t, k % count))
+            # Later boundaries of this interval lie after this one
+            a = t
+
+    return crossings
+
+
+def _spans(
+    element: str,
+    start: float,
+    end: float,
+    start_index: int,
+    crossings: List[Tuple[float, int]],
+    crossing_times: List[float],
+    timezone: float
+) -> List[Dict[str, Any]]:
+    # Elements running during [start, end), each with its end time
+    spans = []
+    index = start_index
+
+    for t, next_index in crossings[bisect_right(crossing_times, start):]:
+        span = _element_name(element, index)
+        span["end"] = jd_to_local(t, timezone).isoformat()
+        spans.append(span)
+        if t >= end:
+            break
+        index = next_index
+    else:
+        span = _element_name(element, index)
+        span["end"] = None
+        spans.append(span)
+
+    return spans
+
+
+# ---------------------------------------------------------
+# PUBLIC API
+# ---------------------------------------------------------
+def iter_panchang(
+    *,
+    start: date,
+    days: int,
+    latitude: float,
+    longitude: float,
+    timezone: float,
+    tolerance: float = DEFAULT_TOLERANCE_DAYS,
+    cancel: Optional[CancelToken] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    One panchang row per local civil date from `start`. The day runs
+    from sunrise to the next sunrise (local midnight where the Sun does
+    not rise); element values are taken at sunrise. `cancel` is
+    checked between stages.
+    """
+    if days < 1:
+        raise PanchangComputationError("days must be at least 1")
+    if not -90.0 <= latitude <= 90.0 or not -180.0 <= longitude <= 180.0:
+        raise PanchangComputationError("Invalid coordinates")
+
+    ensure_swisseph()
+
+    # -------------------------------------------------
+    # 1. SUNRISE / SUNSET (ONE EXTRA DAY CLOSES THE LAST)
+    # -------------------------------------------------
+    start_jd = swe.julday(start.year, start.month, start.day, 0.0) - timezone / 24.0
+    sunrises: List[Optional[float]] = []
+    anchors = []
+
+    for d in range(days + 1):
+        midnight = start_jd + d
+        sunrise = _sun_event(midnight, swe.CALC_RISE, latitude, longitude)
+        if sunrise is not None and sunrise >= midnight + 1:
+            sunrise = None
+        sunrises.append(sunrise)
+        anchors.append(midnight if sunrise is None else sunrise)
+
+    check_cancelled(cancel, "sunrise")
+
+    # -------------------------------------------------
+    # 2. SUN / MOON AT EVERY SUNRISE (ONE BATCH)
+    # -------------------------------------------------
+    times = np.array(anchors + [anchors[-1] + LOOKAHEAD_DAYS])
+    positions = compute_sidereal_longitudes(times, full_precision=True)
+    moon = positions["Moon"]["longitude"]
+    sun = positions["Sun"]["longitude"]
+
+    # -------------------------------------------------
+    # 3. TRANSITIONS BY ROOT FINDING
+    # -------------------------------------------------
+    indices = {}
+    crossings = {}
+    crossing_times = {}
+    for element, (moon_coef, sun_coef, width) in ELEMENTS.items():
+        check_cancelled(cancel, "transitions")
+        angles = (moon_coef * moon + sun_coef * sun) % 360.0
+        indices[element] = np.floor(angles / width).astype(int)
+        crossings[element] = _crossings(element, times, angles, tolerance)
+        crossing_times[element] = [t for t, _ in crossings[element]]
+
+    for d in range(days):
+        day = start + timedelta(days=d)
+        sunrise = sunrises[d]
+        sunset = _sun_event(anchors[d], swe.CALC_SET, latitude, longitude)
+        if sunset is not None and sunset >= anchors[d + 1]:
+            sunset = None
+
+        row: Dict[str, Any] = {
+            "date": day.isoformat(),
+            "vara": VARA_NAMES[day.weekday()],
+            "sunrise": None if sunrise is None else jd_to_local(sunrise, timezone).isoformat(),
+            "sunset": None if sunset is None else jd_to_local(sunset, timezone).isoformat(),
+            "sun_longitude": float(sun[d]),
+            "moon_longitude": float(moon[d]),
+        }
+
+        for element in ELEMENTS:
+            row[element] = _spans(
+                element,
+                anchors[d],
+                anchors[d + 1],
+                int(indices[element][d]),
+                crossings[element],
+                crossing_times[element],
+                timezone,
+            )
+
+        yield row
+
+
+def compute_panchang(**kwargs: Any) -> List[Dict[str, Any]]:
+    """
+    iter_panchang as a list, for the engine pool (generators do not
+    cross process boundaries).
+    """
+    return list(iter_panchang(**kwargs))
@@ -0,0 +1,82 @@
+from typing import Dict, Any
+
+from app.constants.zodiac import SIGN_NAMES
+
+
+def compute_planetary_relations(kundli: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Planetary relations table (planets, karakas, vimshottari) derived
+    from a natal Kundli (generate_natal_kundli), so both endpoints share
+    one chart computation and one cache entry.
+    Shaped for PlanetaryRelationsResponse; like the natal Kundli it
+    carries dasha periods only (see apply_current_dasha).
+    """
+
+    planets = kundli["planets"]
+
+    # 1. Karakas (NORMALIZED ONCE)
+    karakas_raw = kundli["karak"]
+    karakas = {
+        "sthira": karakas_raw["sthir"],
+        "chara": karakas_raw["chara"]
+    }
+
+    # 2. Avastha (NORMALIZED ONCE)
+    raw_avastha = kundli["avastha"]
+    avastha_map = {
+        a["planet"]: {
+            "jagrat": "",
+            "baladi": "",
+            "deeptadi": a["avastha"]
+        }
+        for a in raw_avastha
+    }
+
+    # 3. Vimshottari (periods shared with the Kundli)
+    vimshottari = {
+        "mahadasha": kundli["vimshottari"]["mahadasha"]
+    }
+
+    # 4. FINAL NORMALIZATION (SINGLE LOOP, FINAL SHAPE)
+    final_planets = [
+        {
+            "name": p["name"],
+
+            # Rashi
+            "sign": SIGN_NAMES[p["sign"] - 1],                            # 1–12
+            "sign_name": SIGN_NAMES[p["sign"] - 1],       # display only
+            "house": p.get("house"),
+
+            # Longitude
+            "longitude": p["longitude"],
+            "degree_in_sign": p["degree_in_sign"],
+            "longitude_dms": p.get("longitude_dms"),
+
+            # Nakshatra
+            "nakshatra": p.get("nakshatra"),
+            "nakshatra_index": p.get("nakshatra_index"),
+            "pada": p.get("pada"),
+
+            # Navamsa
+            "navamsa_sign": p.get("navamsa_sign"),
+            "navamsa_index": p.get("navamsa_index"),
+
+            # State
+            "retrograde": p["retrograde"],
+            "combust": p["combust"],
+            "dignity": p.get("relationship", ""),
+
+            # Avastha
+            "avastha": avastha_map[p["name"]],
+
+            # Meta
+            "ayanamsa": p.get("ayanamsa"),
+        }
+        for p in planets
+    ]
+
+    return {
+        "planets": final_planets,
+        "karakas": karakas,
+        "vimshottari": vimshottari
+    }
@@ -1,8 +1,15 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence
+import numpy as np
 import swisseph as swe
 
-from app.engine.navamsa import compute_navamsa_sign
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.ephemeris_table import get_ephemeris_table
+from app.core.metrics import register_engine_metrics
+from app.core.swisseph_init import ensure_swisseph
+from app.engine.divisional_charts import compute_varga_signs
 from app.constants.zodiac import SIGN_NAMES
+from app.utils.math_utils import house_from_sign
 
 
 class PlanetComputationError(Exception):
@@ -18,6 +25,15 @@ AYANAMSA_MODE = swe.SIDM_LAHIRI
 AYANAMSA_NAME = "Lahiri"
 
 
+# ---------------------------------------------------------
+# POSITION CACHE (per process, keyed by instant only)
+# ---------------------------------------------------------
+# Relocation charts, twins and batches of people born at the same
+# moment share these rows; only the house depends on the location.
+_position_cache = LRUCache(maxsize=settings.position_cache_size)
+register_engine_metrics("position_cache", _position_cache.stats)
+
+
 # ---------------------------------------------------------
 # CONSTANTS
 # ---------------------------------------------------------
@@ -116,66 +132,255 @@ def _get_relationship(planet: str, sign: int, lon: float) -> str:
 # ---------------------------------------------------------
 # MAIN COMPUTATION (FINAL)
 # ---------------------------------------------------------
-def compute_planetary_positions(
+# Dignity per body and sign (index 0 = Aries), for vectorised lookup
+RELATIONSHIP_TABLE = {
+    name: np.array([
+        _get_relationship(name, sign, 0.0) for sign in range(1, 13)
+    ])
+    for name in PLANETS
+}
+
+NAK_WIDTH = 13.333333333333334
+PADA_WIDTH = NAK_WIDTH / 4
+
+
+def compute_sidereal_longitudes(
+    julian_days: Sequence[float],
+    *,
+    full_precision: bool = False
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Sidereal longitude (0–360) and daily speed of every body for an
+    array of Julian days (UT).
+
+    Epochs covered by the precomputed ephemeris table are interpolated
+    (see app.core.ephemeris_table for the error bound); the rest, or all
+    of them with full_precision=True, use swe.calc_ut.
+
+    Returns {body: {"longitude": ndarray, "speed": ndarray}} in PLANETS
+    order. Ketu is derived from Rahu (opposite point, same speed).
+    """
+
+    jds = np.atleast_1d(np.asarray(julian_days, dtype=float))
+    flags = swe.FLG_SIDEREAL | swe.FLG_SPEED
+
+    table = None if full_precision else get_ephemeris_table()
+    if table is not None:
+        covered = table.covers(jds)
+        interpolated = table.interpolate(jds[covered]) if covered.any() else None
+    else:
+        covered = np.zeros(jds.shape, dtype=bool)
+        interpolated = None
+
+    if not covered.all():
+        ensure_swisseph()
+
+    bodies = {}
+
+    for name, pid in PLANETS.items():
+        if name == "Ketu":
+            rahu = bodies["Rahu"]
+            bodies[name] = {
+                "longitude": (rahu["longitude"] + 180) % 360.0,
+                "speed": rahu["speed"].copy(),
+            }
+            continue
+
+        lon = np.empty(jds.shape)
+        speed = np.empty(jds.shape)
+
+        if interpolated is not None:
+            lon[covered] = interpolated[name]["longitude"]
+            speed[covered] = interpolated[name]["speed"]
+
+        for i in np.flatnonzero(~covered):
+            xx, _ = swe.calc_ut(float(jds[i]), pid, flags)
+            lon[i] = xx[0]
+            speed[i] = xx[3]
+
+        bodies[name] = {"longitude": lon % 360.0, "speed": speed}
+
+    return bodies
+
+
+def derive_position_fields(
+    bodies: Dict[str, Dict[str, np.ndarray]]
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Vectorised sign, nakshatra, pada, navamsa, retrograde, combustion and
+    dignity for the output of compute_sidereal_longitudes.
+
+    Same arithmetic as the scalar helpers (_get_sign, _get_nakshatra,
+    longitude_to_dms), so results are identical; navamsa comes from the
+    shared varga tables (app.engine.divisional_charts).
+    """
+
+    sun_long = bodies["Sun"]["longitude"]
+    derived = {}
+
+    for name, body in bodies.items():
+        lon = body["longitude"]
+
+        sign = (lon // 30).astype(int) + 1
+        degree_in_sign = lon % 30
+
+        nak_idx = np.minimum((lon // NAK_WIDTH).astype(int), 26)
+        pada = np.minimum(
+            ((lon - nak_idx * NAK_WIDTH) // PADA_WIDTH).astype(int) + 1,
+            4
+        )
+
+        distance = np.abs(lon - sun_long)
+        separation = np.minimum(distance, 360 - distance)
+        if name in COMBUST_LIMITS:
+            combust = separation <= COMBUST_LIMITS[name]
+        else:
+            combust = np.zeros(lon.shape, dtype=bool)
+
+        # DMS of degree-in-sign (display)
+        dms_deg = degree_in_sign.astype(int)
+        minutes_f = (degree_in_sign - dms_deg) * 60
+        dms_min = minutes_f.astype(int)
+        dms_sec = ((minutes_f - dms_min) * 60).astype(int)
+
+        derived[name] = {
+            "longitude": lon,
+            "speed": body["speed"],
+            "sign": sign,
+            "degree_in_sign": degree_in_sign,
+            "nakshatra_index": nak_idx + 1,
+            "pada": pada,
+            "retrograde": body["speed"] < 0,
+            "combust": combust,
+            "relationship": RELATIONSHIP_TABLE[name][sign - 1],
+            "navamsa_index": compute_varga_signs(
+                sign - 1, degree_in_sign, ("D9",)
+            )["D9"],
+            "dms": np.stack([dms_deg, dms_min, dms_sec], axis=-1),
+        }
+
+    return derived
+
+
+def compute_positions_batch(
+    julian_days: Sequence[float],
+    *,
+    full_precision: bool = False
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Multi-epoch engine: all bodies, all derived fields, one array per
+    field (transits, calendars, analytics).
+    """
+    return derive_position_fields(
+        compute_sidereal_longitudes(julian_days, full_precision=full_precision)
+    )
+
+
+def _position_row(
+    name: str,
+    fields: Dict[str, np.ndarray],
+    i: int
+) -> Dict[str, object]:
+    """
+    Plain-Python row (API shape) for epoch i of one body.
+    """
+    nak_idx = int(fields["nakshatra_index"][i]) - 1
+    nav_index = int(fields["navamsa_index"][i])
+    d, m, s = (int(v) for v in fields["dms"][i])
+
+    return {
+        "name": name,
+        "longitude": float(fields["longitude"][i]),
+        "sign": int(fields["sign"][i]),
+        "degree_in_sign": float(fields["degree_in_sign"][i]),
+        "nakshatra": NAKSHATRAS[nak_idx],
+        "nakshatra_index": nak_idx + 1,
+        "pada": int(fields["pada"][i]),
+        "retrograde": bool(fields["retrograde"][i]),
+        "combust": bool(fields["combust"][i]),
+        "relationship": str(fields["relationship"][i]),
+        "longitude_dms": f"{d}° {m}' {s}\"",
+        "navamsa_index": nav_index,
+        "navamsa_sign": SIGN_NAMES[nav_index],
+        "ayanamsa": AYANAMSA_NAME,
+    }
+
+
+def compute_sidereal_positions(
     julian_day: float,
-    lagna_sign: int
+    *,
+    full_precision: bool = False
 ) -> List[Dict[str, object]]:
+    """
+    Location-independent planet positions for a Julian day.
+
+    Everything except the house depends only on the instant, so the
+    result can be shared by every chart cast for the same moment
+    (see compute_planetary_positions for house placement).
+    Thin wrapper over compute_positions_batch, cached per
+    (julian_day, ayanamsa, full_precision). Returned rows are copies,
+    so callers may modify them freely.
+    """
+
+    key = (float(julian_day), AYANAMSA_NAME, bool(full_precision))
+    rows = _position_cache.get(key)
+
+    if rows is None:
+        try:
+            batch = compute_positions_batch(
+                [julian_day],
+                full_precision=full_precision
+            )
 
-    try:
-        flags = swe.FLG_SIDEREAL | swe.FLG_SPEED
-        results = []
+            rows = tuple(
+                _position_row(name, fields, 0)
+                for name, fields in batch.items()
+            )
 
-        sun_xx, _ = swe.calc_ut(julian_day, swe.SUN, flags)
-        sun_long = _normalize_degree(sun_xx[0])
+        except Exception as exc:
+            raise PlanetComputationError(str(exc)) from exc
 
-        rahu_long = None
-        rahu_retro = None
+        _position_cache.set(key, rows)
 
-        for name, pid in PLANETS.items():
-            xx, _ = swe.calc_ut(julian_day, pid, flags)
-            lon = _normalize_degree(xx[0])
-            retro = xx[3] < 0
+    return [dict(row) for row in rows]
 
-            if name == "Rahu":
-                rahu_long = lon
-                rahu_retro = retro
 
-            if name == "Ketu":
-                lon = _normalize_degree(rahu_long + 180)
-                retro = rahu_retro
+def _place_in_house(position: Dict[str, object], lagna_sign: int) -> Dict[str, object]:
+    """
+    Copy of a location-independent position with its Whole Sign house
+    (kept right after "sign" so the response layout is unchanged).
+    """
+    placed = {}
+    for key, value in position.items():
+        placed[key] = value
+        if key == "sign":
+            # ✅ AstroSage house logic
+            placed["house"] = house_from_sign(
+                planet_sign=int(value),
+                lagna_sign=lagna_sign
+            )
+    return placed
 
-            sign = _get_sign(lon)
-            degree_in_sign = lon % 30
 
-            # ✅ AstroSage house logic
-            house = ((sign - lagna_sign + 12) % 12) + 1
+def compute_planetary_positions(
+    julian_day: float,
+    lagna_sign: int,
+    positions: Optional[List[Dict[str, object]]] = None,
+    *,
+    full_precision: bool = False
+) -> List[Dict[str, object]]:
+    """
+    D1 planet rows with houses relative to lagna_sign.
 
-            separation = min(abs(lon - sun_long), 360 - abs(lon - sun_long))
-            combust = name in COMBUST_LIMITS and separation <= COMBUST_LIMITS[name]
+    Pass `positions` (from compute_sidereal_positions for the same
+    julian_day) to reuse ephemeris work across charts of one instant.
+    full_precision=True bypasses the interpolated ephemeris table.
+    """
 
-            # 🔒 NAVAMSA (FINAL)
-            nav_index = compute_navamsa_sign(
-                sign_index=sign - 1,
-                degree_in_sign=degree_in_sign
-            )
+    if positions is None:
+        positions = compute_sidereal_positions(
+            julian_day,
+            full_precision=full_precision
+        )
 
-            results.append({
-                "name": name,
-                "longitude": lon,
-                "sign": sign,
-                "house": house,
-                "degree_in_sign": degree_in_sign,
-                **_get_nakshatra(lon),
-                "retrograde": retro,
-                "combust": combust,
-                "relationship": _get_relationship(name, sign, lon),
-                "longitude_dms": longitude_to_dms(degree_in_sign),
-                "navamsa_index": nav_index,
-                "navamsa_sign": SIGN_NAMES[nav_index],
-                "ayanamsa": AYANAMSA_NAME,
-            })
-
-        return results
-
-    except Exception as exc:
-        raise PlanetComputationError(str(exc)) from exc
+    return [_place_in_house(p, lagna_sign) for p in positions]
@@ -0,0 +1,295 @@
+# app/engine/transits.py
+"""
+Transit event search: sign ingresses, nakshatra ingresses and
+retrograde/direct stations of the grahas over a date range.
+
+1. Bracket: sample all bodies on one grid (batched, see
+   compute_sidereal_longitudes, evaluated with swe.calc_ut so brackets
+   agree with the refinement). The step comes from each body's maximum
+   daily motion, so a body cannot pass more than one boundary between
+   two samples while moving in one direction.
+2. Stations: a change of sign of the speed between two samples is
+   refined first (regula falsi on the speed), splitting the interval
+   into monotonic parts.
+3. Ingresses: each monotonic part that changes sign/nakshatra index is
+   refined with a safeguarded Newton iteration on swe.calc_ut longitude
+   and speed, to `tolerance` days.
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from app.constants.zodiac import SIGN_NAMES
+from app.core.deadline import CancelToken, check_cancelled
+from app.core.swisseph_init import ensure_swisseph
+from app.engine.planets import (
+    NAK_WIDTH,
+    NAKSHATRAS,
+    PLANETS,
+    compute_sidereal_longitudes,
+)
+from app.utils.math_utils import find_root
+from app.utils.time_utils import jd_to_local
+
+
+class TransitComputationError(Exception):
+    pass
+
+
+# ---------------------------------------------------------
+# CONSTANTS
+# ---------------------------------------------------------
+# Upper bounds of |daily motion| in degrees (geocentric)
+MAX_DAILY_MOTION = {
+    "Sun": 1.02,
+    "Moon": 15.4,
+    "Mars": 0.8,
+    "Mercury": 2.2,
+    "Jupiter": 0.25,
+    "Venus": 1.27,
+    "Saturn": 0.14,
+    "Rahu": 0.06,       # mean node
+    "Ketu": 0.06,
+}
+
+# Bodies with retrograde stations (the mean node is always retrograde)
+STATION_BODIES = {"Mars", "Mercury", "Jupiter", "Venus", "Saturn"}
+
+# Shortest gap between two stations (Mercury retrograde ~3 weeks),
+# with margin
+STATION_STEP_DAYS = 4.0
+
+EVENT_TYPES = ("sign", "nakshatra", "station")
+
+# Boundary spacing per ingress event type
+BOUNDARY_WIDTH = {
+    "sign": 30.0,
+    "nakshatra": NAK_WIDTH,
+}
+
+DEFAULT_TOLERANCE_DAYS = 1.0 / 86400     # one second
+
+CALC_FLAGS = swe.FLG_SIDEREAL | swe.FLG_SPEED
+
+# Grid points sampled between cancellation checks (~0.3 s of work)
+SAMPLE_BLOCK = 1024
+
+
+# ---------------------------------------------------------
+# EPHEMERIS
+# ---------------------------------------------------------
+def _calc(body: str, julian_day: float) -> Tuple[float, float]:
+    """
+    Sidereal longitude and speed straight from swe.calc_ut
+    (Ketu = Rahu + 180°).
+    """
+    pid = PLANETS["Rahu"] if body == "Ketu" else PLANETS[body]
+    xx, _ = swe.calc_ut(julian_day, pid, CALC_FLAGS)
+    longitude = xx[0] + 180.0 if body == "Ketu" else xx[0]
+    return longitude % 360.0, xx[3]
+
+
+def _sample(grid: np.ndarray, cancel: Optional[CancelToken]) -> Dict[str, Dict[str, np.ndarray]]:
+    # compute_sidereal_longitudes over the grid, in blocks
+    blocks = []
+    for i in range(0, len(grid), SAMPLE_BLOCK):
+        check_cancelled(cancel, "transit_samples")
+        blocks.append(compute_sidereal_longitudes(grid[i:i + SAMPLE_BLOCK], full_precision=True))
+
+    return {
+        body: {
+            key: np.concatenate([block[body][key] for block in blocks])
+            for key in ("longitude", "speed")
+        }
+        for body in blocks[0]
+    }
+
+
+def _wrap(angle: float) -> float:
+    # Signed difference in (-180, 180]
+    return (angle + 180.0) % 360.0 - 180.0
+
+
+# ---------------------------------------------------------
+# ROOT FINDING
+# ---------------------------------------------------------
+def _station_time(body: str, a: float, b: float, tolerance: float) -> Optional[float]:
+    speed_a = _calc(body, a)[1]
+    speed_b = _calc(body, b)[1]
+    if (speed_a < 0) == (speed_b < 0):
+        return None
+
+    return find_root(
+        lambda t: (_calc(body, t)[1], None),
+        a, b, speed_a, speed_b, tolerance
+    )
+
+
+def _ingress_time(
+    body: str,
+    boundary: float,
+    a: float,
+    b: float,
+    tolerance: float
+) -> Optional[float]:
+    def offset(t: float) -> Tuple[float, float]:
+        longitude, speed = _calc(body, t)
+        return _wrap(longitude - boundary), speed
+
+    fa = offset(a)[0]
+    fb = offset(b)[0]
+    if (fa < 0) == (fb < 0):
+        return None
+
+    return find_root(offset, a, b, fa, fb, tolerance)
+
+
+# ---------------------------------------------------------
+# SEARCH
+# ---------------------------------------------------------
+def _grid_step(bodies: Iterable[str], event_types: Iterable[str]) -> float:
+    widths = [BOUNDARY_WIDTH[e] for e in event_types if e in BOUNDARY_WIDTH]
+    step = STATION_STEP_DAYS
+
+    for body in bodies:
+        if widths:
+            # Half a boundary spacing at maximum speed
+            step = min(step, 0.5 * min(widths) / MAX_DAILY_MOTION[body])
+
+    return step
+
+
+def _ingress_events(
+    body: str,
+    event_type: str,
+    a: float,
+    b: float,
+    lon_a: float,
+    lon_b: float,
+    tolerance: float
+) -> List[Dict[str, object]]:
+    # a..b is monotonic and shorter than one boundary spacing of travel
+    width = BOUNDARY_WIDTH[event_type]
+    delta = _wrap(lon_b - lon_a)
+    index_a = math.floor(lon_a / width)
+    index_b = math.floor((lon_a + delta) / width)
+
+    if index_a == index_b:
+        return []
+
+    forward = delta > 0
+    boundary = (max(index_a, index_b) * width) % 360.0
+
+    t = _ingress_time(body, boundary, a, b, tolerance)
+    if t is None:
+        return []
+
+    count = round(360.0 / width)
+    before = index_a % count
+    after = index_b % count
+    names = SIGN_NAMES if event_type == "sign" else NAKSHATRAS
+
+    return [{
+        "body": body,
+        "type": f"{event_type}_ingress",
+        "julian_day": t,
+        "longitude": boundary,
+        "retrograde": not forward,
+        "from": names[before],
+        "to": names[after],
+    }]
+
+
+def find_transit_events(
+    *,
+    start_jd: float,
+    end_jd: float,
+    bodies: Sequence[str],
+    event_types: Sequence[str] = EVENT_TYPES,
+    tolerance: float = DEFAULT_TOLERANCE_DAYS,
+    timezone: float = 0.0,
+    cancel: Optional[CancelToken] = None
+) -> List[Dict[str, object]]:
+    """
+    Ingress and station events of `bodies` in [start_jd, end_jd),
+    sorted by time. Times are refined to `tolerance` days against
+    swe.calc_ut; "local_datetime" is in the given UTC offset.
+    `cancel` is checked while sampling and before each body.
+    """
+    unknown = set(bodies) - set(PLANETS)
+    if unknown:
+        raise TransitComputationError(f"Unknown bodies: {sorted(unknown)}")
+
+    unknown = set(event_types) - set(EVENT_TYPES)
+    if unknown:
+        raise TransitComputationError(f"Unknown event types: {sorted(unknown)}")
+
+    if not end_jd > start_jd:
+        raise TransitComputationError("end must be after start")
+
+    ensure_swisseph()
+
+    step = _grid_step(bodies, event_types)
+    count = int(math.ceil((end_jd - start_jd) / step))
+    grid = np.linspace(start_jd, end_jd, count + 1)
+    samples = _sample(grid, cancel)
+
+    events: List[Dict[str, object]] = []
+
+    for body in bodies:
+        check_cancelled(cancel, "transits")
+
+        longitudes = samples[body]["longitude"]
+        speeds = samples[body]["speed"]
+
+        for i in range(count):
+            a, b = float(grid[i]), float(grid[i + 1])
+
+            # -------------------------------------------------
+            # 1. STATIONS (SPLIT INTO MONOTONIC PARTS)
+            # -------------------------------------------------
+            cuts = [a, b]
+            if body in STATION_BODIES and (speeds[i] < 0) != (speeds[i + 1] < 0):
+                t = _station_time(body, a, b, tolerance)
+                if t is not None:
+                    longitude, _ = _calc(body, t)
+                    cuts = [a, t, b]
+                    if "station" in event_types:
+                        events.append({
+                            "body": body,
+                            "type": "station",
+                            "julian_day": t,
+                            "longitude": longitude,
+                            "retrograde": None,
+                            "from": "direct" if speeds[i] > 0 else "retrograde",
+                            "to": "retrograde" if speeds[i] > 0 else "direct",
+                        })
+
+            # -------------------------------------------------
+            # 2. INGRESSES PER MONOTONIC PART
+            # -------------------------------------------------
+            cut_longitudes = [float(longitudes[i])]
+            if len(cuts) == 3:
+                cut_longitudes.append(_calc(body, cuts[1])[0])
+            cut_longitudes.append(float(longitudes[i + 1]))
+
+            for k in range(len(cuts) - 1):
+                for event_type in event_types:
+                    if event_type in BOUNDARY_WIDTH:
+                        events.extend(_ingress_events(
+                            body, event_type,
+                            cuts[k], cuts[k + 1],
+                            cut_longitudes[k], cut_longitudes[k + 1],
+                            tolerance
+                        ))
+
+    events = [e for e in events if start_jd <= e["julian_day"] < end_jd]
+    events.sort(key=lambda e: e["julian_day"])
+
+    for event in events:
+        event["local_datetime"] = jd_to_local(event["julian_day"], timezone).isoformat()
+
+    return events
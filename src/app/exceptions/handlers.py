@@ -1,6 +1,7 @@
 from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
 
+from app.core.deadline import DEADLINE, WorkCancelled
 from app.schemas.error import ErrorResponse
 
 
@@ -12,6 +13,19 @@ async def http_exception_handler(request: Request, exc: HTTPException):
             message=exc.detail,
             request_id=getattr(request.state, "request_id", None),
         ).model_dump(),
+        headers=getattr(exc, "headers", None),
+    )
+
+
+async def work_cancelled_handler(request: Request, exc: WorkCancelled):
+    # 499 (client closed request) is only ever seen in access logs
+    return JSONResponse(
+        status_code=504 if exc.reason == DEADLINE else 499,
+        content=ErrorResponse(
+            error="REQUEST_CANCELLED",
+            message=str(exc),
+            request_id=getattr(request.state, "request_id", None),
+        ).model_dump(),
     )
 
 
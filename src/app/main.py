@@ -6,6 +6,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.core.rate_limit import limiter
 from app.exceptions.rate_limit import rate_limit_exceeded_handler
 from app.core.swisseph_init import init_swisseph
+from app.core.executor import start_engine_pool, shutdown_engine_pool
+from app.core.deadline import WorkCancelled
+from app.core.http_client import start_http_client, close_http_client
+from app.services.gazetteer import get_gazetteer
+from app.services.timezone_resolver import get_timezone_polygons
+from app.services.location_service import close_location_cache
 
 
 
@@ -24,6 +30,7 @@ from app.middleware.request_id import RequestIDMiddleware
 from app.exceptions.handlers import (
     http_exception_handler,
     unhandled_exception_handler,
+    work_cancelled_handler,
 )
 
 # ------------------ ROUTERS ------------------
@@ -67,6 +74,7 @@ app.middleware("http")(log_requests)
 # ------------------ EXCEPTION HANDLERS ------------------
 
 app.add_exception_handler(HTTPException, http_exception_handler)
+app.add_exception_handler(WorkCancelled, work_cancelled_handler)
 app.add_exception_handler(Exception, unhandled_exception_handler)
 app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 
@@ -79,6 +87,12 @@ app.include_router(v1_router)
 @app.on_event("startup")
 async def startup_event():
     init_swisseph()
+    start_engine_pool()
+    start_http_client()
+    # Loaded here rather than by the first request that needs them
+    # (parsing blocks the event loop)
+    get_gazetteer()
+    get_timezone_polygons()
     logger.info(
         "Application startup complete | service=%s | env=%s",
         settings.service_name,
@@ -90,4 +104,7 @@ async def shutdown_event():
     """
     Actions to be performed on application shutdown.
     """
+    shutdown_engine_pool()
+    await close_http_client()
+    close_location_cache()
     logger.info("Application shutdown complete.")
@@ -0,0 +1,43 @@
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+# ==================================================
+# DASHA PERIOD TREE (PAGED BY PATH)
+# ==================================================
+
+class DashaTreePeriodSchema(BaseModel):
+    planet: str
+    level: str                    # mahadasha | antardasha | ...
+    path: List[str]               # lords from mahadasha down
+    start: str                    # local ISO datetime
+    end: str
+    start_jd: float               # Julian day (UT)
+    end_jd: float
+    duration_days: float
+    before_birth: bool
+    children: Optional[List["DashaTreePeriodSchema"]] = None
+
+
+class DashaPeriodsResponse(BaseModel):
+    birth_jd: float
+    moon_longitude: float
+    level: str
+    path: List[str]
+    periods: List[DashaTreePeriodSchema]
+
+
+# ==================================================
+# RUNNING PERIODS BY DATE
+# ==================================================
+
+class DashaAtItemSchema(BaseModel):
+    datetime: str                 # local ISO datetime looked up
+    julian_day: float
+    periods: List[DashaTreePeriodSchema]   # outermost first
+
+
+class DashaAtResponse(BaseModel):
+    birth_jd: float
+    moon_longitude: float
+    results: List[DashaAtItemSchema]
@@ -52,6 +52,7 @@ class D1HouseChartSchema(BaseSchema):
 class D9SignChartSchema(BaseSchema):
     """
     D9 (Navāṁśa) Chart – Sign-based grouping
+    (also the shape of the other divisional charts)
     """
     chart: str
     lagna_sign: int = Field(..., ge=1, le=12)
@@ -63,9 +64,12 @@ class ChartsSchema(BaseSchema):
     """
     All charts used in Kundli rendering
     """
+    model_config = ConfigDict(extra="allow")
+
     D1: D1HouseChartSchema
-    D9: D9SignChartSchema
-    # Future charts (D10, D12, etc.) can be added safely
+    D9: Optional[D9SignChartSchema] = None
+    # Other requested divisional charts (D2–D60), by name
+    __pydantic_extra__: Dict[str, D9SignChartSchema]
 
 
 # =========================================================
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -12,3 +14,17 @@ class LocationResponse(BaseModel):
         ...,
         description="Timezone offset from UTC in hours (e.g. +5.5)"
     )
+    timezone_name: Optional[str] = Field(
+        None,
+        description="IANA timezone (e.g. Asia/Kolkata), when known"
+    )
+
+
+class ReverseLocationResponse(LocationResponse):
+    """
+    A place near the queried coordinates.
+    """
+    distance_km: float = Field(
+        ...,
+        description="Great-circle distance from the queried point"
+    )
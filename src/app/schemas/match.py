@@ -0,0 +1,28 @@
+from typing import Dict, List
+from pydantic import BaseModel
+
+
+# ==================================================
+# ASHTAKOOTA RANKING
+# ==================================================
+
+class MoonPadaSchema(BaseModel):
+    nakshatra: str
+    nakshatra_index: int          # 1–27
+    pada: int                     # 1–4
+    moon_sign: str
+
+
+class MatchResultSchema(BaseModel):
+    rank: int
+    id: str
+    total: float                  # out of 36
+    kootas: Dict[str, float]      # varna … nadi
+    moon: MoonPadaSchema
+
+
+class MatchRankResponse(BaseModel):
+    profile: MoonPadaSchema
+    max_score: float
+    total_candidates: int
+    matches: List[MatchResultSchema]
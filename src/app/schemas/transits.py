@@ -0,0 +1,26 @@
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# ==================================================
+# TRANSIT EVENTS
+# ==================================================
+
+class TransitEventSchema(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    body: str
+    type: str                     # sign_ingress | nakshatra_ingress | station
+    julian_day: float             # UT
+    local_datetime: str           # ISO, requested UTC offset
+    longitude: float              # sidereal (boundary for ingresses)
+    retrograde: Optional[bool] = None   # ingresses only
+    from_: str = Field(alias="from")    # sign / nakshatra / direction
+    to: str
+
+
+class TransitEventsResponse(BaseModel):
+    start_jd: float
+    end_jd: float
+    timezone: float
+    events: List[TransitEventSchema]
@@ -0,0 +1,276 @@
+# app/services/gazetteer.py
+"""
+Offline gazetteer for location autocomplete.
+
+Reads a GeoNames "cities" table (tab-separated, the cities15000.txt
+column layout; a compact seed file is bundled in app/data) and keeps:
+
+- one row per place in parallel arrays (name, country, lat/lon, IANA
+  timezone, population)
+- a prefix index: every folded name and alternate name in one sorted
+  list, so all keys equal to or starting with a name are one bisect
+  away
+- per place, the region terms a query may be qualified with ("Paris,
+  France", "Austin, TX"): country code and name, admin-1 code and,
+  with an admin1CodesASCII.txt table, admin-1 name
+- a k-d tree over the places as points on the unit sphere, for
+  nearest-place (reverse) lookups
+
+Name matches are ranked by population. A qualified query whose
+qualifiers match no place with that name is a miss, so it goes to the
+remote provider instead of a same-named place elsewhere.
+"""
+
+import heapq
+import logging
+import threading
+import unicodedata
+from bisect import bisect_left
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import register_metrics
+from app.utils.kdtree import KDTree
+
+logger = logging.getLogger("kundli-service.gazetteer")
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+class GazetteerError(Exception):
+    pass
+
+
+# GeoNames cities*.txt columns used here
+_NAME, _ASCII_NAME, _ALTERNATE_NAMES = 1, 2, 3
+_LATITUDE, _LONGITUDE = 4, 5
+_COUNTRY_CODE = 8
+_ADMIN1_CODE = 10
+_POPULATION = 14
+_TIMEZONE = 17
+
+COUNTRY_NAMES = {
+    "AE": "United Arab Emirates", "AF": "Afghanistan", "AR": "Argentina",
+    "AU": "Australia", "BD": "Bangladesh", "BH": "Bahrain", "BR": "Brazil",
+    "BT": "Bhutan", "CA": "Canada", "CH": "Switzerland", "CN": "China",
+    "DE": "Germany", "EG": "Egypt", "ES": "Spain", "FJ": "Fiji",
+    "FR": "France", "GB": "United Kingdom", "GY": "Guyana",
+    "HK": "Hong Kong", "ID": "Indonesia", "IN": "India", "IT": "Italy",
+    "JP": "Japan", "KE": "Kenya", "KR": "South Korea", "KW": "Kuwait",
+    "LK": "Sri Lanka", "MU": "Mauritius", "MV": "Maldives", "MX": "Mexico",
+    "MY": "Malaysia", "NG": "Nigeria", "NL": "Netherlands", "NP": "Nepal",
+    "NZ": "New Zealand", "OM": "Oman", "PK": "Pakistan", "QA": "Qatar",
+    "RU": "Russia", "SA": "Saudi Arabia", "SG": "Singapore",
+    "SR": "Suriname", "TH": "Thailand", "TR": "Turkey",
+    "TT": "Trinidad and Tobago", "TZ": "Tanzania", "UG": "Uganda",
+    "US": "United States", "ZA": "South Africa",
+}
+
+# Common short forms accepted as country qualifiers
+COUNTRY_ALIASES = {
+    "AE": ["uae"], "GB": ["uk", "great britain", "england"],
+    "US": ["usa", "united states of america", "america"],
+}
+
+
+def fold_name(text: str) -> str:
+    """
+    Index/search key: accents stripped, case and whitespace folded
+    ("  São  Paulo" → "sao paulo").
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def _unit_vectors(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    # Chord length between unit vectors grows with great-circle distance,
+    # so euclidean nearest neighbours are the nearest places
+    lat, lon = np.radians(latitudes), np.radians(longitudes)
+    return np.column_stack((
+        np.cos(lat) * np.cos(lon),
+        np.cos(lat) * np.sin(lon),
+        np.sin(lat),
+    ))
+
+
+class Gazetteer:
+    def __init__(self, rows: List[List[str]], admin1_names: Optional[Dict[str, str]] = None):
+        """
+        admin1_names: "CC.code" → admin-1 name (admin1CodesASCII.txt)
+        """
+        self.names = [r[_NAME] for r in rows]
+        self.countries = [r[_COUNTRY_CODE] for r in rows]
+        self.timezones = [r[_TIMEZONE] for r in rows]
+        self.latitudes = np.array([float(r[_LATITUDE]) for r in rows])
+        self.longitudes = np.array([float(r[_LONGITUDE]) for r in rows])
+        self.populations = np.array([int(r[_POPULATION] or 0) for r in rows], dtype=np.int64)
+
+        entries = set()
+        for i, r in enumerate(rows):
+            names = [r[_NAME], r[_ASCII_NAME]] + r[_ALTERNATE_NAMES].split(",")
+            for name in names:
+                key = fold_name(name)
+                if key:
+                    entries.add((key, i))
+
+        ordered = sorted(entries)
+        self._keys = [key for key, _ in ordered]
+        self._places = [i for _, i in ordered]
+
+        admin1_names = admin1_names or {}
+        self._regions = []
+        for r in rows:
+            country = r[_COUNTRY_CODE]
+            admin1 = r[_ADMIN1_CODE] if len(r) > _ADMIN1_CODE else ""
+            terms = [country, COUNTRY_NAMES.get(country, ""), *COUNTRY_ALIASES.get(country, [])]
+            if admin1 and not admin1.isdigit():
+                terms.append(admin1)
+            terms.append(admin1_names.get(f"{country}.{admin1}", ""))
+            self._regions.append(frozenset(fold_name(t) for t in terms if t))
+
+        self._tree = KDTree(_unit_vectors(self.latitudes, self.longitudes))
+
+        self.hits = 0
+        self.misses = 0
+        self.reverse_lookups = 0
+
+    @classmethod
+    def load(cls, path: str, admin1_path: str = "") -> "Gazetteer":
+        rows = []
+        with open(path, encoding="utf-8") as fh:
+            for line_no, line in enumerate(fh, start=1):
+                if not line.strip() or line.startswith("#"):
+                    continue
+                row = line.rstrip("\n").split("\t")
+                if len(row) <= _TIMEZONE or not row[_TIMEZONE]:
+                    raise GazetteerError(f"{path}:{line_no}: not a GeoNames cities row")
+                rows.append(row)
+
+        admin1_names = {}
+        if admin1_path:
+            with open(admin1_path, encoding="utf-8") as fh:
+                for line in fh:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) >= 2:
+                        admin1_names[parts[0]] = parts[1]
+
+        return cls(rows, admin1_names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def search(self, query: str, limit: int = 5, *, prefix: bool = False) -> List[int]:
+        """
+        Places named `query`, most populous first. Text after a comma
+        qualifies the place: each part must name its country or admin-1
+        area ("Paris, France", "Austin, TX").
+
+        prefix=True (autocomplete) matches names, and qualifiers, that
+        start with what was typed.
+        """
+        name, *qualifiers = [fold_name(part) for part in query.split(",")]
+        qualifiers = [q for q in qualifiers if q]
+        if not name:
+            return []
+
+        start = bisect_left(self._keys, name)
+        matches = set()
+        for k in range(start, len(self._keys)):
+            key = self._keys[k]
+            if key != name and not (prefix and key.startswith(name)):
+                break
+            place = self._places[k]
+            if all(self._in_region(place, q, prefix) for q in qualifiers):
+                matches.add(place)
+
+        if matches:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+        return heapq.nlargest(limit, matches, key=lambda i: (self.populations[i], -i))
+
+    def _in_region(self, index: int, qualifier: str, prefix: bool) -> bool:
+        regions = self._regions[index]
+        if prefix:
+            return any(term.startswith(qualifier) for term in regions)
+        return qualifier in regions
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1) -> List[Tuple[int, float]]:
+        """
+        The k places closest to a point as (row, great-circle km),
+        closest first.
+        """
+        self.reverse_lookups += 1
+        point = _unit_vectors(np.array([latitude]), np.array([longitude]))[0]
+
+        return [
+            (row, 2 * EARTH_RADIUS_KM * float(np.arcsin(min(chord / 2, 1.0))))
+            for chord, row in self._tree.query(point, k)
+        ]
+
+    def place(self, index: int, *, at: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        LocationResponse fields for a row; the offset is the one in
+        force at `at` (default: now).
+        """
+        zone = ZoneInfo(self.timezones[index])
+        offset = datetime.now(zone) if at is None else at.astimezone(zone)
+        country = COUNTRY_NAMES.get(self.countries[index], self.countries[index])
+
+        return {
+            "label": f"{self.names[index]}, {country}",
+            "latitude": float(self.latitudes[index]),
+            "longitude": float(self.longitudes[index]),
+            "timezone": offset.utcoffset().total_seconds() / 3600,
+            "timezone_name": self.timezones[index],
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "places": len(self.names),
+            "index_keys": len(self._keys),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "reverse_lookups": self.reverse_lookups,
+        }
+
+
+# ---------------------------------------------------------
+# PROCESS-WIDE INSTANCE
+# ---------------------------------------------------------
+_gazetteer: Optional[Gazetteer] = None
+_loaded = False
+_lock = threading.Lock()
+
+
+def get_gazetteer() -> Optional[Gazetteer]:
+    """
+    The gazetteer at GAZETTEER_PATH, loaded once; None when disabled
+    or unreadable (lookups then go to the remote provider).
+    """
+    global _gazetteer, _loaded
+
+    if _loaded:
+        return _gazetteer
+
+    with _lock:
+        if not _loaded:
+            path = settings.gazetteer_path
+            if path:
+                try:
+                    _gazetteer = Gazetteer.load(path, settings.gazetteer_admin1_path)
+                    register_metrics("gazetteer", _gazetteer.stats)
+                    logger.info("Gazetteer loaded | places=%d | path=%s", len(_gazetteer), path)
+                except (OSError, ValueError, GazetteerError):
+                    logger.exception("Gazetteer unavailable: %s", path)
+            _loaded = True
+
+    return _gazetteer
@@ -0,0 +1,532 @@
+# app/services/kundli_service.py
+"""
+Async façade over the Kundli engine used by the API layer.
+
+- Natal results are cached by normalised chart inputs (content-addressed)
+- Misses are computed in the engine process pool; concurrent misses
+  for the same inputs share one computation
+- Per-request fields (name, current dasha on `as_of`) are applied on
+  top of the cached body
+"""
+
+import asyncio
+import logging
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.deadline import WorkCancelled, checkpoint
+from app.core.executor import run_engine
+from app.core.metrics import register_metrics
+from app.core.singleflight import SingleFlight
+from app.engine.dasha_engine import (
+    DASHA_LEVELS,
+    DashaIndex,
+    dasha_period_tree,
+)
+from app.engine.kundli_engine import (
+    ENGINE_VERSION,
+    KundliGenerationError,
+    apply_current_dasha,
+    compute_dasha_anchor,
+    generate_natal_kundli,
+    generate_kundli_batch,
+)
+from app.engine.divisional_charts import normalize_chart_names
+from app.engine.planetary_relations import compute_planetary_relations
+from app.engine.planets import AYANAMSA_NAME
+from app.schemas.kundli import KundliResponse
+from app.services.timezone_resolver import resolve_timezone
+from app.utils.time_utils import compute_time_context, local_to_jd
+
+logger = logging.getLogger("kundli-service.kundli")
+
+_cache = LRUCache(
+    maxsize=settings.kundli_cache_size,
+    ttl=settings.kundli_cache_ttl_seconds,
+)
+
+_flights = SingleFlight()
+
+# Records of a batch with the same inputs as an earlier record in it
+_batch_duplicates = 0
+
+register_metrics("kundli_cache", _cache.stats)
+register_metrics(
+    "kundli_flights",
+    lambda: {**_flights.stats(), "batch_duplicates": _batch_duplicates},
+)
+
+
+# ---------------------------------------------------------
+# DISPLAY NORMALIZATION (SAFE, NON-DESTRUCTIVE)
+# ---------------------------------------------------------
+DISPLAY_NORMALIZATION = {
+    "Mrat": "Mrita",
+    "Vradha": "Vriddha",
+    "Swatha": "Swastha",
+    "Shant": "Shanta",
+    "Mrita": "Mrita",
+    "Vriddha": "Vriddha",
+    "Swastha": "Swastha",
+    "Shanta": "Shanta",
+}
+
+
+def _normalize_avastha_display(kundli: Dict[str, Any]) -> None:
+    # Applied once, before a result is cached and shared
+    avasthas = kundli.get("avastha")
+    if isinstance(avasthas, list):
+        for a in avasthas:
+            for key in ("baladi", "deeptadi", "avastha"):
+                if key in a and a[key] in DISPLAY_NORMALIZATION:
+                    a[key] = DISPLAY_NORMALIZATION[a[key]]
+
+
+def _validate_natal(kundli: Dict[str, Any]) -> None:
+    # Checked against the response contract once, before it is cached,
+    # so responses built from it are not validated again; the overlay
+    # added per request (name, current dasha) has a fixed shape
+    KundliResponse.model_validate(apply_current_dasha(kundli))
+
+
+# ---------------------------------------------------------
+# CACHE KEY
+# ---------------------------------------------------------
+def _normalized_time_context(
+    date_str: str,
+    time_str: str,
+    timezone: Optional[float],
+    tz_name: Optional[str] = None
+) -> Dict[str, Any]:
+    # The only place request date/time strings are parsed
+    time_ctx = compute_time_context(
+        date_str=date_str,
+        time_str=time_str,
+        timezone=timezone,
+        tz_name=tz_name
+    )
+
+    return {
+        **time_ctx,
+        "local_datetime": time_ctx["local_datetime"].replace(microsecond=0),
+        "utc_datetime": time_ctx["utc_datetime"].replace(microsecond=0),
+    }
+
+
+def chart_cache_key(
+    kind: str,
+    *,
+    date_str: str,
+    time_str: str,
+    timezone: Optional[float],
+    latitude: float,
+    longitude: float,
+    tz_name: Optional[str] = None,
+    full_precision: bool = False,
+    charts: Optional[List[str]] = None
+) -> Tuple[Hashable, Dict[str, Any]]:
+    """
+    Normalised chart inputs → (cache key, engine kwargs).
+
+    The key holds the UTC instant to the second, the UTC offset (local
+    dates in the response depend on it), coordinates rounded to
+    `kundli_cache_coord_precision`, ayanamsa, ephemeris precision mode,
+    the canonical list of divisional charts and the engine version
+    (ENGINE_VERSION). The engine is called with the same rounded
+    coordinates so a cached result is exactly what a fresh computation
+    would return. The date/time is parsed only here; the engine
+    receives the resulting time context. The offset is `tz_name`'s at the birth
+    instant when given, else `timezone`; with neither, the zone is
+    resolved offline from the coordinates.
+    """
+    if timezone is None and not tz_name:
+        tz_name = resolve_timezone(latitude, longitude)
+
+    time_ctx = _normalized_time_context(date_str, time_str, timezone, tz_name)
+
+    precision = settings.kundli_cache_coord_precision
+    lat = round(latitude, precision)
+    lon = round(longitude, precision)
+    chart_names = normalize_chart_names(charts)
+
+    key = (
+        kind,
+        time_ctx["utc_datetime"].isoformat(),
+        round(time_ctx["timezone"] * 60),
+        lat,
+        lon,
+        AYANAMSA_NAME,
+        bool(full_precision),
+        tuple(chart_names),
+        ENGINE_VERSION,
+    )
+
+    engine_kwargs = {
+        "time_ctx": time_ctx,
+        "latitude": lat,
+        "longitude": lon,
+        "full_precision": bool(full_precision),
+        "charts": chart_names,
+    }
+
+    return key, engine_kwargs
+
+
+def dasha_cache_key(
+    *,
+    date_str: str,
+    time_str: str,
+    timezone: float,
+    full_precision: bool = False
+) -> Tuple[Hashable, Dict[str, Any]]:
+    """
+    Like chart_cache_key for the location-independent dasha anchor.
+    """
+    time_ctx = _normalized_time_context(date_str, time_str, timezone)
+
+    key = (
+        "dasha-anchor",
+        time_ctx["utc_datetime"].isoformat(),
+        round(timezone * 60),
+        AYANAMSA_NAME,
+        bool(full_precision),
+        ENGINE_VERSION,
+    )
+
+    engine_kwargs = {
+        "time_ctx": time_ctx,
+        "full_precision": bool(full_precision),
+    }
+
+    return key, engine_kwargs
+
+
+def _personalize(
+    kundli: Dict[str, Any],
+    name: Optional[str],
+    as_of: Optional[date]
+) -> Dict[str, Any]:
+    # Shallow copies only: the cached natal body is never modified
+    kundli = apply_current_dasha(kundli, as_of=as_of)
+    return {**kundli, "meta": {**kundli["meta"], "name": name}}
+
+
+# ---------------------------------------------------------
+# PUBLIC API
+# ---------------------------------------------------------
+async def _get_natal_kundli(
+    *,
+    date_str: str,
+    time_str: str,
+    timezone: Optional[float],
+    latitude: float,
+    longitude: float,
+    tz_name: Optional[str] = None,
+    full_precision: bool = False,
+    charts: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    # Cached natal body shared by the Kundli and planetary-relations
+    # endpoints
+    try:
+        key, engine_kwargs = chart_cache_key(
+            "kundli",
+            date_str=date_str,
+            time_str=time_str,
+            timezone=timezone,
+            latitude=latitude,
+            longitude=longitude,
+            tz_name=tz_name,
+            full_precision=full_precision,
+            charts=charts,
+        )
+    except Exception as exc:
+        raise KundliGenerationError(str(exc)) from exc
+
+    kundli = _cache.get(key)
+    if kundli is None:
+        kundli = await _shared(key, lambda: _compute_natal_kundli(key, engine_kwargs))
+
+    return kundli
+
+
+async def _shared(key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+    # A shared computation runs under the deadline of the request that
+    # started it; if that one gave up, callers still waiting run it again
+    try:
+        return await _flights.do(key, fn)
+    except WorkCancelled:
+        checkpoint("coalesced")
+        return await _flights.do(key, fn)
+
+
+async def _compute_natal_kundli(key: Hashable, engine_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    kundli = await run_engine(generate_natal_kundli, **engine_kwargs)
+    _normalize_avastha_display(kundli)
+    _validate_natal(kundli)
+    _cache.set(key, kundli)
+    return kundli
+
+
+async def get_kundli(
+    *,
+    date_str: str,
+    time_str: str,
+    timezone: Optional[float],
+    latitude: float,
+    longitude: float,
+    tz_name: Optional[str] = None,
+    name: Optional[str] = None,
+    as_of: Optional[date] = None,
+    full_precision: bool = False,
+    charts: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    kundli = await _get_natal_kundli(
+        date_str=date_str,
+        time_str=time_str,
+        timezone=timezone,
+        latitude=latitude,
+        longitude=longitude,
+        tz_name=tz_name,
+        full_precision=full_precision,
+        charts=charts,
+    )
+
+    return _personalize(kundli, name, as_of)
+
+
+async def get_kundli_batch(
+    records: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Batch variant of get_kundli. Cached records are answered directly;
+    the rest go to the engine in generate_kundli_batch calls of up to
+    KUNDLI_BATCH_CHUNK_SIZE charts (ordered by birth instant, so
+    records sharing an ephemeris pass stay together), each distinct
+    chart once. Short calls let the engine scheduler interleave them
+    with interactive work.
+    """
+    global _batch_duplicates
+
+    results: List[Dict[str, Any]] = [None] * len(records)
+    # key → (engine kwargs, indices of the records asking for it)
+    pending: Dict[Hashable, Tuple[Dict[str, Any], List[int]]] = {}
+
+    for index, record in enumerate(records):
+        try:
+            key, engine_kwargs = chart_cache_key(
+                "kundli",
+                date_str=record["date_str"],
+                time_str=record["time_str"],
+                timezone=record["timezone"],
+                latitude=record["latitude"],
+                longitude=record["longitude"],
+                tz_name=record.get("tz_name"),
+                full_precision=record.get("full_precision", False),
+                charts=record.get("charts"),
+            )
+        except Exception as exc:
+            results[index] = {
+                "index": index,
+                "status": "error",
+                "kundli": None,
+                "error": str(exc),
+            }
+            continue
+
+        kundli = _cache.get(key)
+        if kundli is not None:
+            results[index] = {
+                "index": index,
+                "status": "ok",
+                "kundli": _personalize(
+                    kundli, record.get("name"), record.get("as_of")
+                ),
+                "error": None,
+            }
+        elif key in pending:
+            pending[key][1].append(index)
+            _batch_duplicates += 1
+        else:
+            pending[key] = (engine_kwargs, [index])
+
+    if pending:
+        ordered = sorted(pending.items(), key=lambda entry: entry[0][1])
+        size = max(1, settings.kundli_batch_chunk_size)
+        chunks = [ordered[i:i + size] for i in range(0, len(ordered), size)]
+
+        generated = await asyncio.gather(*(
+            run_engine(
+                generate_kundli_batch,
+                records=[engine_kwargs for _, (engine_kwargs, _) in chunk],
+            )
+            for chunk in chunks
+        ))
+
+        flat = [item for items in generated for item in items]
+        for (key, (_, indices)), item in zip(ordered, flat):
+            kundli = item["kundli"]
+            if kundli is not None:
+                _normalize_avastha_display(kundli)
+                try:
+                    _validate_natal(kundli)
+                except ValueError as exc:
+                    logger.exception("Kundli failed response validation")
+                    item = {**item, "status": "error", "error": str(exc)}
+                    kundli = None
+                else:
+                    _cache.set(key, kundli)
+
+            for index in indices:
+                personal = kundli
+                if kundli is not None:
+                    personal = _personalize(
+                        kundli,
+                        records[index].get("name"),
+                        records[index].get("as_of"),
+                    )
+
+                results[index] = {**item, "index": index, "kundli": personal}
+
+    return results
+
+
+async def get_planetary_relations(
+    *,
+    date_str: str,
+    time_str: str,
+    timezone: float,
+    latitude: float,
+    longitude: float,
+    as_of: Optional[date] = None,
+    full_precision: bool = False
+) -> Dict[str, Any]:
+    kundli = await _get_natal_kundli(
+        date_str=date_str,
+        time_str=time_str,
+        timezone=timezone,
+        latitude=latitude,
+        longitude=longitude,
+        full_precision=full_precision,
+    )
+
+    return apply_current_dasha(
+        compute_planetary_relations(kundli),
+        as_of=as_of
+    )
+
+
+async def _get_dasha_anchor(
+    *,
+    date_str: str,
+    time_str: str,
+    timezone: float,
+    full_precision: bool = False
+) -> Dict[str, Any]:
+    # Birth moment, Moon longitude and the chart's DashaIndex, cached
+    # per birth moment (location-independent)
+    try:
+        key, engine_kwargs = dasha_cache_key(
+            date_str=date_str,
+            time_str=time_str,
+            timezone=timezone,
+            full_precision=full_precision,
+        )
+    except Exception as exc:
+        raise KundliGenerationError(str(exc)) from exc
+
+    anchor = _cache.get(key)
+    if anchor is None:
+        anchor = await _shared(key, lambda: _compute_dasha_anchor(key, engine_kwargs))
+
+    return anchor
+
+
+async def _compute_dasha_anchor(key: Hashable, engine_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    anchor = await run_engine(compute_dasha_anchor, **engine_kwargs)
+    anchor["index"] = DashaIndex(
+        moon_longitude=anchor["moon_longitude"],
+        birth_jd=anchor["birth_jd"],
+    )
+    _cache.set(key, anchor)
+    return anchor
+
+
+async def get_dasha_periods(
+    *,
+    date_str: str,
+    time_str: str,
+    timezone: float,
+    path: List[str],
+    depth: int = 1,
+    full_precision: bool = False
+) -> Dict[str, Any]:
+    """
+    Dasha periods `depth` levels below `path` (mahadasha lords first).
+    Only the Moon longitude is computed by the engine; the requested
+    subtree is expanded on demand.
+    """
+    anchor = await _get_dasha_anchor(
+        date_str=date_str,
+        time_str=time_str,
+        timezone=timezone,
+        full_precision=full_precision,
+    )
+
+    periods = dasha_period_tree(
+        moon_longitude=anchor["moon_longitude"],
+        birth_jd=anchor["birth_jd"],
+        timezone=anchor["timezone"],
+        path=path,
+        depth=depth,
+    )
+
+    return {
+        "birth_jd": anchor["birth_jd"],
+        "moon_longitude": anchor["moon_longitude"],
+        "level": DASHA_LEVELS[len(path)],
+        "path": path,
+        "periods": periods,
+    }
+
+
+async def get_dasha_at(
+    *,
+    date_str: str,
+    time_str: str,
+    timezone: float,
+    moments: List[datetime],
+    depth: int = 3,
+    full_precision: bool = False
+) -> Dict[str, Any]:
+    """
+    Running periods (mahadasha down to `depth` levels) at each local
+    moment, answered from the chart's cached DashaIndex.
+    """
+    anchor = await _get_dasha_anchor(
+        date_str=date_str,
+        time_str=time_str,
+        timezone=timezone,
+        full_precision=full_precision,
+    )
+    index = anchor["index"]
+
+    results = []
+    for moment in moments:
+        julian_day = local_to_jd(moment, anchor["timezone"])
+        results.append({
+            "datetime": moment.isoformat(),
+            "julian_day": julian_day,
+            "periods": index.rows_at(
+                julian_day,
+                timezone=anchor["timezone"],
+                depth=depth,
+            ),
+        })
+
+    return {
+        "birth_jd": anchor["birth_jd"],
+        "moon_longitude": anchor["moon_longitude"],
+        "results": results,
+    }
@@ -1,42 +1,108 @@
-from typing import List
+"""
+Location search: offline gazetteer first, then OpenCage behind a
+two-level cache. Reverse lookups (coordinates → nearby places) are
+answered from the gazetteer only.
+
+- Keys are normalised queries (case and whitespace folded)
+- Level 1: in-process LRU; level 2: local SQLite store (survives
+  restarts), both with the same TTL
+- Concurrent misses for one key share a single upstream call
+- Entries older than GEOCODE_FRESH_SECONDS are served as they are
+  while one background call refreshes them (stale-while-revalidate)
+- OpenCage calls go through a circuit breaker: after repeated
+  failures misses fail at once instead of waiting on timeouts
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set
+
 import httpx
+from starlette.concurrency import run_in_threadpool
 
+from app.core.cache import LRUCache
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError
 from app.core.config import settings
-from app.schemas.location import LocationResponse
+from app.core.http_client import http_get
+from app.core.metrics import register_metrics
+from app.core.singleflight import SingleFlight
+from app.core.sqlite_cache import SQLiteCache
+from app.schemas.location import LocationResponse, ReverseLocationResponse
+from app.services.gazetteer import get_gazetteer
 
-OPENCAGE_API_URL = "https://api.opencagedata.com/geocode/v1/json"
+logger = logging.getLogger("kundli-service.location")
 
 
 class LocationServiceError(Exception):
     """Raised when location lookup fails."""
 
+    # Seconds the client should wait before retrying (provider down)
+    retry_after: Optional[float] = None
 
-async def search_location(query: str) -> List[LocationResponse]:
-    if not query or not query.strip():
-        raise LocationServiceError("Search query cannot be empty")
 
+# Checked here rather than in Settings: the engine and its scripts
+# read settings too but never call the provider
+if not settings.opencage_api_key:
+    raise RuntimeError("OPENCAGE_API_KEY is missing. Backend cannot start.")
+
+_cache = LRUCache(
+    maxsize=settings.geocode_cache_size,
+    ttl=settings.geocode_cache_ttl_seconds,
+)
+
+_store: Optional[SQLiteCache] = (
+    SQLiteCache(
+        path=settings.geocode_cache_path,
+        ttl=settings.geocode_cache_ttl_seconds,
+    )
+    if settings.geocode_cache_path
+    else None
+)
+
+_flights = SingleFlight()
+
+_breaker = CircuitBreaker(
+    "opencage",
+    failure_threshold=settings.location_breaker_failures,
+    reset_timeout=settings.location_breaker_reset_seconds,
+)
+
+_refresh_tasks: Set["asyncio.Task[None]"] = set()
+_refresh_stats = {"stale_served": 0, "refreshes": 0, "refresh_failures": 0}
+
+register_metrics("geocode_cache", _cache.stats)
+register_metrics("geocode_flights", _flights.stats)
+register_metrics("geocode_refresh", lambda: {**_refresh_stats, "running": len(_refresh_tasks)})
+if _store is not None:
+    register_metrics("geocode_store", _store.stats)
+
+
+def normalize_query(query: str) -> str:
+    """
+    Cache key and upstream query: "  New   DELHI " → "new delhi".
+    """
+    return " ".join(query.casefold().split())
+
+
+# ---------------------------------------------------------
+# UPSTREAM (OPENCAGE)
+# ---------------------------------------------------------
+async def _fetch_locations(query: str) -> List[Dict[str, Any]]:
     params = {
-        "q": query.strip(),
+        "q": query,
         "key": settings.opencage_api_key,
         "limit": 5,
         "no_annotations": 0,
         "language": "en",
     }
 
-    timeout = httpx.Timeout(connect=3.0, read=5.0, write=5.0, pool=5.0)
-    limits = httpx.Limits(max_connections=5, max_keepalive_connections=0)
-
     try:
-        async with httpx.AsyncClient(
-            timeout=timeout,
-            limits=limits,
-            trust_env=False,
-        ) as client:
-            response = await client.get(OPENCAGE_API_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
+        response = await http_get(settings.opencage_api_url, params=params)
+        response.raise_for_status()
+        data = response.json()
 
-        results: List[LocationResponse] = []
+        results: List[Dict[str, Any]] = []
 
         for item in data.get("results", []):
             geometry = item.get("geometry") or {}
@@ -55,7 +121,8 @@ async def search_location(query: str) -> List[LocationResponse]:
                     latitude=lat,
                     longitude=lng,
                     timezone=timezone.get("offset_sec", 0) / 3600,
-                )
+                    timezone_name=timezone.get("name"),
+                ).model_dump()
             )
 
         return results
@@ -72,3 +139,120 @@ async def search_location(query: str) -> List[LocationResponse]:
         raise LocationServiceError(
             "Unexpected error while fetching location"
         ) from exc
+
+
+async def _call_provider(key: str) -> Dict[str, Any]:
+    # Cache entry for a fresh upstream result; stored at both levels
+    try:
+        rows = await _breaker.call(lambda: _fetch_locations(key))
+    except CircuitOpenError:
+        error = LocationServiceError("Location provider unavailable, try again later")
+        error.retry_after = _breaker.retry_after()
+        raise error
+
+    entry = {"rows": rows, "fetched_at": time.time()}
+    if _store is not None:
+        await run_in_threadpool(_store.set, key, entry)
+    _cache.set(key, entry)
+    return entry
+
+
+async def _load_locations(key: str) -> Dict[str, Any]:
+    # Level 2, then upstream; only successful lookups are stored
+    entry = None
+    if _store is not None:
+        entry = await run_in_threadpool(_store.get, key)
+
+    if entry is None:
+        return await _call_provider(key)
+
+    if isinstance(entry, list):
+        # Stored before entries carried their fetch time: refresh it
+        entry = {"rows": entry, "fetched_at": 0.0}
+
+    _cache.set(key, entry)
+    return entry
+
+
+# ---------------------------------------------------------
+# STALE-WHILE-REVALIDATE
+# ---------------------------------------------------------
+def _is_stale(entry: Dict[str, Any]) -> bool:
+    return time.time() - entry["fetched_at"] > settings.geocode_fresh_seconds
+
+
+async def _refresh(key: str) -> None:
+    try:
+        await _flights.do(("refresh", key), lambda: _call_provider(key))
+        _refresh_stats["refreshes"] += 1
+    except LocationServiceError as exc:
+        # The stale entry stays; the next request tries again
+        _refresh_stats["refresh_failures"] += 1
+        logger.warning("Location refresh failed | query=%s | %s", key, exc)
+
+
+def _schedule_refresh(key: str) -> None:
+    if not _breaker.allows_call():
+        return
+
+    task = asyncio.create_task(_refresh(key))
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+
+# ---------------------------------------------------------
+# PUBLIC API
+# ---------------------------------------------------------
+def close_location_cache() -> None:
+    for task in list(_refresh_tasks):
+        task.cancel()
+    if _store is not None:
+        _store.close()
+
+
+async def search_location(query: str, autocomplete: bool = False) -> List[LocationResponse]:
+    """
+    Offline gazetteer first (exact name, or name prefix when
+    `autocomplete`), then the provider.
+    """
+    if not query or not query.strip():
+        raise LocationServiceError("Search query cannot be empty")
+
+    gazetteer = get_gazetteer()
+    if gazetteer is not None:
+        places = gazetteer.search(query, prefix=autocomplete)
+        if places:
+            return [LocationResponse(**gazetteer.place(i)) for i in places]
+
+    key = normalize_query(query)
+
+    entry = _cache.get(key)
+    if entry is None:
+        entry = await _flights.do(key, lambda: _load_locations(key))
+
+    if _is_stale(entry):
+        _refresh_stats["stale_served"] += 1
+        _schedule_refresh(key)
+
+    return [LocationResponse(**row) for row in entry["rows"]]
+
+
+def reverse_location(
+    latitude: float,
+    longitude: float,
+    limit: int = 5
+) -> List[ReverseLocationResponse]:
+    """
+    Nearest gazetteer places to a point, closest first.
+    """
+    gazetteer = get_gazetteer()
+    if gazetteer is None or not len(gazetteer):
+        raise LocationServiceError("Reverse geocoding needs the offline gazetteer")
+
+    return [
+        ReverseLocationResponse(
+            **gazetteer.place(row),
+            distance_km=round(distance, 3),
+        )
+        for row, distance in gazetteer.nearest(latitude, longitude, limit)
+    ]
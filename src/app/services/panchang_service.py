@@ -0,0 +1,50 @@
+# app/services/panchang_service.py
+"""
+Streams the daily panchang as NDJSON.
+
+The range is computed in chunks on the engine pool, so the first days
+are sent while later ones are still being computed and at most one
+chunk is held in memory. With an admission slot, each chunk holds it
+(and gets a fresh deadline) only while it is computed, not while its
+lines are sent.
+"""
+
+from contextlib import nullcontext
+from datetime import date, timedelta
+from typing import AsyncIterator, Optional
+
+import orjson
+
+from app.core.admission import AdmissionSlot
+from app.core.executor import run_engine
+from app.engine.panchang import compute_panchang
+
+# Days per engine call
+PANCHANG_CHUNK_DAYS = 31
+
+
+async def stream_panchang(
+    *,
+    start: date,
+    days: int,
+    latitude: float,
+    longitude: float,
+    timezone: float,
+    admission: Optional[AdmissionSlot] = None
+) -> AsyncIterator[bytes]:
+    """
+    One JSON line per local date, in order.
+    """
+    for offset in range(0, days, PANCHANG_CHUNK_DAYS):
+        async with admission.hold() if admission is not None else nullcontext():
+            rows = await run_engine(
+                compute_panchang,
+                start=start + timedelta(days=offset),
+                days=min(PANCHANG_CHUNK_DAYS, days - offset),
+                latitude=latitude,
+                longitude=longitude,
+                timezone=timezone,
+            )
+
+        for row in rows:
+            yield orjson.dumps(row) + b"\n"
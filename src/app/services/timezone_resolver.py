@@ -0,0 +1,199 @@
+# app/services/timezone_resolver.py
+"""
+Offline coordinates → IANA timezone name.
+
+Resolution:
+
+1. Timezone polygons, when TIMEZONE_BOUNDARIES_PATH points at a
+   timezone-boundary-builder GeoJSON file (features with a "tzid"
+   property). Polygons are bucketed by bounding box into a grid of
+   GRID_DEGREES cells, so a lookup only ray-casts the few polygons
+   whose box covers the point's cell. A point outside every polygon
+   is at sea and gets the nautical zone for its longitude (Etc/GMT±N).
+2. Without polygons, the zone of the nearest gazetteer place, if it
+   is within TIMEZONE_NEAREST_PLACE_MAX_KM. Further away the zone is
+   not guessed: TimezoneResolverError, and the caller must give one.
+
+The name is resolved to a UTC offset per birth instant by
+app.utils.time_utils, which accounts for DST and historical changes.
+"""
+
+import json
+import logging
+import math
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import register_metrics
+from app.services.gazetteer import get_gazetteer
+
+logger = logging.getLogger("kundli-service.timezone")
+
+GRID_DEGREES = 1.0
+
+
+class TimezoneResolverError(Exception):
+    pass
+
+
+def _in_ring(ring: np.ndarray, x: float, y: float) -> bool:
+    # Even-odd ray casting; ring is an (n, 2) array of lon/lat vertices
+    xs, ys = ring[:, 0], ring[:, 1]
+    xj, yj = np.roll(xs, 1), np.roll(ys, 1)
+    crosses = (ys > y) != (yj > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_cross = (xj - xs) * (y - ys) / (yj - ys) + xs
+    return bool(np.count_nonzero(crosses & (x < x_cross)) % 2)
+
+
+def nautical_zone(longitude: float) -> str:
+    """
+    Etc/GMT±N for a longitude (POSIX sign: east of Greenwich is minus).
+    """
+    hours = int(math.floor((longitude + 7.5) / 15.0))
+    hours = max(-12, min(12, hours))
+    if hours == 0:
+        return "Etc/GMT"
+    return f"Etc/GMT{-hours:+d}"
+
+
+class TimezonePolygons:
+    def __init__(self, polygons: List[Tuple[str, List[np.ndarray]]]):
+        """
+        polygons: (tzid, [outer ring, hole, ...]) per polygon
+        """
+        self.tzids = [tzid for tzid, _ in polygons]
+        self.rings = [rings for _, rings in polygons]
+        self.boxes = np.array([
+            (r[0][:, 0].min(), r[0][:, 1].min(), r[0][:, 0].max(), r[0][:, 1].max())
+            for r in self.rings
+        ]).reshape(-1, 4)
+
+        self._grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for i, (min_x, min_y, max_x, max_y) in enumerate(self.boxes):
+            for cx in range(self._cell(min_x), self._cell(max_x) + 1):
+                for cy in range(self._cell(min_y), self._cell(max_y) + 1):
+                    self._grid[(cx, cy)].append(i)
+
+    @staticmethod
+    def _cell(degrees: float) -> int:
+        return int(math.floor(degrees / GRID_DEGREES))
+
+    @classmethod
+    def load(cls, path: str) -> "TimezonePolygons":
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+
+        polygons = []
+        for feature in data.get("features", []):
+            tzid = (feature.get("properties") or {}).get("tzid")
+            geometry = feature.get("geometry") or {}
+            kind = geometry.get("type")
+
+            if not tzid or kind not in ("Polygon", "MultiPolygon"):
+                raise TimezoneResolverError(f"{path}: feature without tzid/polygon")
+
+            parts = geometry["coordinates"]
+            if kind == "Polygon":
+                parts = [parts]
+
+            for part in parts:
+                rings = [np.asarray(ring, dtype=float)[:, :2] for ring in part]
+                polygons.append((tzid, rings))
+
+        return cls(polygons)
+
+    def __len__(self) -> int:
+        return len(self.tzids)
+
+    def lookup(self, latitude: float, longitude: float) -> Optional[str]:
+        for i in self._grid.get((self._cell(longitude), self._cell(latitude)), ()):
+            min_x, min_y, max_x, max_y = self.boxes[i]
+            if not (min_x <= longitude <= max_x and min_y <= latitude <= max_y):
+                continue
+
+            outer, *holes = self.rings[i]
+            if _in_ring(outer, longitude, latitude) and not any(
+                _in_ring(hole, longitude, latitude) for hole in holes
+            ):
+                return self.tzids[i]
+
+        return None
+
+
+# ---------------------------------------------------------
+# PROCESS-WIDE INSTANCE
+# ---------------------------------------------------------
+_polygons: Optional[TimezonePolygons] = None
+_loaded = False
+_lock = threading.Lock()
+
+_resolved: Dict[str, int] = {"polygon": 0, "nearest_place": 0, "nautical": 0, "unresolved": 0}
+
+
+def get_timezone_polygons() -> Optional[TimezonePolygons]:
+    """
+    Polygons at TIMEZONE_BOUNDARIES_PATH, loaded once; None when not
+    configured or unreadable.
+    """
+    global _polygons, _loaded
+
+    if _loaded:
+        return _polygons
+
+    with _lock:
+        if not _loaded:
+            path = settings.timezone_boundaries_path
+            if path:
+                try:
+                    _polygons = TimezonePolygons.load(path)
+                    logger.info("Timezone polygons loaded | polygons=%d | path=%s", len(_polygons), path)
+                except (OSError, ValueError, KeyError, IndexError, TimezoneResolverError):
+                    logger.exception("Timezone polygons unavailable: %s", path)
+            _loaded = True
+
+    return _polygons
+
+
+def resolve_timezone(latitude: float, longitude: float) -> str:
+    """
+    IANA zone name for a point; never needs the network. Raises
+    TimezoneResolverError when the zone cannot be known offline.
+    """
+    polygons = get_timezone_polygons()
+    if polygons is not None:
+        tzid = polygons.lookup(latitude, longitude)
+        if tzid is not None:
+            _resolved["polygon"] += 1
+            return tzid
+
+        _resolved["nautical"] += 1
+        return nautical_zone(longitude)
+
+    gazetteer = get_gazetteer()
+    if gazetteer is not None and len(gazetteer):
+        row, distance = gazetteer.nearest(latitude, longitude)[0]
+        if distance <= settings.timezone_nearest_place_max_km:
+            _resolved["nearest_place"] += 1
+            return gazetteer.timezones[row]
+
+    _resolved["unresolved"] += 1
+    raise TimezoneResolverError(
+        f"Cannot resolve the timezone of ({latitude}, {longitude}) offline; "
+        "give timezone or tz_name"
+    )
+
+
+def _stats() -> Dict[str, Any]:
+    polygons = _polygons
+    return {
+        "polygons": len(polygons) if polygons is not None else 0,
+        "resolved": dict(_resolved),
+    }
+
+
+register_metrics("timezone_resolver", _stats)
@@ -0,0 +1,54 @@
+# app/services/transit_service.py
+"""
+Async façade over the transit search used by the API layer.
+"""
+
+from datetime import date, datetime, time
+from typing import Any, Dict, List, Sequence
+
+from app.core.config import settings
+from app.core.executor import run_engine
+from app.engine.transits import TransitComputationError, find_transit_events
+from app.utils.time_utils import local_to_jd
+
+
+async def get_transit_events(
+    *,
+    start: date,
+    end: date,
+    bodies: Sequence[str],
+    event_types: Sequence[str],
+    timezone: float,
+    tolerance_seconds: float
+) -> Dict[str, Any]:
+    """
+    Events from local midnight of `start` up to local midnight after
+    `end` (both inclusive), in the given UTC offset.
+    """
+    days = (end - start).days + 1
+    if days < 1:
+        raise TransitComputationError("end must not be before start")
+    if days > settings.transit_max_days:
+        raise TransitComputationError(
+            f"Date range longer than {settings.transit_max_days} days"
+        )
+
+    start_jd = local_to_jd(datetime.combine(start, time()), timezone)
+    end_jd = start_jd + days
+
+    events: List[Dict[str, Any]] = await run_engine(
+        find_transit_events,
+        start_jd=start_jd,
+        end_jd=end_jd,
+        bodies=list(dict.fromkeys(bodies)),
+        event_types=list(dict.fromkeys(event_types)),
+        tolerance=tolerance_seconds / 86400,
+        timezone=timezone,
+    )
+
+    return {
+        "start_jd": start_jd,
+        "end_jd": end_jd,
+        "timezone": timezone,
+        "events": events,
+    }
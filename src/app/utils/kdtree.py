@@ -0,0 +1,86 @@
+# app/utils/kdtree.py
+"""
+Static k-d tree for nearest-neighbour queries over a fixed point set
+(numpy only). Built once; each query visits O(log n) nodes and
+computes distances for whole leaves at a time.
+"""
+
+import heapq
+from typing import List, Tuple
+
+import numpy as np
+
+LEAF_SIZE = 16
+
+
+class KDTree:
+    def __init__(self, points: np.ndarray, leaf_size: int = LEAF_SIZE):
+        """
+        points: (n, dims) array
+        """
+        self.points = np.asarray(points, dtype=float)
+        self.leaf_size = leaf_size
+
+        # Each node owns the slice order[start:end]; inner nodes split
+        # it on `axis` at `split`, the left child is the next node and
+        # `right` the index of the right child (axis -1 = leaf)
+        self.order = np.arange(len(self.points))
+        self._nodes: List[List] = []
+        if len(self.points):
+            self._build(0, len(self.points))
+
+    def _build(self, start: int, end: int) -> int:
+        node = len(self._nodes)
+        self._nodes.append([start, end, -1, 0.0, -1])
+
+        if end - start <= self.leaf_size:
+            return node
+
+        idx = self.order[start:end]
+        coords = self.points[idx]
+        axis = int(np.argmax(coords.max(axis=0) - coords.min(axis=0)))
+
+        mid = (end - start) // 2
+        self.order[start:end] = idx[np.argpartition(coords[:, axis], mid)]
+        split = float(self.points[self.order[start + mid], axis])
+
+        self._build(start, start + mid)
+        right = self._build(start + mid, end)
+        self._nodes[node][2:] = [axis, split, right]
+        return node
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def query(self, point: np.ndarray, k: int = 1) -> List[Tuple[float, int]]:
+        """
+        The k nearest points as (euclidean distance, row), closest first.
+        """
+        if not len(self.points) or k < 1:
+            return []
+
+        point = np.asarray(point, dtype=float)
+        best: List[Tuple[float, int]] = []     # max-heap of (-dist², row)
+
+        def visit(node: int) -> None:
+            start, end, axis, split, right = self._nodes[node]
+
+            if axis < 0:
+                rows = self.order[start:end]
+                dist2 = ((self.points[rows] - point) ** 2).sum(axis=1)
+                for d, row in zip(dist2.tolist(), rows.tolist()):
+                    if len(best) < k:
+                        heapq.heappush(best, (-d, row))
+                    elif d < -best[0][0]:
+                        heapq.heapreplace(best, (-d, row))
+                return
+
+            diff = point[axis] - split
+            near, far = (node + 1, right) if diff < 0 else (right, node + 1)
+
+            visit(near)
+            if len(best) < k or diff * diff < -best[0][0]:
+                visit(far)
+
+        visit(0)
+        return [(float(np.sqrt(-d)), row) for d, row in sorted(best, reverse=True)]
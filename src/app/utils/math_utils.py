@@ -1,3 +1,10 @@
+from typing import Callable, Optional, Tuple
+
+# Iteration cap for find_root (bisection alone halves the bracket
+# each step, so this is far beyond any practical tolerance)
+ROOT_MAX_ITERATIONS = 60
+
+
 def normalize_degree(deg: float) -> float:
     """
     Normalize any angle to 0–360 range.
@@ -17,3 +24,52 @@ def house_from_sign(planet_sign: int, lagna_sign: int) -> int:
     Whole sign house calculation.
     """
     return ((planet_sign - lagna_sign + 12) % 12) + 1
+
+
+def find_root(
+    func: Callable[[float], Tuple[float, Optional[float]]],
+    a: float,
+    b: float,
+    fa: float,
+    fb: float,
+    tolerance: float
+) -> float:
+    """
+    Root of func in [a, b] with fa, fb of opposite sign.
+
+    func returns (value, slope); with a slope the step is Newton's,
+    otherwise the Illinois variant of regula falsi. Any step leaving
+    the current bracket is replaced by bisection.
+    """
+    t = a + (b - a) * fa / (fa - fb)
+
+    for _ in range(ROOT_MAX_ITERATIONS):
+        value, slope = func(t)
+
+        if value == 0.0:
+            return t
+
+        # Shrink the bracket
+        if (value < 0) == (fa < 0):
+            a, fa = t, value
+            if slope is None:
+                fb /= 2.0
+        else:
+            b, fb = t, value
+            if slope is None:
+                fa /= 2.0
+
+        if slope:
+            t_next = t - value / slope
+        else:
+            t_next = a + (b - a) * fa / (fa - fb)
+
+        if not a < t_next < b:
+            t_next = 0.5 * (a + b)
+
+        if abs(t_next - t) < tolerance or b - a < tolerance:
+            return t_next
+
+        t = t_next
+
+    return t
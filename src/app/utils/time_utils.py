@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import swisseph as swe
 
 
@@ -8,14 +10,60 @@ class TimeComputationError(Exception):
     pass
 
 
+J2000_JD = 2451545.0
+J2000 = datetime(2000, 1, 1, 12, 0, 0)
+
+
+def jd_to_local(julian_day: float, timezone: float) -> datetime:
+    """
+    Julian day (UT) → local civil time, to the second.
+    """
+    seconds = round((julian_day - J2000_JD) * 86400 + timezone * 3600)
+    return J2000 + timedelta(seconds=seconds)
+
+
+def local_to_jd(local_datetime: datetime, timezone: float) -> float:
+    """
+    Local civil time → Julian day (UT); inverse of jd_to_local.
+    """
+    seconds = (local_datetime - J2000).total_seconds() - timezone * 3600
+    return J2000_JD + seconds / 86400
+
+
+@lru_cache(maxsize=None)
+def get_zone(tz_name: str) -> ZoneInfo:
+    """
+    IANA zone by name (e.g. "Asia/Kolkata"), loaded once per process.
+    """
+    try:
+        return ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise TimeComputationError(f"Unknown timezone: '{tz_name}'")
+
+
+def utc_offset_hours(local_datetime: datetime, tz_name: str) -> float:
+    """
+    UTC offset in force at a local civil time in an IANA zone, from
+    its DST and historical transitions. A time skipped or repeated at a
+    transition takes the offset from before it.
+    """
+    zone = get_zone(tz_name)
+    offset = local_datetime.replace(tzinfo=zone, fold=0).utcoffset()
+    return offset.total_seconds() / 3600
+
+
 def compute_time_context(
     date_str: str,
     time_str: str,
-    timezone: float
+    timezone: Optional[float] = None,
+    tz_name: Optional[str] = None
 ) -> Dict[str, object]:
     """
     Computes Julian Day (UT) exactly as required by Swiss Ephemeris.
     Matches Jagannatha Hora when inputs are identical.
+
+    With `tz_name` the offset is the zone's at the given local time
+    (it takes precedence over `timezone`).
     """
 
     print("TIME_UTILS FILE:", __file__)
@@ -53,6 +101,11 @@ def compute_time_context(
         # ---------------------------------------------------------
         # 2. Convert LOCAL time → UTC (ONCE, ONLY ONCE)
         # ---------------------------------------------------------
+        if tz_name:
+            timezone = utc_offset_hours(local_datetime, tz_name)
+        elif timezone is None:
+            raise TimeComputationError("timezone or tz_name is required")
+
         offset_minutes = round(timezone * 60)
         utc_datetime = local_datetime - timedelta(minutes=offset_minutes)
 
@@ -87,6 +140,7 @@ def compute_time_context(
             "utc_datetime": utc_datetime,
             "julian_day": julian_day_ut,
             "timezone": timezone,
+            "tz_name": tz_name,
         }
 
     except Exception as exc:
@@ -0,0 +1,171 @@
+"""
+Serialisation share of Kundli request latency, before and after the
+FastJSONResponse path.
+
+Both variants serve the same warm-cache chart in process (no network):
+
+- "response_model": the route returns the dict and FastAPI validates
+  it against KundliGenerateResponse and serialises it (the old path)
+- "fast_json": the route returns the pre-validated dict as a
+  FastJSONResponse (the current path)
+
+Before timing, both paths must return the same status, content type
+and body (valid against KundliGenerateResponse), or the script stops
+with an AssertionError.
+
+Usage:
+    python tests/benchmark_serialization.py [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+# Add the server directory to sys.path to allow importing 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("OPENCAGE_API_KEY", "benchmark")
+
+import httpx
+import orjson
+from fastapi import FastAPI, status
+from fastapi.routing import serialize_response
+
+from app.api.v1.kundli import KundliGenerateResponse
+from app.core.constants import SUPPORTED_CHARTS
+from app.core.responses import FastJSONResponse
+from app.core.swisseph_init import init_swisseph
+from app.services.kundli_service import get_kundli
+
+BIRTH = {
+    "name": "Benchmark",
+    "date_str": "2006-01-24",
+    "time_str": "23:59:59",
+    "timezone": 5.5,
+    "latitude": 28.8333,
+    "longitude": 78.7833,
+}
+
+CHART_SETS = {
+    "D1+D9": None,
+    "all vargas": sorted(SUPPORTED_CHARTS),
+}
+
+
+def build_app(charts):
+    app = FastAPI()
+
+    @app.post(
+        "/response_model",
+        response_model=KundliGenerateResponse,
+        status_code=status.HTTP_201_CREATED,
+    )
+    async def response_model_path():
+        return await get_kundli(**BIRTH, charts=charts)
+
+    @app.post(
+        "/fast_json",
+        response_model=KundliGenerateResponse,
+        status_code=status.HTTP_201_CREATED,
+    )
+    async def fast_json_path():
+        kundli = await get_kundli(**BIRTH, charts=charts)
+        return FastJSONResponse(kundli, status_code=status.HTTP_201_CREATED)
+
+    return app
+
+
+PATHS = ("response_model", "fast_json")
+
+
+async def check_paths(client):
+    responses = {path: await client.post(f"/{path}") for path in PATHS}
+    old, new = responses["response_model"], responses["fast_json"]
+
+    assert old.status_code == new.status_code == 201, (old.status_code, new.status_code)
+    assert old.headers["content-type"] == new.headers["content-type"], (
+        old.headers["content-type"], new.headers["content-type"]
+    )
+    KundliGenerateResponse.model_validate_json(new.content)
+    assert orjson.loads(old.content) == orjson.loads(new.content)
+    # Byte for byte, key order included
+    assert old.content == new.content
+
+
+async def time_requests(client, count):
+    # Paths alternate so load changes during the run hit both alike
+    samples = {path: [] for path in PATHS}
+    for _ in range(count):
+        for path in PATHS:
+            start = time.perf_counter()
+            response = await client.post(f"/{path}")
+            samples[path].append(time.perf_counter() - start)
+            assert response.status_code == 201, response.text
+    return samples
+
+
+async def time_serialisation(app, kundli, count):
+    field = next(r for r in app.routes if r.path == "/response_model").response_field
+
+    async def response_model():
+        # What FastAPI does with the returned dict (validate + dump_json)
+        await serialize_response(field=field, response_content=kundli, dump_json=True)
+
+    async def fast_json():
+        FastJSONResponse(kundli)
+
+    samples = {path: [] for path in PATHS}
+    for _ in range(count):
+        for path, fn in (("response_model", response_model), ("fast_json", fast_json)):
+            start = time.perf_counter()
+            await fn()
+            samples[path].append(time.perf_counter() - start)
+    return samples
+
+
+async def run(count):
+    rows = []
+
+    for label, charts in CHART_SETS.items():
+        app = build_app(charts)
+        kundli = await get_kundli(**BIRTH, charts=charts)   # warm the cache
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await check_paths(client)
+            await time_requests(client, count // 10)   # warm up
+            requests = await time_requests(client, count)
+            serialise = await time_serialisation(app, kundli, count)
+
+            for path in PATHS:
+                size = len((await client.post(f"/{path}")).content)
+                rows.append((
+                    label,
+                    path,
+                    size,
+                    statistics.median(requests[path]) * 1e6,
+                    statistics.median(serialise[path]) * 1e6,
+                ))
+
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    init_swisseph()
+    # compute_time_context prints debug lines on every call
+    with contextlib.redirect_stdout(io.StringIO()):
+        rows = asyncio.run(run(args.requests))
+
+    print(f"{'charts':<12} {'path':<16} {'bytes':>7} {'request p50':>12} "
+          f"{'serialise p50':>14} {'share':>7}")
+    for label, path, size, request_us, serialise_us in rows:
+        print(f"{label:<12} {path:<16} {size:>7} {request_us:>10.0f}us "
+              f"{serialise_us:>12.0f}us {serialise_us / request_us:>6.1%}")
@@ -1,5 +1,6 @@
 from app.utils.time_utils import compute_time_context
 from app.engine.chart_builder import build_kundli
+from app.engine.chart_context import build_chart_context
 
 
 if __name__ == "__main__":
@@ -16,7 +17,9 @@ if __name__ == "__main__":
     print("UTC DT  :", ctx["utc_datetime"])
     print("Julian Day:", jd)
 
-    chart = build_kundli(jd, 28.8333, 78.7833)
+    chart = build_kundli(
+        build_chart_context(time_ctx=ctx, latitude=28.8333, longitude=78.7833)
+    )
 
     print("\n===== D1 PLANETS (SIGN-WISE) =====")
     for h in chart["D1"]["houses"]:
@@ -1,5 +1,6 @@
 from app.utils.time_utils import compute_time_context
 from app.engine.chart_builder import build_kundli
+from app.engine.chart_context import build_chart_context
 
 
 if __name__ == "__main__":
@@ -16,7 +17,9 @@ if __name__ == "__main__":
     lat = 28.8333   # Moradabad
     lon = 78.7833
 
-    chart = build_kundli(jd, lat, lon)
+    chart = build_kundli(
+        build_chart_context(time_ctx=ctx, latitude=lat, longitude=lon)
+    )
 
     print("\n===== D9 DEBUG (BACKEND ONLY) =====")
 
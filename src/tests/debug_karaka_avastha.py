@@ -1,4 +1,5 @@
 from app.engine.chart_builder import build_kundli
+from app.engine.chart_context import build_chart_context
 from app.engine.planetary_engine import FRIENDSHIP_TABLE, EXALT_SIGNS, DEBIL_SIGNS, SIGN_LORDS
 from app.engine.karaka import compute_chara_karakas
 from app.utils.time_utils import compute_time_context
@@ -112,7 +113,7 @@ lat = 28.833
 lon = 78.783
 
 ctx = compute_time_context(date, time, tz)
-chart = build_kundli(ctx["julian_day"], lat, lon)
+chart = build_kundli(build_chart_context(time_ctx=ctx, latitude=lat, longitude=lon))
 
 # -----------------------------------------
 # Extract D1 planets WITH house context
@@ -0,0 +1,125 @@
+"""
+Per-item results of POST /api/v1/kundli/batch, in process (no network).
+
+One batch mixes good records with records that fail at each stage
+(request schema, input parsing, offline timezone resolution) and with
+repeats of a chart under other names. Checks that:
+
+- every record gets an item at its own index, in input order
+- a failing record is reported in its item and does not affect others
+- each good item carries the same chart as POST /kundli/generate for
+  that record, under the record's own name
+- repeated charts are computed once (kundli_flights.batch_duplicates)
+- sending the batch again returns the same items
+
+Exits with status 1 on any failure.
+
+Usage:
+    python tests/verify_batch.py
+"""
+
+import asyncio
+import contextlib
+import io
+import os
+import sys
+
+# Add the server directory to sys.path to allow importing 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("OPENCAGE_API_KEY", "verify")
+
+import httpx
+
+from app.core.metrics import collect_metrics
+from app.core.swisseph_init import init_swisseph
+from app.main import app
+
+GOOD = {
+    "date": "2006-01-24",
+    "time": "23:59:59",
+    "timezone": 5.5,
+    "latitude": 28.8333,
+    "longitude": 78.7833,
+}
+
+# (record, expected status, text expected in the error)
+CASES = [
+    ({**GOOD, "name": "First"}, "ok", None),
+    ({**GOOD, "time": "25:61"}, "error", "time must be HH:MM:SS"),
+    ({**GOOD, "latitude": 12.97, "longitude": 77.59, "name": "Elsewhere"}, "ok", None),
+    ({**GOOD, "name": "Repeat"}, "ok", None),
+    ({**GOOD, "latitude": 123.0}, "error", "latitude"),
+    ({**GOOD, "charts": ["D5"]}, "error", "Unsupported divisional chart"),
+    ({**GOOD, "date": "2023-02-30"}, "error", "Could not parse date/time"),
+    ({**{k: v for k, v in GOOD.items() if k != "timezone"},
+      "latitude": 0.0, "longitude": -30.0}, "error", "Cannot resolve the timezone"),
+    ({**GOOD, "date": "1990-08-15", "time": "10:30:00", "charts": ["D10", "D60"]}, "ok", None),
+    ({**GOOD, "name": "Repeat again"}, "ok", None),
+    ({"date": "2006-01-24"}, "error", "Field required"),
+]
+
+# Records asking again for the chart of CASES[0]
+REPEATS = 2
+
+
+def duplicates():
+    return collect_metrics()["kundli_flights"]["batch_duplicates"]
+
+
+async def run():
+    failures = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://verify") as client:
+        before = duplicates()
+        response = await client.post(
+            "/api/v1/kundli/batch", json={"records": [r for r, _, _ in CASES]}
+        )
+        if response.status_code != 200:
+            return [f"batch: HTTP {response.status_code} {response.text[:200]}"]
+        results = response.json()["results"]
+
+        if duplicates() - before != REPEATS:
+            failures.append(f"batch_duplicates grew by {duplicates() - before}, expected {REPEATS}")
+
+        if [item["index"] for item in results] != list(range(len(CASES))):
+            failures.append(f"indices {[item['index'] for item in results]}")
+
+        for index, ((record, status, error), item) in enumerate(zip(CASES, results)):
+            if item["status"] != status:
+                failures.append(f"#{index}: status {item['status']} ({item['error']}), expected {status}")
+                continue
+
+            if status == "error":
+                if item["kundli"] is not None or error not in (item["error"] or ""):
+                    failures.append(f"#{index}: error {item['error']!r}, expected {error!r}")
+                continue
+
+            single = await client.post("/api/v1/kundli/generate", json=record)
+            if single.status_code != 201:
+                failures.append(f"#{index}: /generate HTTP {single.status_code}")
+            elif item["kundli"] != single.json():
+                failures.append(f"#{index}: chart differs from /generate")
+            if item["kundli"]["meta"]["name"] != record.get("name"):
+                failures.append(f"#{index}: name {item['kundli']['meta']['name']!r}")
+
+        again = await client.post(
+            "/api/v1/kundli/batch", json={"records": [r for r, _, _ in CASES]}
+        )
+        if again.json()["results"] != results:
+            failures.append("second batch differs from the first")
+
+    return failures
+
+
+if __name__ == "__main__":
+    init_swisseph()
+    # compute_time_context prints debug lines on every call
+    with contextlib.redirect_stdout(io.StringIO()):
+        failures = asyncio.run(run())
+
+    for failure in failures:
+        print(f"  {failure}")
+    print(f"[BATCH] {len(CASES)} records, {len(failures)} failures")
+    print("\nFAILED" if failures else "\nOK: batch items are independent and match single requests")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,87 @@
+"""
+DashaIndex lookups against a linear scan of the expanded period lists.
+
+For random charts, the running period at every level is looked up
+with DashaIndex.periods_at and by scanning sub_periods level by level,
+at random dates, exactly at period boundaries and just inside them,
+and outside the 120-year cycle. Lords and bounds must be identical.
+Exits with status 1 on any difference.
+
+Usage:
+    python tests/verify_dasha_index.py
+"""
+
+import os
+import random
+import sys
+
+# Add the server directory to sys.path to allow importing 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.engine.dasha_engine import (
+    DASHA_LEVELS,
+    DashaIndex,
+    mahadasha_periods,
+    sub_periods,
+)
+
+CHARTS = 200
+DATES_PER_CHART = 50
+
+
+def linear_scan(periods, julian_day, depth):
+    running = []
+    for _ in range(depth):
+        period = next((p for p in periods if p[1] <= julian_day < p[2]), None)
+        if period is None:
+            return None if not running else running
+        running.append(period)
+        periods = sub_periods(period)
+    return running
+
+
+def probe_dates(rng, periods):
+    start, end = periods[0][1], periods[-1][2]
+    dates = [rng.uniform(start, end) for _ in range(DATES_PER_CHART)]
+
+    # Boundaries down to the deepest level along a few random branches
+    for _ in range(5):
+        level = periods
+        for _ in DASHA_LEVELS:
+            period = rng.choice(level)
+            dates += [period[1], period[1] + 1e-6, period[2] - 1e-6]
+            level = sub_periods(period)
+
+    dates += [start - 1.0, end, end + 1.0]
+    return dates
+
+
+def check_chart(rng):
+    moon_longitude = rng.uniform(0.0, 360.0)
+    birth_jd = rng.uniform(2415020.5, 2488069.5)    # 1900–2100
+    periods = mahadasha_periods(moon_longitude=moon_longitude, birth_jd=birth_jd)
+    index = DashaIndex(moon_longitude=moon_longitude, birth_jd=birth_jd)
+
+    failures = 0
+    for julian_day in probe_dates(rng, periods):
+        expected = linear_scan(periods, julian_day, len(DASHA_LEVELS))
+        actual = index.periods_at(julian_day)
+
+        if actual != expected:
+            failures += 1
+            if failures <= 5:
+                print(f"  moon {moon_longitude:.6f} birth {birth_jd:.6f} at {julian_day!r}:")
+                print(f"    index  {actual}")
+                print(f"    linear {expected}")
+
+    return failures
+
+
+if __name__ == "__main__":
+    rng = random.Random(10)
+
+    failed = sum(check_chart(rng) for _ in range(CHARTS))
+
+    print(f"[INDEX] {CHARTS} charts, {failed} mismatches")
+    print("\nFAILED" if failed else "\nOK: DashaIndex matches the linear scan")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,181 @@
+"""
+Vimshottari timing of the multi-level dasha engine.
+
+For random births (Moon longitude, Julian day, UTC offset):
+
+1. Mahadashas against the date-based code they replaced (kept here as
+   the reference): same lords, and every boundary within
+   MAX_DRIFT_DAYS (the old code anchored to the birth date and counted
+   calendar years, the engine counts 365.2425-day years from the birth
+   moment).
+2. The balance at birth: the elapsed share of the first mahadasha is
+   the share of the Moon's nakshatra already traversed.
+3. Every level down to sookshma, along random branches: sub-periods
+   start at the parent, follow on without gaps, end on the parent and
+   each last years/120 of it.
+4. The "current" mahadasha of the Kundli body against DashaIndex.
+
+Exits with status 1 on any failure.
+
+Usage:
+    python tests/verify_dasha_periods.py
+"""
+
+import os
+import random
+import sys
+from datetime import date, datetime, time, timedelta
+
+# Add the server directory to sys.path to allow importing 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.engine.dasha_engine import (
+    DASHA_LEVELS,
+    DASHA_LORDS,
+    DASHA_YEARS,
+    DAYS_PER_YEAR,
+    NAKSHATRA_WIDTH,
+    TOTAL_CYCLE_YEARS,
+    DashaIndex,
+    compute_vimshottari_dasha,
+    mahadasha_periods,
+    sub_periods,
+)
+from app.utils.time_utils import jd_to_local, local_to_jd
+
+CHARTS = 500
+# Calendar years run up to ~2 days off 365.2425-day years (skipped
+# leap days in 2100, 2200, ...), plus up to a day of birth-date anchoring
+MAX_DRIFT_DAYS = 3
+SPAN_TOLERANCE_DAYS = 1e-6
+
+
+# ---------------------------------------------------------
+# REFERENCE: MAHADASHAS BEFORE THE MULTI-LEVEL ENGINE
+# ---------------------------------------------------------
+def old_mahadashas(moon_longitude, birth_date):
+    nak_idx = int(moon_longitude // NAKSHATRA_WIDTH)
+    lord_idx = nak_idx % 9
+
+    start_lord = DASHA_LORDS[lord_idx]
+    elapsed = moon_longitude % NAKSHATRA_WIDTH
+    remaining_ratio = 1.0 - (elapsed / NAKSHATRA_WIDTH)
+    balance_days = int(remaining_ratio * DASHA_YEARS[start_lord] * DAYS_PER_YEAR)
+
+    sequence = DASHA_LORDS[lord_idx:] + DASHA_LORDS[:lord_idx]
+    current_end = birth_date + timedelta(days=balance_days)
+    mahadashas = [(start_lord, birth_date, current_end)]
+
+    for lord in sequence[1:]:
+        next_end = current_end.replace(year=current_end.year + DASHA_YEARS[lord])
+        mahadashas.append((lord, current_end, next_end))
+        current_end = next_end
+
+    return mahadashas
+
+
+def check_against_old(moon_longitude, birth_jd, timezone):
+    failures = []
+    birth_date = jd_to_local(birth_jd, timezone).date()
+    old = old_mahadashas(moon_longitude, birth_date)
+    new = compute_vimshottari_dasha(
+        moon_longitude=moon_longitude, birth_jd=birth_jd, timezone=timezone
+    )["mahadasha"]
+
+    if [p[0] for p in old] != [p["planet"] for p in new]:
+        return [f"lords {[p['planet'] for p in new]}, old {[p[0] for p in old]}"]
+
+    for (lord, _, old_end), period in zip(old, new):
+        drift = abs((old_end - date.fromisoformat(period["end"])).days)
+        if drift > MAX_DRIFT_DAYS:
+            failures.append(f"{lord} ends {period['end']}, old {old_end} ({drift} days)")
+    return failures
+
+
+def check_balance(moon_longitude, birth_jd):
+    lord, start, end = mahadasha_periods(moon_longitude=moon_longitude, birth_jd=birth_jd)[0]
+    elapsed = (birth_jd - start) / (end - start)
+    expected = (moon_longitude % NAKSHATRA_WIDTH) / NAKSHATRA_WIDTH
+
+    if abs(elapsed - expected) > 1e-9 or not start <= birth_jd < end:
+        return [f"{lord} balance {elapsed!r}, expected {expected!r}"]
+    return []
+
+
+def check_levels(rng, moon_longitude, birth_jd):
+    failures = []
+    periods = mahadasha_periods(moon_longitude=moon_longitude, birth_jd=birth_jd)
+    total = periods[-1][2] - periods[0][1]
+
+    if abs(total - TOTAL_CYCLE_YEARS * DAYS_PER_YEAR) > SPAN_TOLERANCE_DAYS:
+        failures.append(f"cycle lasts {total} days")
+
+    parent = None
+    for level in DASHA_LEVELS:
+        if parent is not None:
+            periods = sub_periods(parent)
+            span = parent[2] - parent[1]
+
+            if periods[0][0] != parent[0] or periods[0][1] != parent[1] or periods[-1][2] != parent[2]:
+                failures.append(f"{level} of {parent} does not fill it")
+
+            for lord, start, end in periods:
+                expected = span * DASHA_YEARS[lord] / TOTAL_CYCLE_YEARS
+                if abs((end - start) - expected) > SPAN_TOLERANCE_DAYS:
+                    failures.append(f"{level} {lord} lasts {end - start}, expected {expected}")
+
+        for (_, _, end), (_, start, _) in zip(periods, periods[1:]):
+            if end != start:
+                failures.append(f"{level}: gap or overlap at {end!r} / {start!r}")
+
+        parent = rng.choice(periods)
+
+    return failures
+
+
+def check_current(rng, moon_longitude, birth_jd, timezone):
+    failures = []
+    index = DashaIndex(moon_longitude=moon_longitude, birth_jd=birth_jd)
+    end_jd = index.boundaries[-1]
+
+    for _ in range(10):
+        as_of = jd_to_local(rng.uniform(birth_jd, end_jd), timezone).date()
+        current = compute_vimshottari_dasha(
+            moon_longitude=moon_longitude, birth_jd=birth_jd,
+            timezone=timezone, as_of=as_of
+        )["current"]["mahadasha"]
+
+        # The Kundli body resolves by local date: compare at local noon,
+        # away from boundaries that fall within that day
+        noon = local_to_jd(datetime.combine(as_of, time(12)), timezone)
+        running = [index.periods_at(noon + d, depth=1) for d in (-1, 0, 1)]
+        if len({r[0][0] if r else None for r in running}) == 1:
+            expected = running[1][0][0] if running[1] else None
+            if current != expected:
+                failures.append(f"current on {as_of}: {current}, index {expected}")
+
+    return failures
+
+
+if __name__ == "__main__":
+    rng = random.Random(9)
+    failures = []
+
+    for _ in range(CHARTS):
+        moon_longitude = rng.uniform(0.0, 360.0)
+        birth_jd = rng.uniform(2415020.5, 2488069.5)    # 1900–2100
+        timezone = rng.choice([-8.0, -5.0, 0.0, 1.0, 5.5, 9.0])
+
+        for failure in (
+            check_against_old(moon_longitude, birth_jd, timezone)
+            + check_balance(moon_longitude, birth_jd)
+            + check_levels(rng, moon_longitude, birth_jd)
+            + check_current(rng, moon_longitude, birth_jd, timezone)
+        ):
+            failures.append(f"moon {moon_longitude:.6f} birth {birth_jd:.6f}: {failure}")
+
+    for failure in failures[:20]:
+        print(f"  {failure}")
+    print(f"[DASHA] {CHARTS} births, {len(failures)} failures")
+    print("\nFAILED" if failures else "\nOK: dasha timing is consistent at every level")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,132 @@
+"""
+D9 from the table-driven varga engine against the navamsa code it
+replaced (kept here verbatim as the reference).
+
+Checks every sign over a dense degree grid, including both sides of
+each navamsa boundary, then the D9 lagna and planets of whole charts.
+Exits with status 1 on any mismatch.
+
+Usage:
+    python tests/verify_divisional_charts.py
+"""
+
+import os
+import random
+import sys
+
+# Add the server directory to sys.path to allow importing 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from app.core.swisseph_init import init_swisseph
+from app.engine.chart_builder import build_kundli
+from app.engine.chart_context import build_chart_context
+from app.engine.divisional_charts import compute_varga_signs
+from app.utils.time_utils import compute_time_context
+
+
+# ---------------------------------------------------------
+# REFERENCE: NAVAMSA BEFORE THE VARGA TABLES
+# ---------------------------------------------------------
+def old_navamsa_sign(rasi_sign: int, degree_in_sign: float) -> int:
+    deg = degree_in_sign % 30.0
+    navamsa_index = min(8, int(deg // (30.0 / 9.0)))
+
+    # Movable signs
+    if rasi_sign in (1, 4, 7, 10):
+        start = rasi_sign
+    # Fixed signs
+    elif rasi_sign in (2, 5, 8, 11):
+        start = ((rasi_sign + 8 - 1) % 12) + 1
+    # Dual signs
+    else:
+        start = ((rasi_sign + 4 - 1) % 12) + 1
+
+    return ((start + navamsa_index - 1) % 12) + 1
+
+
+def degree_grid():
+    grid = list(np.linspace(0.0, 30.0, 30001, endpoint=False))
+    for k in range(1, 9):
+        boundary = k * 30.0 / 9.0
+        grid += [np.nextafter(boundary, 0.0), boundary, np.nextafter(boundary, 30.0)]
+    grid.append(np.nextafter(30.0, 0.0))
+    return np.array(grid)
+
+
+def check_grid():
+    degrees = degree_grid()
+    mismatches = 0
+
+    for rasi_sign in range(1, 13):
+        new = compute_varga_signs(
+            np.full(len(degrees), rasi_sign - 1), degrees, ("D9",)
+        )["D9"] + 1
+
+        for degree, sign in zip(degrees, new):
+            expected = old_navamsa_sign(rasi_sign, float(degree))
+            if sign != expected:
+                mismatches += 1
+                if mismatches <= 10:
+                    print(f"  sign {rasi_sign} {degree!r}°: D9 {sign}, old {expected}")
+
+    print(f"[GRID] {12 * len(degrees)} placements, {mismatches} mismatches")
+    return mismatches
+
+
+def random_births(count, seed=9):
+    rng = random.Random(seed)
+    births = [
+        ("2006-01-24", "23:59:59", 5.5, 28.8333, 78.7833),
+        ("2006-01-17", "12:12:00", 5.5, 28.8333, 78.7833),
+    ]
+    for _ in range(count):
+        births.append((
+            f"{rng.randint(1900, 2099)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}",
+            rng.choice([-8.0, -5.0, 0.0, 1.0, 5.5, 9.0]),
+            round(rng.uniform(-60.0, 60.0), 4),
+            round(rng.uniform(-180.0, 180.0), 4),
+        ))
+    return births
+
+
+def check_charts(count):
+    mismatches = 0
+    births = random_births(count)
+
+    for date_str, time_str, timezone, latitude, longitude in births:
+        context = build_chart_context(
+            time_ctx=compute_time_context(
+                date_str=date_str, time_str=time_str, timezone=timezone
+            ),
+            latitude=latitude,
+            longitude=longitude,
+        )
+        charts = build_kundli(context, ["D9"])
+        d1 = charts["D1"]["planets_raw"]
+        d9 = {p["name"]: p["sign"] for p in charts["D9"]["planets_raw"]}
+
+        expected_lagna = old_navamsa_sign(context.lagna_sign, d1[0]["degree_in_sign"])
+        if charts["D9"]["lagna_sign"] != expected_lagna:
+            mismatches += 1
+            print(f"  {date_str} {time_str}: D9 lagna {charts['D9']['lagna_sign']}, old {expected_lagna}")
+
+        for p in d1:
+            expected = old_navamsa_sign(int(p["sign"]), float(p["degree_in_sign"]))
+            if d9[p["name"]] != expected:
+                mismatches += 1
+                print(f"  {date_str} {time_str} {p['name']}: D9 {d9[p['name']]}, old {expected}")
+
+    print(f"[CHARTS] {len(births)} charts, {mismatches} mismatches")
+    return mismatches
+
+
+if __name__ == "__main__":
+    init_swisseph()
+
+    failed = check_grid() + check_charts(200)
+
+    print("\nFAILED" if failed else "\nOK: D9 matches the old navamsa path")
+    sys.exit(1 if failed else 0)
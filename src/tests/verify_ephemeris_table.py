@@ -0,0 +1,138 @@
+"""
+Interpolated ephemeris table against swe.calc_ut.
+
+Uses the configured table (EPHEMERIS_TABLE_PATH), or builds a short
+one (1970–1980) in a temporary directory when there is none.
+
+1. Random epochs over the table range: longitudes and speeds from
+   compute_sidereal_longitudes against full_precision=True, within the
+   table's fallback thresholds where interpolated, identical where the
+   epoch falls back to swe.calc_ut.
+2. A dense scan across JD 2442609, where the Moshier ephemeris jumps by
+   several arcseconds (Saturn) between two table samples.
+3. Epochs outside the table range: identical to swe.calc_ut.
+
+Exits with status 1 on any failure.
+
+Usage:
+    python tests/verify_ephemeris_table.py
+"""
+
+import os
+import sys
+import tempfile
+
+# Add the server directory to sys.path to allow importing 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.ephemeris_table import (
+    FALLBACK_LONGITUDE_ARCSEC,
+    FALLBACK_SPEED,
+    build_ephemeris_table,
+    get_ephemeris_table,
+)
+from app.core.swisseph_init import init_swisseph
+from app.engine.planets import compute_sidereal_longitudes
+
+SAMPLES = 50000
+# The build enforces these at its check points only; between them the
+# error has stayed well below (see app.core.ephemeris_table)
+LONGITUDE_BOUND_ARCSEC = FALLBACK_LONGITUDE_ARCSEC
+SPEED_BOUND = FALLBACK_SPEED
+
+MOSHIER_JUMP = (2442606.0, 2442613.0, 0.01)
+
+
+def compare(julian_days):
+    """
+    Largest longitude (arcsec) and speed error per body, and whether
+    every body agrees exactly.
+    """
+    table = compute_sidereal_longitudes(julian_days)
+    exact = compute_sidereal_longitudes(julian_days, full_precision=True)
+
+    errors = {}
+    identical = True
+    for name in exact:
+        lon = 3600.0 * np.abs(
+            (table[name]["longitude"] - exact[name]["longitude"] + 180.0) % 360.0 - 180.0
+        )
+        speed = np.abs(table[name]["speed"] - exact[name]["speed"])
+        errors[name] = (lon, speed)
+        identical &= bool(np.array_equal(table[name]["longitude"], exact[name]["longitude"])
+                          and np.array_equal(table[name]["speed"], exact[name]["speed"]))
+
+    return errors, identical
+
+
+def check_bounds(label, errors):
+    failures = 0
+    for name, (lon, speed) in errors.items():
+        if len(lon) == 0:
+            continue
+        ok = lon.max() <= LONGITUDE_BOUND_ARCSEC and speed.max() <= SPEED_BOUND
+        failures += not ok
+        print(f"[{label}] {name:<8} lon {lon.max():.4f}\"  speed {speed.max():.2e} °/day"
+              + ("" if ok else "  <-- over the bound"))
+    return failures
+
+
+def check_random(rng, table):
+    jds = rng.uniform(table.first_jd, table.last_jd, SAMPLES)
+    covered = table.covers(jds)
+
+    errors, _ = compare(jds[covered])
+    failures = check_bounds("INTERPOLATED", errors)
+
+    _, identical = compare(jds[~covered])
+    if not identical:
+        print("[FALLBACK] epochs marked for swe.calc_ut differ from it")
+        failures += 1
+    print(f"[FALLBACK] {int((~covered).sum())} of {SAMPLES} epochs use swe.calc_ut")
+
+    return failures
+
+
+def check_moshier_jump(table):
+    start, end, step = MOSHIER_JUMP
+    if start < table.first_jd or end > table.last_jd:
+        print("[JUMP] outside the table range")
+        return 0
+
+    jds = np.arange(start, end, step)
+    errors, _ = compare(jds)
+    return check_bounds("JUMP", {"Saturn": errors["Saturn"]})
+
+
+def check_outside(table):
+    jds = np.array([table.first_jd - 10.0, table.first_jd - 1e-6, table.last_jd, table.last_jd + 365.25])
+    _, identical = compare(jds)
+    if not identical:
+        print("[OUTSIDE] epochs outside the table differ from swe.calc_ut")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    init_swisseph()
+
+    if not os.path.exists(settings.ephemeris_table_path):
+        path = os.path.join(tempfile.mkdtemp(), "sidereal_table.bin")
+        print(f"No table at {settings.ephemeris_table_path}, building 1970–1980 in {path}")
+        build_ephemeris_table(path, start="1970-01-01", end="1981-01-01")
+        settings.ephemeris_table_path = path
+
+    table = get_ephemeris_table()
+    if table is None:
+        print("Ephemeris table disabled (EPHEMERIS_TABLE_ENABLED)")
+        sys.exit(1)
+    print(f"[TABLE] {table.path}: {table.n_fallback} fallback intervals, "
+          f"build sampled max {table.max_longitude_error_arcsec:.4f}\"")
+
+    rng = np.random.default_rng(6)
+    failed = check_random(rng, table) + check_moshier_jump(table) + check_outside(table)
+
+    print("\nFAILED" if failed else "\nOK: interpolated positions stay within the table's thresholds")
+    sys.exit(1 if failed else 0)
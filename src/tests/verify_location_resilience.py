@@ -0,0 +1,228 @@
+"""
+Circuit breaker and stale-while-revalidate for location search.
+
+1. CircuitBreaker on its own: consecutive failures open it, an open
+   circuit rejects calls without making them, one trial call at a
+   time once reset_timeout has passed, and the trial's outcome closes
+   or re-opens it (a cancelled trial does neither).
+2. search_location against a local stand-in for the provider
+   (OPENCAGE_API_URL, gazetteer and SQLite store disabled): concurrent
+   misses make one upstream call, stale entries are served at once and
+   refreshed by one background call, a failing provider opens the
+   circuit, after which misses fail fast with retry_after while stale
+   entries are still served, and a successful trial closes it again.
+
+Exits with status 1 on any failure.
+
+Usage:
+    python tests/verify_location_resilience.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Add the server directory to sys.path to allow importing 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+# ---------------------------------------------------------
+# STAND-IN PROVIDER
+# ---------------------------------------------------------
+class Provider(BaseHTTPRequestHandler):
+    mode = "ok"         # "ok" | "fail"
+    delay = 0.0
+    hits = {}
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)["q"][0]
+        Provider.hits[query] = Provider.hits.get(query, 0) + 1
+        time.sleep(Provider.delay)
+
+        if Provider.mode == "fail":
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        body = json.dumps({"results": [{
+            "formatted": f"{query.title()}, Testland",
+            "geometry": {"lat": 10.0, "lng": 20.0},
+            "annotations": {"timezone": {"offset_sec": 3600, "name": "Etc/GMT-1"}},
+        }]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), Provider)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+
+FRESH_SECONDS = 0.5
+RESET_SECONDS = 1.5
+FAILURES = 3
+
+os.environ.update({
+    "OPENCAGE_API_KEY": os.environ.get("OPENCAGE_API_KEY", "verify"),
+    "OPENCAGE_API_URL": f"http://127.0.0.1:{server.server_port}/",
+    "GAZETTEER_PATH": "",
+    "GEOCODE_CACHE_PATH": "",
+    "GEOCODE_FRESH_SECONDS": str(FRESH_SECONDS),
+    "LOCATION_BREAKER_FAILURES": str(FAILURES),
+    "LOCATION_BREAKER_RESET_SECONDS": str(RESET_SECONDS),
+})
+
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from app.core.metrics import collect_metrics
+from app.services import location_service
+from app.services.location_service import LocationServiceError, search_location
+
+failures = []
+
+
+def expect(condition, message):
+    if not condition:
+        failures.append(message)
+
+
+# ---------------------------------------------------------
+# 1. BREAKER
+# ---------------------------------------------------------
+async def check_breaker():
+    breaker = CircuitBreaker("verify", failure_threshold=2, reset_timeout=0.2)
+    calls = []
+
+    async def ok():
+        calls.append("ok")
+        return "ok"
+
+    async def fail():
+        calls.append("fail")
+        raise RuntimeError("down")
+
+    async def slow():
+        calls.append("slow")
+        await asyncio.sleep(0.1)
+        return "slow"
+
+    async def attempt(fn):
+        try:
+            return await breaker.call(fn)
+        except CircuitOpenError:
+            return "rejected"
+        except RuntimeError:
+            return "failed"
+
+    await attempt(fail)
+    await attempt(ok)
+    expect(breaker.state == CLOSED, "a success must reset the failure count")
+
+    await attempt(fail)
+    await attempt(fail)
+    expect(breaker.state == OPEN, f"2 failures: {breaker.state}, expected open")
+
+    calls.clear()
+    expect(await attempt(ok) == "rejected" and not calls, "an open circuit must not call through")
+    expect(breaker.retry_after() > 0, "an open circuit must report retry_after")
+
+    await asyncio.sleep(0.25)
+    expect(breaker.state == HALF_OPEN, f"after reset_timeout: {breaker.state}, expected half_open")
+    results = await asyncio.gather(attempt(slow), attempt(ok))
+    expect(results == ["slow", "rejected"], f"half-open admitted {results}, expected one trial")
+    expect(breaker.state == CLOSED, "a successful trial must close the circuit")
+
+    await attempt(fail)
+    await attempt(fail)
+    await asyncio.sleep(0.25)
+    expect(await attempt(fail) == "failed" and breaker.state == OPEN, "a failed trial must re-open it")
+
+    await asyncio.sleep(0.25)
+    trial = asyncio.ensure_future(attempt(slow))
+    await asyncio.sleep(0.01)
+    trial.cancel()
+    await asyncio.gather(trial, return_exceptions=True)
+    expect(breaker.state == HALF_OPEN and breaker.allows_call(), "a cancelled trial must free the trial slot")
+
+    print(f"[BREAKER] opened {breaker.opened} times, rejected {breaker.rejected} calls")
+
+
+# ---------------------------------------------------------
+# 2. LOCATION SEARCH
+# ---------------------------------------------------------
+async def check_location_search():
+    Provider.delay = 0.2
+    rows = await asyncio.gather(*(search_location("Alpha") for _ in range(5)))
+    expect(Provider.hits.get("alpha") == 1, f"5 concurrent misses: {Provider.hits.get('alpha')} upstream calls")
+    expect(all(r == rows[0] for r in rows) and rows[0][0].latitude == 10.0, "coalesced callers got different rows")
+
+    await search_location("  ALPHA ")
+    expect(Provider.hits["alpha"] == 1, "a fresh entry must be served from the cache")
+
+    # Stale: served at once, one background refresh
+    await asyncio.sleep(FRESH_SECONDS + 0.1)
+    started = time.monotonic()
+    await asyncio.gather(*(search_location("alpha") for _ in range(3)))
+    expect(time.monotonic() - started < Provider.delay, "a stale entry must not wait for the refresh")
+    await asyncio.sleep(Provider.delay + 0.2)
+    expect(Provider.hits["alpha"] == 2, f"3 stale reads: {Provider.hits['alpha'] - 1} refreshes, expected 1")
+
+    # Provider down: misses open the circuit (alpha goes stale meanwhile)
+    await asyncio.sleep(FRESH_SECONDS + 0.1)
+    Provider.delay = 0.0
+    Provider.mode = "fail"
+    for k in range(FAILURES):
+        try:
+            await search_location(f"down {k}")
+            failures.append("a provider error must fail the search")
+        except LocationServiceError:
+            pass
+    expect(collect_metrics()["circuit_opencage"]["state"] == OPEN, "provider failures must open the circuit")
+
+    try:
+        await search_location("down again")
+        failures.append("a miss must fail while the circuit is open")
+    except LocationServiceError as exc:
+        expect(exc.retry_after is not None and exc.retry_after > 0, "an open circuit must set retry_after")
+    expect("down again" not in Provider.hits, "an open circuit must not call the provider")
+
+    # Stale entries are still served, without a refresh attempt
+    hits = Provider.hits["alpha"]
+    stale = await search_location("alpha")
+    expect(stale and stale[0].latitude == 10.0, "a stale entry must be served while the circuit is open")
+    await asyncio.sleep(0.1)
+    expect(Provider.hits["alpha"] == hits, "no refresh may be attempted while the circuit is open")
+
+    # Provider back: the trial call closes the circuit
+    await asyncio.sleep(RESET_SECONDS)
+    Provider.mode = "ok"
+    result = await search_location("down again")
+    expect(result and result[0].label == "Down Again, Testland", "the trial search must succeed")
+    expect(collect_metrics()["circuit_opencage"]["state"] == CLOSED, "a successful trial must close the circuit")
+
+    print(f"[LOCATION] upstream calls {sum(Provider.hits.values())}, "
+          f"refresh {collect_metrics()['geocode_refresh']}")
+
+
+async def run():
+    await check_breaker()
+    await check_location_search()
+    location_service.close_location_cache()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
+    server.shutdown()
+
+    for failure in failures:
+        print(f"  {failure}")
+    print("\nFAILED" if failures else "\nOK: circuit breaker and stale-while-revalidate behave as documented")
+    sys.exit(1 if failures else 0)
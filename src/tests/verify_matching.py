@@ -0,0 +1,166 @@
+"""
+Ashtakoota (36-guna) matching against hand-worked pairings.
+
+1. Known pairings (boy and girl Moon nakshatra/pada), each koota worked
+   out from the classical rules in the comments: same nakshatra (nadi
+   dosha), a 6/8 bhakoot with nadi dosha, a 2/12 bhakoot across the
+   Krittika sign change, a pairing without dosha, and the two halves of
+   Sagittarius for vashya.
+2. The precomputed tables: every koota within 0..its maximum, and the
+   kootas that do not depend on who is the boy (tara, yoni, maitri,
+   bhakoot, nadi) symmetric.
+3. POST /match/rank in process (no network) against ranking every
+   candidate by hand: order, ties in input order, top_k, min_score,
+   both profile genders, and the request admitted like the other
+   compute routes.
+
+Exits with status 1 on any failure.
+
+Usage:
+    python tests/verify_matching.py
+"""
+
+import asyncio
+import os
+import random
+import sys
+
+# Add the server directory to sys.path to allow importing 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("OPENCAGE_API_KEY", "verify")
+
+import httpx
+import numpy as np
+
+from app.core.admission import engine_admission
+from app.engine.matching import KOOTA_MAXIMA, KOOTA_TABLES, koota_breakdown, pada_index
+from app.main import app
+
+KOOTAS = list(KOOTA_MAXIMA)
+SYMMETRIC = ("tara", "yoni", "graha_maitri", "bhakoot", "nadi")
+
+# (label, boy (nakshatra, pada), girl (nakshatra, pada),
+#  varna, vashya, tara, yoni, graha_maitri, gana, bhakoot, nadi)
+CASES = [
+    # Ashwini/Ashwini, Aries: same varna, both Chatushpada, Janma tara
+    # both ways, Horse/Horse, Mars/Mars, Deva/Deva, same sign, both Adi
+    ("same nakshatra (nadi dosha)", (1, 1), (1, 1),
+     1, 2, 3, 4, 5, 6, 7, 0),
+    # Ashwini (Aries) / Hasta (Virgo): Kshatriya over Vaishya,
+    # Chatushpada/Manava, counts 16 (Naidhana) and 13 (Kshema),
+    # Horse/Buffalo enemies, Mars/Mercury, Deva/Deva, Virgo 6th from
+    # Aries, both Adi
+    ("6/8 bhakoot and nadi dosha", (1, 1), (13, 1),
+     1, 1, 1.5, 0, 0.5, 6, 0, 0),
+    # Krittika 1 (Aries) / Krittika 2 (Taurus): Kshatriya over Vaishya,
+    # both Chatushpada, Janma tara, Sheep/Sheep, Mars/Venus,
+    # Rakshasa/Rakshasa, Taurus 2nd from Aries, both Antya
+    ("2/12 bhakoot across a sign change", (3, 1), (3, 2),
+     1, 2, 3, 4, 3, 6, 0, 0),
+    # Rohini (Taurus) / Pushya (Cancer): Vaishya under Brahmin,
+    # Chatushpada/Jalachara, counts 24 (Sadhana) and 5 (Pratyak),
+    # Serpent/Sheep, Venus/Moon, Manushya/Deva, Cancer 3rd from
+    # Taurus, Antya/Madhya
+    ("no dosha", (4, 1), (8, 1),
+     0, 1, 1.5, 2, 0.5, 5, 7, 8),
+    # Mula 1 (Sagittarius 0°) / Uttarashadha 1 (Sagittarius 26°40'):
+    # both Kshatriya, Manava/Chatushpada (the sign's two halves), counts
+    # 26 (Mitra) and 3 (Vipat), Dog/Mongoose, Jupiter/Jupiter,
+    # Rakshasa/Manushya, same sign, Adi/Antya
+    ("vashya by half of Sagittarius", (19, 1), (21, 1),
+     1, 1, 1.5, 1, 5, 0, 7, 8),
+]
+
+RANK_REQUESTS = 20
+CANDIDATES = 300
+
+
+def check_cases():
+    failures = []
+    for label, boy, girl, *expected in CASES:
+        actual = koota_breakdown(pada_index(*boy), pada_index(*girl))
+        expected = dict(zip(KOOTAS, map(float, expected)))
+        if actual != expected:
+            diff = {k: (actual[k], expected[k]) for k in KOOTAS if actual[k] != expected[k]}
+            failures.append(f"{label}: (actual, expected) {diff}")
+        print(f"[PAIR] {label}: {sum(actual.values())} / 36")
+    return failures
+
+
+def check_tables():
+    failures = []
+    for koota, table in KOOTA_TABLES.items():
+        if table.min() < 0 or table.max() > KOOTA_MAXIMA[koota]:
+            failures.append(f"{koota}: scores {table.min()}..{table.max()}")
+        if koota in SYMMETRIC and not np.array_equal(table, table.T):
+            failures.append(f"{koota}: not symmetric")
+    return failures
+
+
+def expected_ranking(profile, gender, candidates, top_k, min_score):
+    profile_pada = pada_index(*profile)
+    scored = []
+    for position, candidate in enumerate(candidates):
+        pada = pada_index(*candidate)
+        boy, girl = (profile_pada, pada) if gender == "male" else (pada, profile_pada)
+        scored.append((-sum(koota_breakdown(boy, girl).values()), position))
+
+    return [
+        (position, -negative) for negative, position in sorted(scored)
+        if -negative >= min_score
+    ][:top_k]
+
+
+async def check_rank_endpoint(rng):
+    failures = []
+    transport = httpx.ASGITransport(app=app)
+    admitted = engine_admission.lanes["interactive"].admitted
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://verify") as client:
+        for _ in range(RANK_REQUESTS):
+            profile = (rng.randint(1, 27), rng.randint(1, 4))
+            gender = rng.choice(["male", "female"])
+            # Few distinct padas, so totals tie often
+            candidates = [
+                (rng.randint(1, 27), rng.randint(1, 4)) for _ in range(8)
+            ]
+            candidates = [rng.choice(candidates) for _ in range(CANDIDATES)]
+            top_k = rng.choice([1, 10, CANDIDATES])
+            min_score = rng.choice([0.0, 18.0, 30.0])
+
+            response = await client.post("/api/v1/match/rank", json={
+                "profile": {"nakshatra_index": profile[0], "pada": profile[1], "gender": gender},
+                "candidates": [
+                    {"id": str(i), "nakshatra_index": n, "pada": p}
+                    for i, (n, p) in enumerate(candidates)
+                ],
+                "top_k": top_k,
+                "min_score": min_score,
+            })
+            if response.status_code != 200:
+                failures.append(f"HTTP {response.status_code} {response.text[:200]}")
+                continue
+
+            matches = response.json()["matches"]
+            actual = [(int(m["id"]), m["total"]) for m in matches]
+            expected = expected_ranking(profile, gender, candidates, top_k, min_score)
+            if actual != expected:
+                failures.append(f"{gender} {profile} top_k={top_k} min_score={min_score}: "
+                                f"{actual[:5]}, expected {expected[:5]}")
+            if any(sum(m["kootas"].values()) != m["total"] for m in matches):
+                failures.append(f"{gender} {profile}: koota breakdown does not add up to the total")
+
+    if engine_admission.lanes["interactive"].admitted - admitted != RANK_REQUESTS:
+        failures.append("/match/rank requests did not go through admission")
+
+    print(f"[RANK] {RANK_REQUESTS} requests of {CANDIDATES} candidates")
+    return failures
+
+
+if __name__ == "__main__":
+    failures = check_cases() + check_tables() + asyncio.run(check_rank_endpoint(random.Random(14)))
+
+    for failure in failures:
+        print(f"  {failure}")
+    print("\nFAILED" if failures else "\nOK: guna scores match the worked pairings and the ranking")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,143 @@
+"""
+Panchang transitions from compute_panchang against brute-force sampling.
+
+The reference samples the tithi, nakshatra, yoga and karana angles with
+swe.calc_ut every SAMPLE_STEP days and bisects every change of index.
+For each date, the spans listed for an element must be the value
+running at sunrise (local midnight where the Sun does not rise) and
+then every value entered before the next one, each ending at the
+bisected crossing within MAX_ERROR_SECONDS (end times are given to the
+second). Exits with status 1 on any difference.
+
+Usage:
+    python tests/verify_panchang.py
+"""
+
+import os
+import sys
+from bisect import bisect_right
+from datetime import date, datetime
+
+# Add the server directory to sys.path to allow importing 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import swisseph as swe
+
+from app.core.swisseph_init import init_swisseph
+from app.engine.panchang import ELEMENTS, compute_panchang
+from app.utils.time_utils import local_to_jd
+
+# (label, start, days, latitude, longitude, timezone)
+CASES = [
+    ("Delhi 2024", date(2024, 1, 1), 366, 28.6139, 77.2090, 5.5),
+    ("Delhi 1950", date(1950, 3, 1), 60, 28.6139, 77.2090, 5.5),
+    ("Tromso 2024 (polar day/night)", date(2024, 1, 1), 366, 69.6492, 18.9553, 1.0),
+    ("New York 2024", date(2024, 6, 1), 60, 40.7128, -74.0060, -4.0),
+]
+
+SAMPLE_STEP = 0.01
+MAX_ERROR_SECONDS = 2.0
+
+FLAGS = swe.FLG_SIDEREAL
+
+
+def angle(element, julian_day):
+    moon_coef, sun_coef, _ = ELEMENTS[element]
+    value = moon_coef * swe.calc_ut(julian_day, swe.MOON, FLAGS)[0][0]
+    if sun_coef:
+        value += sun_coef * swe.calc_ut(julian_day, swe.SUN, FLAGS)[0][0]
+    return value % 360.0
+
+
+def index_at(element, julian_day):
+    return int(angle(element, julian_day) // ELEMENTS[element][2])
+
+
+def brute_force_crossings(element, start_jd, end_jd):
+    # [(time, index entered)] in order
+    crossings = []
+    count = int((end_jd - start_jd) / SAMPLE_STEP) + 1
+    a, index_a = start_jd, index_at(element, start_jd)
+
+    for i in range(1, count + 1):
+        b = start_jd + i * SAMPLE_STEP
+        index_b = index_at(element, b)
+        if index_b != index_a:
+            lo, hi = a, b
+            for _ in range(50):
+                mid = (lo + hi) / 2
+                if index_at(element, mid) == index_a:
+                    lo = mid
+                else:
+                    hi = mid
+            crossings.append((hi, index_b))
+        a, index_a = b, index_b
+
+    return crossings
+
+
+def to_jd(value, timezone):
+    return local_to_jd(datetime.fromisoformat(value), timezone)
+
+
+def day_anchor(row, timezone):
+    if row["sunrise"] is not None:
+        return to_jd(row["sunrise"], timezone)
+    return local_to_jd(datetime.fromisoformat(row["date"]), timezone)
+
+
+def check(label, start, days, latitude, longitude, timezone):
+    # One extra row closes the last day
+    rows = compute_panchang(
+        start=start, days=days + 1,
+        latitude=latitude, longitude=longitude, timezone=timezone,
+    )
+    anchors = [day_anchor(row, timezone) for row in rows]
+
+    failures = []
+    spans_checked = 0
+
+    for element in ELEMENTS:
+        crossings = brute_force_crossings(element, anchors[0] - 1.0, anchors[-1] + 2.0)
+        times = [t for t, _ in crossings]
+
+        for d, row in enumerate(rows[:-1]):
+            first = bisect_right(times, anchors[d])
+            # Too close to sunrise to tell from a time given to the second
+            if first < len(times) and (times[first] - anchors[d]) * 86400 < MAX_ERROR_SECONDS:
+                continue
+
+            expected = [(index_at(element, anchors[d]), None)]
+            for t, entered in crossings[first:]:
+                expected[-1] = (expected[-1][0], t)
+                if t >= anchors[d + 1]:
+                    break
+                expected.append((entered, None))
+
+            actual = [
+                (span["number"] - 1, None if span["end"] is None else to_jd(span["end"], timezone))
+                for span in row[element]
+            ]
+            spans_checked += len(actual)
+
+            ok = len(actual) == len(expected) and all(
+                a[0] == e[0] and a[1] is not None and e[1] is not None
+                and abs(a[1] - e[1]) * 86400 <= MAX_ERROR_SECONDS
+                for a, e in zip(actual, expected)
+            )
+            if not ok:
+                failures.append(f"{row['date']} {element}: {row[element]}")
+
+    print(f"[{label}] {spans_checked} spans, {len(failures)} failures")
+    for failure in failures[:5]:
+        print(f"  {failure}")
+    return len(failures)
+
+
+if __name__ == "__main__":
+    init_swisseph()
+
+    failed = sum(check(*case) for case in CASES)
+
+    print("\nFAILED" if failed else "\nOK: panchang transitions match brute-force sampling")
+    sys.exit(1 if failed else 0)
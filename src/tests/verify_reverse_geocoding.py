@@ -0,0 +1,124 @@
+"""
+k-d tree nearest-neighbour queries against brute force.
+
+1. KDTree.query on random point sets (uniform, clustered, with
+   duplicates; below, at and far above the leaf size) against sorting
+   all distances, for k from 1 up to more than the number of points
+   (up to 3000 on the larger sets).
+2. Gazetteer.nearest on the bundled gazetteer against the haversine
+   distance to every place, for random points including the poles and
+   both sides of the antimeridian.
+
+Distances must agree to TOLERANCE, and rows wherever distances are not
+tied. Exits with status 1 on any difference.
+
+Usage:
+    python tests/verify_reverse_geocoding.py
+"""
+
+import os
+import sys
+
+# Add the server directory to sys.path to allow importing 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from app.services.gazetteer import EARTH_RADIUS_KM, get_gazetteer
+from app.utils.kdtree import KDTree
+
+TOLERANCE = 1e-9
+KM_TOLERANCE = 1e-6
+QUERIES = 200
+
+
+def point_sets(rng):
+    yield "1 point", rng.random((1, 3))
+    yield "leaf size", rng.random((16, 3))
+    yield "leaf size + 1", rng.random((17, 3))
+    yield "uniform 2-d", rng.random((2000, 2))
+    yield "uniform 3-d", rng.random((20000, 3))
+    yield "clustered", np.concatenate([
+        rng.normal(centre, 0.01, (500, 3)) for centre in rng.random((10, 3))
+    ])
+    yield "duplicates", np.repeat(rng.random((50, 3)), 20, axis=0)
+
+
+def same_neighbours(actual, distances, k, tolerance):
+    # actual: [(distance, row)]; distances: brute force, to every point
+    order = np.argsort(distances, kind="stable")[:k]
+    if len(actual) != len(order):
+        return False
+    for (distance, row), expected_row in zip(actual, order):
+        if abs(distance - distances[expected_row]) > tolerance:
+            return False
+        # Rows only count where the distance is not tied
+        tied = np.sum(np.abs(distances - distances[expected_row]) <= tolerance) > 1
+        if not tied and row != expected_row:
+            return False
+    return True
+
+
+def check_tree(rng):
+    failures = 0
+
+    for label, points in point_sets(rng):
+        tree = KDTree(points)
+        for _ in range(QUERIES):
+            query = rng.random(points.shape[1]) * 1.2 - 0.1
+            k = int(rng.choice([1, 2, 5, 50, min(len(points) + 3, 3000)]))
+            distances = np.sqrt(((points - query) ** 2).sum(axis=1))
+
+            if not same_neighbours(tree.query(query, k), distances, k, TOLERANCE):
+                failures += 1
+                if failures <= 5:
+                    print(f"  {label}: query {query} k={k}")
+
+        print(f"[KDTREE] {label}: {len(points)} points, {QUERIES} queries")
+
+    return failures
+
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    lat1, lon1 = np.radians(latitude), np.radians(longitude)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    h = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+
+
+def check_gazetteer(rng):
+    gazetteer = get_gazetteer()
+    if gazetteer is None:
+        print("[GAZETTEER] not configured (GAZETTEER_PATH)")
+        return 1
+
+    queries = [(90.0, 0.0), (-90.0, 0.0), (0.0, 180.0), (0.0, -180.0),
+               (64.8, 179.99), (64.8, -179.99), (28.6139, 77.2090)]
+    queries += [
+        (float(np.degrees(np.arcsin(rng.uniform(-1, 1)))), float(rng.uniform(-180, 180)))
+        for _ in range(QUERIES)
+    ]
+
+    failures = 0
+    for latitude, longitude in queries:
+        for k in (1, 5):
+            distances = haversine_km(latitude, longitude, gazetteer.latitudes, gazetteer.longitudes)
+            actual = [(km, row) for row, km in gazetteer.nearest(latitude, longitude, k)]
+
+            if not same_neighbours(actual, distances, k, KM_TOLERANCE):
+                failures += 1
+                if failures <= 5:
+                    print(f"  ({latitude}, {longitude}) k={k}: {actual[:3]}")
+
+    print(f"[GAZETTEER] {len(gazetteer)} places, {len(queries)} points")
+    return failures
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(19)
+
+    failed = check_tree(rng) + check_gazetteer(rng)
+
+    print("\nFAILED" if failed else "\nOK: nearest neighbours match brute force")
+    sys.exit(1 if failed else 0)
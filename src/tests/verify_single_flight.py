@@ -0,0 +1,183 @@
+"""
+Request coalescing: SingleFlight, and concurrent chart requests.
+
+1. SingleFlight on its own: concurrent calls for a key run fn once
+   and all get its result, other keys run separately, a cancelled
+   caller (or all of them) does not cancel the shared call, its
+   exception reaches every caller, and nothing is kept afterwards.
+2. get_kundli with the engine pool started (thread pool,
+   ENGINE_WORKERS=0): concurrent identical requests under different
+   names compute the chart once (kundli_flights) and each get their own
+   name, and callers still waiting when the request that started the
+   computation passes its deadline run it again instead of failing.
+
+Exits with status 1 on any failure.
+
+Usage:
+    python tests/verify_single_flight.py
+"""
+
+import asyncio
+import contextlib
+import io
+import os
+import sys
+
+# Add the server directory to sys.path to allow importing 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ["ENGINE_WORKERS"] = "0"
+
+from app.core.deadline import WorkCancelled, set_request_deadline
+from app.core.executor import shutdown_engine_pool, start_engine_pool
+from app.core.metrics import collect_metrics
+from app.core.singleflight import SingleFlight
+from app.core.swisseph_init import init_swisseph
+from app.services.kundli_service import get_kundli
+
+CALLERS = 10
+
+BIRTH = {
+    "date_str": "1984-03-17",
+    "time_str": "04:12:09",
+    "timezone": 5.5,
+    "latitude": 19.076,
+    "longitude": 72.8777,
+}
+
+failures = []
+report = []
+
+
+def expect(condition, message):
+    if not condition:
+        failures.append(message)
+
+
+# ---------------------------------------------------------
+# 1. SINGLEFLIGHT
+# ---------------------------------------------------------
+async def check_single_flight():
+    flights = SingleFlight()
+    runs = []
+    release = asyncio.Event()
+
+    async def work(key):
+        runs.append(key)
+        await release.wait()
+        if key == "fails":
+            raise ValueError(key)
+        return {"key": key}
+
+    async def waiting(*keys):
+        # Start callers for `keys` and let them reach the shared call
+        tasks = [asyncio.ensure_future(flights.do(key, lambda key=key: work(key))) for key in keys]
+        await asyncio.sleep(0.01)
+        return tasks
+
+    # Coalesced, per key
+    tasks = await waiting(*["a"] * CALLERS, "b", "b")
+    expect(len(flights) == 2, f"{len(flights)} calls in flight, expected 2")
+    release.set()
+    results = await asyncio.gather(*tasks)
+    expect(sorted(runs) == ["a", "b"], f"fn ran for {runs}, expected once per key")
+    expect(all(r is results[0] for r in results[:CALLERS]), "callers of one key got different objects")
+    expect(results[-1] == {"key": "b"}, f"key b got {results[-1]}")
+    expect(flights.calls == 2 and flights.coalesced == CALLERS, f"stats {flights.stats()}")
+    expect(len(flights) == 0, "finished calls must not be kept")
+
+    # A cancelled caller leaves the others (and the call) running
+    runs.clear()
+    release.clear()
+    tasks = await waiting("c", "c", "c")
+    tasks[0].cancel()
+    await asyncio.sleep(0.01)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    expect(isinstance(results[0], asyncio.CancelledError), f"cancelled caller got {results[0]!r}")
+    expect(results[1:] == [{"key": "c"}] * 2, f"the others got {results[1:]}")
+
+    # All callers cancelled: the call still finishes, then is dropped
+    runs.clear()
+    release.clear()
+    tasks = await waiting("d", "d")
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    expect(len(flights) == 1, "the call must outlive its callers")
+    release.set()
+    await asyncio.sleep(0.01)
+    expect(len(flights) == 0 and runs == ["d"], "an abandoned call must finish and be dropped")
+
+    # The exception reaches every caller; the next call runs again
+    runs.clear()
+    release.clear()
+    tasks = await waiting("fails", "fails", "fails")
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    expect(all(isinstance(r, ValueError) for r in results), f"callers got {results}")
+    try:
+        await flights.do("fails", lambda: work("fails"))
+    except ValueError:
+        pass
+    expect(runs == ["fails", "fails"], f"fn ran {len(runs)} times, expected 2 (failures are not kept)")
+
+    report.append(f"[SINGLEFLIGHT] {flights.stats()}")
+
+
+# ---------------------------------------------------------
+# 2. CHART REQUESTS
+# ---------------------------------------------------------
+def flight_stats():
+    return dict(collect_metrics()["kundli_flights"])
+
+
+async def check_kundli_requests():
+    before = flight_stats()
+    names = [f"Caller {k}" for k in range(CALLERS)]
+    results = await asyncio.gather(*(get_kundli(**BIRTH, name=name) for name in names))
+    after = flight_stats()
+
+    expect(after["calls"] - before["calls"] == 1, f"{after['calls'] - before['calls']} computations, expected 1")
+    expect(after["coalesced"] - before["coalesced"] == CALLERS - 1, "the other requests must be coalesced")
+    expect([r["meta"]["name"] for r in results] == names, "each request must get its own name")
+    expect(all(r["planets"] == results[0]["planets"] for r in results), "coalesced requests got different charts")
+
+    # The first request gives up at once; the second must still get the chart
+    async def caller(timeout):
+        set_request_deadline(timeout)
+        return await get_kundli(**{**BIRTH, "time_str": "04:12:10"}, name=str(timeout))
+
+    before = flight_stats()
+    first, second = await asyncio.gather(caller(0.0), caller(None), return_exceptions=True)
+    after = flight_stats()
+
+    expect(isinstance(first, WorkCancelled), f"the expired request got {first!r}")
+    expect(isinstance(second, dict) and second["meta"]["name"] == "None",
+           f"the waiting request got {second!r:.200}")
+    expect(after["calls"] - before["calls"] == 2, "the waiting request must run the computation again")
+
+    report.append(f"[KUNDLI] {after}")
+
+
+async def run():
+    await check_single_flight()
+
+    start_engine_pool()
+    try:
+        await check_kundli_requests()
+    finally:
+        shutdown_engine_pool()
+
+
+if __name__ == "__main__":
+    init_swisseph()
+    # compute_time_context prints debug lines on every call
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(run())
+
+    for line in report:
+        print(line)
+    for failure in failures:
+        print(f"  {failure}")
+    print("\nFAILED" if failures else "\nOK: concurrent identical calls share one computation")
+    sys.exit(1 if failures else 0)
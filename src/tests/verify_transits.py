@@ -0,0 +1,133 @@
+"""
+Transit events from find_transit_events against brute-force sampling.
+
+The reference samples every body with swe.calc_ut on a fine fixed grid
+(much finer than the engine's bracketing grid), finds each change of
+sign, nakshatra and direction between neighbouring samples and bisects
+it. Both must find the same events, at times within MAX_ERROR_SECONDS.
+Exits with status 1 on any difference.
+
+Usage:
+    python tests/verify_transits.py
+"""
+
+import os
+import sys
+from datetime import date
+
+# Add the server directory to sys.path to allow importing 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import swisseph as swe
+
+from app.core.swisseph_init import init_swisseph
+from app.engine.planets import NAK_WIDTH, PLANETS
+from app.engine.transits import EVENT_TYPES, STATION_BODIES, find_transit_events
+
+RANGES = [
+    (date(1950, 1, 1), 366),
+    (date(2024, 1, 1), 731),
+]
+
+# Reference sampling step per body, in days
+SAMPLE_STEP = {"Moon": 0.02}
+DEFAULT_STEP = 0.1
+
+WIDTHS = {"sign_ingress": 30.0, "nakshatra_ingress": NAK_WIDTH}
+
+MAX_ERROR_SECONDS = 2.0
+
+
+def calc(body, jd):
+    pid = PLANETS["Rahu"] if body == "Ketu" else PLANETS[body]
+    xx, _ = swe.calc_ut(jd, pid, swe.FLG_SIDEREAL | swe.FLG_SPEED)
+    longitude = xx[0] + 180.0 if body == "Ketu" else xx[0]
+    return longitude % 360.0, xx[3]
+
+
+def bisect(changed, a, b):
+    # changed(t): whether t is already past the event
+    for _ in range(60):
+        mid = (a + b) / 2
+        if changed(mid):
+            b = mid
+        else:
+            a = mid
+    return (a + b) / 2
+
+
+def brute_force_events(body, start_jd, end_jd):
+    step = SAMPLE_STEP.get(body, DEFAULT_STEP)
+    count = int((end_jd - start_jd) / step) + 1
+    events = []
+
+    previous = None
+    for i in range(count + 1):
+        t = min(start_jd + i * step, end_jd)
+        longitude, speed = calc(body, t)
+
+        if previous is not None:
+            t0, longitude0, speed0 = previous
+
+            for event_type, width in WIDTHS.items():
+                index0 = int(longitude0 // width)
+                if int(longitude // width) != index0:
+                    events.append((event_type, bisect(
+                        lambda x: int(calc(body, x)[0] // width) != index0, t0, t
+                    )))
+
+            if body in STATION_BODIES and (speed0 < 0) != (speed < 0):
+                events.append(("station", bisect(
+                    lambda x: (calc(body, x)[1] < 0) != (speed0 < 0), t0, t
+                )))
+
+        previous = (t, longitude, speed)
+
+    return [(event_type, t) for event_type, t in events if start_jd <= t < end_jd]
+
+
+def compare(start, days):
+    start_jd = swe.julday(start.year, start.month, start.day, 0.0)
+    end_jd = start_jd + days
+
+    found = find_transit_events(
+        start_jd=start_jd,
+        end_jd=end_jd,
+        bodies=list(PLANETS),
+        event_types=list(EVENT_TYPES),
+    )
+
+    failures = 0
+    worst = 0.0
+    total = 0
+
+    for body in PLANETS:
+        expected = sorted(brute_force_events(body, start_jd, end_jd))
+        actual = sorted(
+            (e["type"], e["julian_day"]) for e in found if e["body"] == body
+        )
+        total += len(expected)
+
+        if [e[0] for e in expected] != [a[0] for a in actual]:
+            failures += 1
+            print(f"  {body}: {len(actual)} events, brute force {len(expected)}")
+            continue
+
+        for (event_type, t_expected), (_, t_actual) in zip(expected, actual):
+            error = abs(t_actual - t_expected) * 86400
+            worst = max(worst, error)
+            if error > MAX_ERROR_SECONDS:
+                failures += 1
+                print(f"  {body} {event_type} at JD {t_expected:.6f}: off by {error:.1f} s")
+
+    print(f"[{start} +{days}d] {total} events, worst error {worst:.2f} s, {failures} failures")
+    return failures
+
+
+if __name__ == "__main__":
+    init_swisseph()
+
+    failed = sum(compare(start, days) for start, days in RANGES)
+
+    print("\nFAILED" if failed else "\nOK: transit events match brute-force sampling")
+    sys.exit(1 if failed else 0)